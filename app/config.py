@@ -20,6 +20,16 @@ class Settings(BaseSettings):
     DB_MAX_OVERFLOW: int = 0
     DB_POOL_PRE_PING: bool = True
     DB_ECHO: bool = False
+    DB_QUERY_CACHE_SIZE: int = 1200  # Compiled SQL statements cached per engine
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 500  # Per connection; 0 behind a transaction-mode pooler
+    DB_REPEATED_STATEMENT_WARNING: int = 10  # Log N+1 suspects: same SQL more often per request
+
+    # Read replica (optional; GET routes read from it when healthy)
+    DATABASE_REPLICA_URL: str | None = None
+    DB_REPLICA_POOL_SIZE: int = 20
+    DB_REPLICA_MAX_LAG_SECONDS: float = 5.0  # Fall back to primary above this lag
+    DB_REPLICA_HEALTH_INTERVAL_SECONDS: int = 5
+    DB_READ_YOUR_WRITES_SECONDS: float = 10.0  # Clients read from primary this long after writing
     
     # Supabase
     SUPABASE_URL: str
@@ -33,9 +43,58 @@ class Settings(BaseSettings):
     # Security
     SECRET_KEY: str
     JWT_ALGORITHM: str = "HS256"
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    JWT_CACHE_SIZE: int = 10_000  # Verified tokens kept in memory per worker
+    API_KEY_CACHE_SIZE: int = 10_000  # Verified API keys kept in memory per worker
+    API_KEY_CACHE_TTL_SECONDS: int = 300
+    USER_PROFILE_CACHE_SIZE: int = 10_000  # /api/auth/me profiles kept in memory per worker
+    USER_PROFILE_CACHE_TTL_SECONDS: int = 60  # Also bounds how stale last_login can look
+    TOKEN_BLACKLIST_PURGE_INTERVAL_SECONDS: int = 300
+    TOKEN_BLACKLIST_PURGE_BATCH_SIZE: int = 1000
+    LAST_LOGIN_FLUSH_INTERVAL_SECONDS: int = 10  # last_login is written behind in batches
+    LAST_LOGIN_MAX_PENDING: int = 1000  # Flush early once this many users are buffered
+
+    # Rate limiting (token buckets shared by all workers on the host)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_PER_MINUTE: int = 100  # Per user on data endpoints (per IP when anonymous)
+    RATE_LIMIT_SLOTS: int = 65_536  # Buckets in the shared table (24 bytes each)
+    RATE_LIMIT_SHM_PATH: str | None = None  # Default: /dev/shm/canvas_rate_limit.<slots>
+
+    # Password hashing (bcrypt runs on a bounded thread pool)
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64
+    PASSWORD_HASH_TIMEOUT_SECONDS: float = 5.0
     
     # Docs
     ENABLE_DOCS: bool = True
+
+    # Metrics (Prometheus text format at /metrics, per worker; DEBUG adds X-DB-* headers)
+    METRICS_ENABLED: bool = True
+
+    # Record pages (pages above the stream threshold are streamed from a DB cursor, without ETag)
+    RECORD_PAGE_SIZE_MAX: int = 10_000
+    RECORD_STREAM_THRESHOLD: int = 100
+    RECORD_STREAM_BATCH_SIZE: int = 500  # Rows fetched and encoded per chunk
+    RECORD_STREAM_MAX_CONCURRENT: int = 4  # Per worker; each stream holds a pooled connection
+    RECORD_STREAM_TIMEOUT_SECONDS: int = 60  # Whole stream, including slow clients
+
+    # Response compression (brotli/gzip; metadata responses are compressed once per ETag)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024  # Bytes; smaller bodies are sent as-is
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_CACHE_SIZE: int = 1000  # Precompressed metadata bodies kept per worker
+    COMPRESSION_CACHE_TTL_SECONDS: int = 3600
+
+    # Caching (in-process, per worker)
+    METADATA_CACHE_SIZE: int = 10_000
+    METADATA_CACHE_TTL_SECONDS: int = 300
+
+    # Cross-worker cache invalidation (Postgres LISTEN/NOTIFY)
+    CACHE_INVALIDATION_ENABLED: bool = True
+    CACHE_INVALIDATION_CHANNEL: str = "canvas_cache_invalidation"
+    CACHE_INVALIDATION_KEEPALIVE_SECONDS: int = 30
+    CACHE_INVALIDATION_MAX_BACKOFF_SECONDS: int = 30
     
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -1,10 +1,29 @@
 """
 Canvas App Backend - Database Configuration
 """
-from typing import AsyncGenerator
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.orm import declarative_base
+import asyncio
+import contextlib
+import hashlib
+import logging
+from typing import AsyncGenerator, Callable
+from fastapi import Request
+from sqlalchemy import event, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.orm import Session, declarative_base
 from app.config import settings
+from app.utils.cache import TTLCache
+from app.utils.invalidation import READ_PINS_TOPIC, invalidation_bus
+from app.utils.metrics import TimedQueuePool, metrics
+
+logger = logging.getLogger(__name__)
+
+# Compiled SQL is cached by SQLAlchemy (query_cache_size); asyncpg additionally
+# keeps the server-side prepared statements per connection
+_statement_caching = {
+    "query_cache_size": settings.DB_QUERY_CACHE_SIZE,
+    "connect_args": {"prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE},
+}
 
 # Create async engine
 engine = create_async_engine(
@@ -13,7 +32,11 @@ engine = create_async_engine(
     pool_size=settings.DB_POOL_SIZE,
     max_overflow=settings.DB_MAX_OVERFLOW,
     pool_pre_ping=settings.DB_POOL_PRE_PING,
+    poolclass=TimedQueuePool,
+    pool_logging_name="primary",
+    **_statement_caching,
 )
+metrics.instrument_engine(engine, "primary")
 
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
@@ -22,17 +45,231 @@ AsyncSessionLocal = async_sessionmaker(
     expire_on_commit=False,
 )
 
+# Sessions for GET/HEAD requests: BEGIN READ ONLY (no extra round trip)
+ReadOnlySessionLocal = async_sessionmaker(
+    engine.execution_options(postgresql_readonly=True),
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
+
+# Read replica (optional; may point at the primary, e.g. in tests)
+replica_engine = create_async_engine(
+    settings.DATABASE_REPLICA_URL,
+    echo=settings.DB_ECHO,
+    pool_size=settings.DB_REPLICA_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    poolclass=TimedQueuePool,
+    pool_logging_name="replica",
+    **_statement_caching,
+) if settings.DATABASE_REPLICA_URL else None
+if replica_engine is not None:
+    metrics.instrument_engine(replica_engine, "replica")
+
+ReplicaSessionLocal = async_sessionmaker(
+    replica_engine.execution_options(postgresql_readonly=True),
+    class_=AsyncSession,
+    expire_on_commit=False,
+) if replica_engine is not None else None
+
 # Create declarative base
 Base = declarative_base()
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    """Dependency for database sessions"""
-    async with AsyncSessionLocal() as session:
+# Seconds the replica is behind (0 on a primary, where nothing is replayed)
+_REPLICA_LAG = text(
+    "SELECT CASE WHEN pg_is_in_recovery() "
+    "THEN COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+    "ELSE 0 END"
+)
+
+
+class ReplicaMonitor:
+    """
+    Periodic health and lag check of the read replica.
+
+    Reads go to the replica only while the last check succeeded and its lag
+    was within `max_lag_seconds`; otherwise they fall back to the primary.
+    """
+
+    def __init__(self, engine: AsyncEngine | None, interval_seconds: float, max_lag_seconds: float):
+        self.engine = engine
+        self.interval_seconds = interval_seconds
+        self.max_lag_seconds = max_lag_seconds
+        self.healthy = False
+        self.lag_seconds: float | None = None
+        self.failures = 0
+        self._task: asyncio.Task | None = None
+
+    async def check(self) -> bool:
+        """Measure replica lag and update `healthy`"""
+        if self.engine is None:
+            return False
+        try:
+            async with self.engine.connect() as conn:
+                self.lag_seconds = float((await conn.execute(_REPLICA_LAG)).scalar_one())
+        except Exception:
+            self.mark_failed()
+            logger.warning("Read replica health check failed; reading from primary", exc_info=True)
+            return False
+
+        self.healthy = self.lag_seconds <= self.max_lag_seconds
+        return self.healthy
+
+    def mark_failed(self) -> None:
+        """Stop routing reads to the replica until the next successful check"""
+        self.healthy = False
+        self.failures += 1
+
+    async def start(self) -> None:
+        """Run a first check, then keep checking in the background"""
+        if self.engine is not None and self._task is None:
+            await self.check()
+            self._task = asyncio.create_task(self._run_forever())
+
+    async def stop(self) -> None:
+        """Stop the background loop"""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "configured": self.engine is not None,
+            "healthy": self.healthy,
+            "lag_seconds": self.lag_seconds,
+            "failures": self.failures,
+        }
+
+    async def _run_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            await self.check()
+
+
+class ReadPins:
+    """
+    Read-your-writes: clients that just wrote read from the primary for a while.
+
+    A client is identified by its credentials (bearer token or API key). Pins
+    travel over the invalidation bus, so they hold in every worker.
+    """
+
+    def __init__(self, ttl: float):
+        self._pins = TTLCache("read_pins", maxsize=100_000, ttl=ttl)
+
+    def key(self, request: Request) -> str | None:
+        credential = request.headers.get("authorization") or request.headers.get("x-api-key")
+        if not credential:
+            return None
+        return hashlib.blake2b(credential.encode(), digest_size=12).hexdigest()
+
+    def pinned(self, request: Request) -> bool:
+        key = self.key(request)
+        return key is not None and key in self._pins
+
+    async def pin(self, db: AsyncSession, request: Request) -> None:
+        """Pin the client to the primary (published with the write's transaction)"""
+        key = self.key(request)
+        if key is not None:
+            await invalidation_bus.publish(db, READ_PINS_TOPIC, key)
+
+    def _on_pin(self, key: str) -> None:
+        self._pins.set(key, True)
+
+
+# Singleton instances
+replica_monitor = ReplicaMonitor(
+    replica_engine,
+    interval_seconds=settings.DB_REPLICA_HEALTH_INTERVAL_SECONDS,
+    max_lag_seconds=settings.DB_REPLICA_MAX_LAG_SECONDS,
+)
+read_pins = ReadPins(ttl=settings.DB_READ_YOUR_WRITES_SECONDS)
+invalidation_bus.subscribe(READ_PINS_TOPIC, read_pins._on_pin)
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_flush_write(session: Session, flush_context) -> None:
+    session.info["wrote"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_statement_write(state) -> None:
+    if state.is_insert or state.is_update or state.is_delete:
+        state.session.info["wrote"] = True
+
+
+_READ_METHODS = frozenset({"GET", "HEAD"})
+
+
+def _has_writes(session: AsyncSession) -> bool:
+    return bool(
+        session.info.get("wrote") or session.new or session.dirty or session.deleted
+    )
+
+
+async def get_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency for database sessions (one unit of work per request).
+
+    Services only flush; the request's changes are committed here, exactly
+    once, after the route returns (and rolled back if it raises). GET/HEAD
+    requests run in a READ ONLY transaction and are never committed.
+    """
+    read_only = request.method in _READ_METHODS
+    session_factory = ReadOnlySessionLocal if read_only else AsyncSessionLocal
+    async with session_factory() as session:
         try:
             yield session
-            await session.commit()
+            if not read_only and _has_writes(session):
+                if replica_engine is not None:
+                    await read_pins.pin(session, request)
+                await session.commit()
         except Exception:
             await session.rollback()
             raise
         finally:
             await session.close()
+
+
+def _use_replica(request: Request) -> bool:
+    return (
+        ReplicaSessionLocal is not None
+        and replica_monitor.healthy
+        and not read_pins.pinned(request)
+    )
+
+
+def get_read_session_factory(request: Request) -> Callable[[], AsyncSession]:
+    """
+    Dependency for read-only routes that stream their response.
+
+    Dependencies with yield are closed before a StreamingResponse body runs,
+    so streaming routes open their own session inside the body from this
+    factory (`async with factory() as session`). Same routing as get_read_db.
+    """
+    return ReplicaSessionLocal if _use_replica(request) else ReadOnlySessionLocal
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency for read-only routes.
+
+    Uses the read replica when it is configured, healthy and the client has
+    not written recently; otherwise the primary. Either way the transaction
+    is READ ONLY, so an accidental write fails instead of being dropped.
+    Routes served from the in-process metadata cache stay on get_db: a cache
+    miss loaded from a lagging replica would be cached as current.
+    """
+    use_replica = _use_replica(request)
+    session_factory = ReplicaSessionLocal if use_replica else ReadOnlySessionLocal
+    async with session_factory() as session:
+        try:
+            yield session
+        except (DBAPIError, OSError) as exc:
+            if use_replica and (isinstance(exc, OSError) or exc.connection_invalidated):
+                replica_monitor.mark_failed()
+            raise
+        finally:
+            await session.close()
@@ -1,13 +1,16 @@
 """
 Canvas App Backend - Main Application Entry Point
 """
-from fastapi import FastAPI, Request
+from fastapi import Depends, FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from slowapi import _rate_limit_exceeded_handler
-from slowapi.errors import RateLimitExceeded
 
 from app.config import settings
+from app.database import replica_monitor
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.metrics import MetricsMiddleware
 from app.routers import (
+    api_keys,
     auth,
     dashboard,
     fields,
@@ -18,7 +21,12 @@ from app.routers import (
     relationship_records,
     applications,
 )
-from app.utils.rate_limit import limiter
+from app.services.last_login import last_login_buffer
+from app.services.token_blacklist_reaper import token_blacklist_reaper
+from app.utils.cache import TTLCache, all_cache_stats
+from app.utils.invalidation import invalidation_bus
+from app.utils.metrics import metrics
+from app.utils.rate_limit import data_rate_limit
 
 app = FastAPI(
     title=settings.APP_NAME,
@@ -29,10 +37,6 @@ app = FastAPI(
     redirect_slashes=False,  # Allow both /api/fields and /api/fields/ without redirect
 )
 
-# Rate limiting
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-
 # CORS
 app.add_middleware(
     CORSMiddleware,
@@ -40,18 +44,39 @@ app.add_middleware(
     allow_credentials=settings.CORS_ALLOW_CREDENTIALS,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
-# Include routers
+# Response compression (inside metrics, so latency includes it)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MIN_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+        cache=TTLCache(
+            "compressed_responses",
+            maxsize=settings.COMPRESSION_CACHE_SIZE,
+            ttl=settings.COMPRESSION_CACHE_TTL_SECONDS,
+        ),
+    )
+
+# Route latency, status and DB usage (for /metrics, X-DB-* debug headers and N+1 warnings)
+app.add_middleware(MetricsMiddleware)
+
+# Include routers (data endpoints are rate limited per user, per verified API key prefix or per IP;
+# auth endpoints per IP)
+data_limits = [Depends(data_rate_limit)]
 app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
-app.include_router(dashboard.router, prefix="/api/dashboard", tags=["Dashboard"])
-app.include_router(fields.router, prefix="/api/fields", tags=["Fields"])
-app.include_router(objects.router, prefix="/api/objects", tags=["Objects"])
-app.include_router(object_fields.router, prefix="/api/object-fields", tags=["Object Fields"])
-app.include_router(records.router, prefix="/api/records", tags=["Records"])
-app.include_router(relationships.router, prefix="/api/relationships", tags=["Relationships"])
-app.include_router(relationship_records.router, prefix="/api/relationship-records", tags=["Relationship Records"])
-app.include_router(applications.router, prefix="/api/applications", tags=["Applications"])
+app.include_router(dashboard.router, prefix="/api/dashboard", tags=["Dashboard"], dependencies=data_limits)
+app.include_router(fields.router, prefix="/api/fields", tags=["Fields"], dependencies=data_limits)
+app.include_router(objects.router, prefix="/api/objects", tags=["Objects"], dependencies=data_limits)
+app.include_router(object_fields.router, prefix="/api/object-fields", tags=["Object Fields"], dependencies=data_limits)
+app.include_router(records.router, prefix="/api/records", tags=["Records"], dependencies=data_limits)
+app.include_router(relationships.router, prefix="/api/relationships", tags=["Relationships"], dependencies=data_limits)
+app.include_router(relationship_records.router, prefix="/api/relationship-records", tags=["Relationship Records"], dependencies=data_limits)
+app.include_router(applications.router, prefix="/api/applications", tags=["Applications"], dependencies=data_limits)
+app.include_router(api_keys.router, prefix="/api/api-keys", tags=["API Keys"], dependencies=data_limits)
 
 @app.get("/api/health")
 async def health_check():
@@ -61,9 +86,39 @@ async def health_check():
         "environment": settings.ENVIRONMENT,
     }
 
+@app.get("/api/health/replica")
+async def replica_health():
+    """Read replica health, lag and failure count (this worker)"""
+    return replica_monitor.stats()
+
+@app.get("/api/health/token-blacklist")
+async def token_blacklist_health():
+    """Whether the blacklist reaper is running (this worker)"""
+    return {"alive": token_blacklist_reaper.alive}
+
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def prometheus_metrics():
+        """Prometheus scrape endpoint (this worker)"""
+        return PlainTextResponse(
+            metrics.render(caches=all_cache_stats()),
+            media_type="text/plain; version=0.0.4",
+        )
+
 @app.on_event("startup")
 async def startup_event():
     print(f"🚀 {settings.APP_NAME} v{settings.APP_VERSION} starting...")
     print(f"📝 Environment: {settings.ENVIRONMENT}")
     if settings.ENABLE_DOCS:
         print(f"📚 API Docs: http://localhost:{settings.PORT}/docs")
+    await invalidation_bus.start()
+    await token_blacklist_reaper.start()
+    await last_login_buffer.start()
+    await replica_monitor.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await replica_monitor.stop()
+    await last_login_buffer.stop()
+    await token_blacklist_reaper.stop()
+    await invalidation_bus.stop()
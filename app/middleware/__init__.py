@@ -1,4 +1,4 @@
 """Middleware package"""
-from app.middleware.auth import get_current_user_id, get_optional_user_id
+from app.middleware.auth import get_bearer_user_id, get_current_user_id, get_optional_user_id
 
-__all__ = ["get_current_user_id", "get_optional_user_id"]
+__all__ = ["get_bearer_user_id", "get_current_user_id", "get_optional_user_id"]
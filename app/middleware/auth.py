@@ -1,7 +1,7 @@
 """Authentication middleware - JWT verification"""
 import uuid
 from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.security import APIKeyHeader, HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
@@ -12,14 +12,19 @@ from app.utils.security import decode_access_token
 # auto_error=False prevents automatic 403, we handle 401 manually
 security = HTTPBearer(auto_error=False)
 
+# API key scheme (extracts key from "X-API-Key: cvk_..." header)
+api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
+
 
 async def get_current_user_id(
     credentials: HTTPAuthorizationCredentials | None = Depends(security),
+    api_key: str | None = Depends(api_key_header),
     db: AsyncSession = Depends(get_db),
 ) -> uuid.UUID:
     """
     Extract and validate JWT token, return user ID as UUID.
     Also checks if token is blacklisted.
+    Without a bearer token, an X-API-Key header is accepted instead.
 
     Usage in routers:
         @router.get("/protected")
@@ -29,6 +34,33 @@ async def get_current_user_id(
     Raises:
         HTTPException 401 if token is invalid/expired/blacklisted
     """
+    # API key authentication (only when no bearer token is sent)
+    if credentials is None and api_key:
+        from app.services.api_key_service import api_key_service
+        user_id = await api_key_service.verify_api_key(db, api_key)
+        if user_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid API key",
+            )
+        return user_id
+
+    return await get_bearer_user_id(credentials, db)
+
+
+async def get_bearer_user_id(
+    credentials: HTTPAuthorizationCredentials | None = Depends(security),
+    db: AsyncSession = Depends(get_db),
+) -> uuid.UUID:
+    """
+    Like get_current_user_id, but only a bearer JWT is accepted.
+
+    For endpoints an API key must not reach, e.g. creating or revoking API
+    keys: a leaked key could otherwise mint new keys or revoke the owner's.
+
+    Raises:
+        HTTPException 401 if token is missing/invalid/expired/blacklisted
+    """
     # Check if credentials were provided
     if credentials is None:
         raise HTTPException(
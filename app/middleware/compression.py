@@ -0,0 +1,182 @@
+"""Compression middleware - gzip/brotli responses, precompressed metadata reuse"""
+import zlib
+
+import brotli
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.cache import TTLCache
+
+COMPRESSIBLE_TYPES = (
+    "application/json", "application/msgpack", "text/", "application/javascript", "image/svg+xml",
+)
+
+# Metadata routes whose compressed bodies are kept per ETag (compressed once, harder)
+PRECOMPRESSED_PATHS = ("/api/fields", "/api/objects", "/api/object-fields", "/api/applications")
+PRECOMPRESSED_GZIP_LEVEL = 9
+PRECOMPRESSED_BROTLI_QUALITY = 9
+
+
+def negotiate_encoding(accept_encoding: str) -> str | None:
+    """Pick "br" or "gzip" from an Accept-Encoding header (None = identity)"""
+    weights: dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        name, _, value = params.strip().partition("=")
+        if name.strip() == "q":
+            try:
+                q = float(value)
+            except ValueError:
+                q = 0.0
+        weights[coding.strip()] = q
+
+    wildcard = weights.get("*", 0.0)
+    candidates = [(weights.get(coding, wildcard), coding) for coding in ("br", "gzip")]
+    q, coding = max(candidates, key=lambda candidate: candidate[0])  # ties prefer br
+    return coding if q > 0 else None
+
+
+def compress(body: bytes, encoding: str, level: int) -> bytes:
+    """One-shot compression (level is gzip level or brotli quality)"""
+    if encoding == "br":
+        return brotli.compress(body, quality=level)
+    return zlib.compress(body, level, wbits=31)  # wbits=31: gzip container
+
+
+class CompressionMiddleware:
+    """
+    Pure ASGI response compression.
+
+    Compresses allowlisted content types at or above `minimum_size` (and
+    every streamed body) with brotli or gzip, whichever the client prefers.
+    Allowlisted responses carry `Vary: Accept-Encoding` even when sent
+    uncompressed.
+    GET responses of metadata routes carry an ETag that fully identifies
+    their body, so their compressed bytes are cached per (URL, ETag,
+    encoding) and reused instead of recompressing on every request.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        cache: TTLCache | None = None,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.levels = {"gzip": gzip_level, "br": brotli_quality}
+        self.cache = cache
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        responder = _CompressingResponder(self, scope, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressingResponder:
+    """Per-response state: holds back the start message until the body shows its size"""
+
+    def __init__(self, middleware: CompressionMiddleware, scope: Scope, encoding: str | None, send: Send):
+        self.middleware = middleware
+        self.scope = scope
+        self.encoding = encoding  # None: client accepts identity only
+        self.level = middleware.levels.get(encoding)
+        self._send = send
+        self.start: Message | None = None
+        self.mode = "pending"  # -> "identity" | "stream"
+        self.compressor = None
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = {**message, "headers": list(message.get("headers", ()))}
+            if self.encoding is None:
+                self.mode = "identity"
+                headers = MutableHeaders(raw=self.start["headers"])
+                if self._compressible(headers):
+                    # Other clients get this resource compressed: shared caches must vary
+                    headers.add_vary_header("Accept-Encoding")
+                await self._send(self.start)
+            return
+        if message["type"] != "http.response.body" or self.mode == "identity":
+            await self._send(message)
+            return
+        if self.mode == "stream":
+            await self._send_stream_chunk(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        headers = MutableHeaders(raw=self.start["headers"])
+
+        compressible = self._compressible(headers)
+        if not compressible or (not more_body and len(body) < self.middleware.minimum_size):
+            self.mode = "identity"
+            if compressible:
+                headers.add_vary_header("Accept-Encoding")
+            await self._send(self.start)
+            await self._send(message)
+            return
+
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+
+        if more_body:
+            self.mode = "stream"
+            del headers["Content-Length"]
+            self.compressor = (
+                brotli.Compressor(quality=self.level) if self.encoding == "br"
+                else zlib.compressobj(self.level, wbits=31)
+            )
+            await self._send(self.start)
+            await self._send_stream_chunk(message)
+            return
+
+        compressed = self._compress_whole(body, headers)
+        headers["Content-Length"] = str(len(compressed))
+        await self._send(self.start)
+        await self._send({"type": "http.response.body", "body": compressed})
+
+    def _compressible(self, headers: MutableHeaders) -> bool:
+        status = self.start["status"]
+        if status < 200 or status in (204, 304) or "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "")
+        return content_type.startswith(COMPRESSIBLE_TYPES)
+
+    def _compress_whole(self, body: bytes, headers: MutableHeaders) -> bytes:
+        cache = self.middleware.cache
+        etag = headers.get("etag")
+        if (
+            cache is None or etag is None
+            or self.scope["method"] != "GET"
+            or not self.scope["path"].startswith(PRECOMPRESSED_PATHS)
+        ):
+            return compress(body, self.encoding, self.level)
+
+        key = (self.scope["path"], self.scope["query_string"], etag, self.encoding)
+        compressed = cache.get(key)
+        if compressed is None:
+            level = PRECOMPRESSED_BROTLI_QUALITY if self.encoding == "br" else PRECOMPRESSED_GZIP_LEVEL
+            compressed = compress(body, self.encoding, level)
+            cache.set(key, compressed)
+        return compressed
+
+    async def _send_stream_chunk(self, message: Message) -> None:
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.encoding == "br":
+            chunk = self.compressor.process(body) + (
+                self.compressor.flush() if more_body else self.compressor.finish()
+            )
+        else:
+            chunk = self.compressor.compress(body) + (
+                self.compressor.flush(zlib.Z_SYNC_FLUSH) if more_body else self.compressor.flush()
+            )
+        await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
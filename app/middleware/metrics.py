@@ -0,0 +1,69 @@
+"""Metrics middleware - Per-route latency, status and SQL usage (metrics, debug headers, N+1 warnings)"""
+import logging
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.utils.metrics import RequestStats, current_request, metrics
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware (no BaseHTTPMiddleware task overhead).
+
+    Requests are labelled by route template, so path parameters don't create
+    new series; paths that match no route share the "unmatched" label.
+
+    Also reports the request's SQL work: in DEBUG, as X-DB-Statements and
+    X-DB-Time-Ms response headers (statements run before the response
+    starts); always, as a warning when one statement shape repeats more than
+    DB_REPEATED_STATEMENT_WARNING times (usually an N+1 query).
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = current_request.set(stats)
+        status = 500  # Unhandled exceptions become 500s outside this middleware
+        start = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if settings.DEBUG:
+                    message["headers"] = [
+                        *message.get("headers", ()),
+                        (b"x-db-statements", str(stats.statements).encode()),
+                        (b"x-db-time-ms", f"{stats.db_seconds * 1000:.2f}".encode()),
+                    ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            route_path = route.path if route is not None else "unmatched"
+            metrics.observe_request(
+                scope["method"],
+                route_path,
+                status,
+                time.perf_counter() - start,
+                stats,
+            )
+            current_request.reset(token)
+
+            for statement, count in stats.repeated(settings.DB_REPEATED_STATEMENT_WARNING):
+                logger.warning(
+                    "Possible N+1: %s %s ran the same statement %d times: %s",
+                    scope["method"], route_path, count, " ".join(statement.split())[:300],
+                )
@@ -8,6 +8,8 @@ from app.models.relationship_record import RelationshipRecord
 from app.models.application import Application
 from app.models.user import User
 from app.models.token_blacklist import TokenBlacklist
+from app.models.refresh_token import RefreshToken
+from app.models.api_key import ApiKey
 
 __all__ = [
     "Field",
@@ -19,4 +21,6 @@ __all__ = [
     "Application",
     "User",
     "TokenBlacklist",
+    "RefreshToken",
+    "ApiKey",
 ]
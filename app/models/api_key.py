@@ -0,0 +1,49 @@
+"""API Key Model - Long-lived credentials for programmatic access"""
+from datetime import UTC, datetime
+from sqlalchemy import Column, DateTime, String
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+from app.database import Base
+
+
+class ApiKey(Base):
+    """
+    API keys of the form "cvk_<prefix>_<secret>".
+
+    The prefix is stored in clear and indexed for lookup; only an HMAC of the
+    secret is stored, and it is compared in constant time.
+    """
+    __tablename__ = "api_keys"
+
+    # Primary Key
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+    # Owner
+    user_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+
+    # Display name chosen by the user
+    name = Column(String, nullable=False)
+
+    # Public lookup prefix and HMAC-SHA256 of the secret (hex)
+    prefix = Column(String(16), nullable=False, unique=True, index=True)
+    secret_hash = Column(String(64), nullable=False)
+
+    # Lifetime
+    created_at = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(UTC))
+    expires_at = Column(DateTime(timezone=True), nullable=True)
+    revoked_at = Column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<ApiKey(id={self.id}, prefix={self.prefix}, user_id={self.user_id})>"
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary (useful for debugging)"""
+        return {
+            "id": str(self.id),
+            "user_id": str(self.user_id),
+            "name": self.name,
+            "prefix": self.prefix,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "expires_at": self.expires_at.isoformat() if self.expires_at else None,
+            "revoked_at": self.revoked_at.isoformat() if self.revoked_at else None,
+        }
@@ -0,0 +1,49 @@
+"""Refresh Token Model - Long-lived, rotating refresh tokens"""
+from datetime import UTC, datetime
+from sqlalchemy import Column, DateTime, String
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+from app.database import Base
+
+
+class RefreshToken(Base):
+    """
+    Refresh tokens issued at login and rotated on every use.
+
+    Only an HMAC of the token is stored. Tokens rotated from the same login
+    share a family_id; presenting an already-rotated token revokes the family.
+    """
+    __tablename__ = "refresh_tokens"
+
+    # Primary Key
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+    # HMAC-SHA256 of the token (hex), the lookup key
+    token_hash = Column(String(64), nullable=False, unique=True, index=True)
+
+    # Owner and rotation family
+    user_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    family_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+
+    # Lifetime
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    created_at = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(UTC))
+
+    # Set when the token is used (rotated) or its family is revoked
+    revoked_at = Column(DateTime(timezone=True), nullable=True)
+    replaced_by = Column(UUID(as_uuid=True), nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<RefreshToken(id={self.id}, user_id={self.user_id})>"
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary (useful for debugging)"""
+        return {
+            "id": str(self.id),
+            "user_id": str(self.user_id),
+            "family_id": str(self.family_id),
+            "expires_at": self.expires_at.isoformat() if self.expires_at else None,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "revoked_at": self.revoked_at.isoformat() if self.revoked_at else None,
+            "replaced_by": str(self.replaced_by) if self.replaced_by else None,
+        }
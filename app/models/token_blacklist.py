@@ -20,7 +20,7 @@ class TokenBlacklist(Base):
     # User who owned this token
     user_id = Column(UUID(as_uuid=True), nullable=False, index=True)
 
-    # Token expiration time (auto-cleanup after this)
+    # Token expiration time (purged by TokenBlacklistReaper after this)
     expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
 
     # When token was blacklisted
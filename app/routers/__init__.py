@@ -1,5 +1,6 @@
 """FastAPI Routers"""
 from app.routers import (
+    api_keys,
     applications,
     auth,
     dashboard,
@@ -12,6 +13,7 @@ from app.routers import (
 )
 
 __all__ = [
+    "api_keys",
     "applications",
     "auth",
     "dashboard",
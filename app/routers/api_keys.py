@@ -0,0 +1,52 @@
+"""API Key Endpoints - Create, list and revoke API keys (bearer JWT only)"""
+import uuid
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db
+from app.middleware.auth import get_bearer_user_id
+from app.schemas import ApiKeyCreate, ApiKeyCreatedResponse, ApiKeyResponse
+from app.services.api_key_service import api_key_service
+
+router = APIRouter()
+
+# Support both /api/api-keys and /api/api-keys/ (with and without trailing slash)
+@router.post("", response_model=ApiKeyCreatedResponse, status_code=201)
+@router.post("/", response_model=ApiKeyCreatedResponse, status_code=201)
+async def create_api_key(
+    key_in: ApiKeyCreate,
+    db: AsyncSession = Depends(get_db),
+    user_id: uuid.UUID = Depends(get_bearer_user_id),
+):
+    """
+    Create an API key for the current user.
+
+    The full key is returned only in this response - store it securely.
+    Send it as the `X-API-Key` header instead of a bearer token.
+    """
+    api_key, key = await api_key_service.create_api_key(db, key_in, user_id)
+    return ApiKeyCreatedResponse(**ApiKeyResponse.model_validate(api_key).model_dump(), key=key)
+
+
+@router.get("", response_model=list[ApiKeyResponse])
+@router.get("/", response_model=list[ApiKeyResponse])
+async def list_api_keys(
+    db: AsyncSession = Depends(get_db),
+    user_id: uuid.UUID = Depends(get_bearer_user_id),
+):
+    """List the current user's API keys (secrets are never returned)"""
+    return await api_key_service.get_user_api_keys(db, user_id)
+
+
+@router.delete("/{key_id}", status_code=204)
+@router.delete("/{key_id}/", status_code=204)
+async def revoke_api_key(
+    key_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    user_id: uuid.UUID = Depends(get_bearer_user_id),
+):
+    """Revoke an API key (takes effect in all workers)"""
+    revoked = await api_key_service.revoke_api_key(db, key_id, user_id)
+    if not revoked:
+        raise HTTPException(status_code=404, detail="API key not found")
+    return None
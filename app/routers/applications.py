@@ -1,10 +1,11 @@
 """Application API Endpoints"""
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.middleware.auth import get_current_user_id
 from app.schemas import ApplicationCreate, ApplicationUpdate, ApplicationResponse
 from app.services import application_service
+from app.utils.etag import compute_etag, etag_matches, not_modified, set_etag
 
 router = APIRouter()
 
@@ -38,12 +39,19 @@ async def create_application(
 @router.get("", response_model=list[ApplicationResponse])
 @router.get("/", response_model=list[ApplicationResponse])
 async def list_applications(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """Get all applications"""
+    """Get all applications (supports If-None-Match / 304)"""
     apps = await application_service.get_all(db, skip=skip, limit=limit)
+
+    etag = compute_etag(apps, skip, limit)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     return apps
 
 
@@ -51,12 +59,19 @@ async def list_applications(
 @router.get("/{app_id}/", response_model=ApplicationResponse)
 async def get_application(
     app_id: str,
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get single application by ID"""
     app = await application_service.get_by_id(db, app_id)
     if not app:
         raise HTTPException(status_code=404, detail="Application not found")
+
+    etag = compute_etag([app])
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     return app
 
 
@@ -1,22 +1,29 @@
 """Authentication endpoints - Register, Login, Get User"""
 import uuid
 from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import JSONResponse
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
 from app.middleware.auth import get_current_user_id
-from app.schemas import TokenResponse, UserRegister, UserResponse
+from app.models import User
+from app.schemas import RefreshRequest, TokenResponse, UserRegister, UserResponse
 from app.services import auth_service
-from app.utils.rate_limit import limiter
+from app.services.auth_service import RefreshTokenReused
+from app.utils.rate_limit import rate_limit
+from app.utils.security import REFRESH_TOKEN_EXPIRE_DAYS
 
 router = APIRouter()
 
 
-@router.post("/register", response_model=UserResponse, status_code=201)
-@limiter.limit("5/minute")  # Max 5 registrations per minute per IP
+@router.post(
+    "/register",
+    response_model=UserResponse,
+    status_code=201,
+    dependencies=[Depends(rate_limit("register", 5))],  # Max 5 registrations per minute per IP
+)
 async def register_user(
-    request: Request,
     user_in: UserRegister,
     db: AsyncSession = Depends(get_db),
 ):
@@ -38,10 +45,12 @@ async def register_user(
     return user
 
 
-@router.post("/login", response_model=TokenResponse)
-@limiter.limit("10/minute")  # Max 10 login attempts per minute per IP
+@router.post(
+    "/login",
+    response_model=TokenResponse,
+    dependencies=[Depends(rate_limit("login", 10))],  # Max 10 login attempts per minute per IP
+)
 async def login_user(
-    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: AsyncSession = Depends(get_db),
 ):
@@ -52,19 +61,54 @@ async def login_user(
     - username: User email
     - password: User password
 
-    Returns JWT token with 1-hour expiration.
+    Returns JWT token with 1-hour expiration, plus a refresh token for
+    POST /api/auth/refresh.
     Verifies user credentials against PostgreSQL database.
     """
     # Authenticate user (verifies email, password, and active status)
     user = await auth_service.authenticate_user(db, form_data.username, form_data.password)
 
-    # Create JWT token
-    token_data = auth_service.create_token_for_user(user)
+    # Start a new refresh token family for this login
+    refresh_token, _ = await auth_service.issue_refresh_token(db, user.id)
+
+    return _token_response(user, refresh_token)
+
+
+@router.post(
+    "/refresh",
+    response_model=TokenResponse,
+    dependencies=[Depends(rate_limit("refresh", 30))],  # Max 30 refreshes per minute per IP
+)
+async def refresh_access_token(
+    refresh_in: RefreshRequest,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Exchange a refresh token for a new access token and refresh token.
+
+    Refresh tokens are single-use: each call returns a replacement and revokes
+    the one presented. Presenting a used token again revokes the whole chain.
+    """
+    try:
+        user, refresh_token = await auth_service.rotate_refresh_token(db, refresh_in.refresh_token)
+    except RefreshTokenReused as exc:
+        # Respond instead of raising so the unit of work commits the family revocation
+        return JSONResponse(
+            status_code=exc.status_code,
+            content={"detail": exc.detail},
+            headers=exc.headers,
+        )
+    return _token_response(user, refresh_token)
 
+
+def _token_response(user: User, refresh_token: str) -> TokenResponse:
+    token_data = auth_service.create_token_for_user(user)
     return TokenResponse(
         access_token=token_data["access_token"],
         token_type=token_data["token_type"],
         expires_in=token_data["expires_in"],
+        refresh_token=refresh_token,
+        refresh_expires_in=REFRESH_TOKEN_EXPIRE_DAYS * 24 * 3600,
     )
 
 
@@ -77,9 +121,9 @@ async def get_current_user(
     Get current authenticated user.
 
     Requires "Authorization: Bearer <token>" header.
-    Fetches user data from PostgreSQL database.
+    Served from the per-worker profile cache (PostgreSQL on a miss).
     """
-    user = await auth_service.get_user_by_id(db, user_id)
+    user = await auth_service.get_user_profile(db, user_id)
 
     if not user:
         raise HTTPException(
@@ -93,6 +137,7 @@ async def get_current_user(
 @router.post("/logout", status_code=204)
 async def logout_user(
     request: Request,
+    logout_in: RefreshRequest | None = None,
     user_id: uuid.UUID = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
 ):
@@ -101,6 +146,9 @@ async def logout_user(
 
     Requires "Authorization: Bearer <token>" header.
     The token will be added to the blacklist and cannot be used again.
+
+    Optional body {"refresh_token": ...} revokes that session's refresh
+    token family; without it every refresh token of the user is revoked.
     """
     # Extract token from Authorization header
     from fastapi.security import HTTPBearer
@@ -110,5 +158,8 @@ async def logout_user(
 
     # Blacklist the token
     await auth_service.blacklist_token(db, token, user_id)
+    await auth_service.revoke_refresh_tokens(
+        db, user_id, logout_in.refresh_token if logout_in else None
+    )
 
     return None  # 204 No Content
@@ -42,8 +42,7 @@ async def get_dashboard_stats(
     # Get counts in parallel would be more efficient, but for simplicity:
     total_records = await record_service.count_all(db)
     active_objects = len(await object_service.get_user_objects(db, user_id))
-    fields = await field_service.get_fields(db, user_id)
-    fields_count = len(fields)
+    fields_count = await field_service.count_fields(db, user_id)
     applications = await application_service.get_user_applications(db, user_id)
     applications_count = len(applications)
 
@@ -1,10 +1,17 @@
 """Field API Endpoints"""
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.middleware.auth import get_current_user_id
-from app.schemas import FieldCreate, FieldUpdate, FieldResponse
+from app.schemas import (
+    FieldCategoryFacet,
+    FieldCreate,
+    FieldFacetsResponse,
+    FieldResponse,
+    FieldUpdate,
+)
 from app.services import field_service
+from app.utils.etag import compute_etag, etag_matches, not_modified, set_etag
 
 router = APIRouter()
 
@@ -38,6 +45,8 @@ async def create_field(
 @router.get("", response_model=list[FieldResponse])
 @router.get("/", response_model=list[FieldResponse])
 async def list_fields(
+    request: Request,
+    response: Response,
     category: str | None = Query(None, description="Filter by category"),
     is_system: bool | None = Query(None, description="Filter system fields"),
     db: AsyncSession = Depends(get_db),
@@ -51,19 +60,63 @@ async def list_fields(
     Query Parameters:
     - category: Filter by field category (e.g., "Contact Info", "Business", "System")
     - is_system: Filter system fields (true = only system fields, false = only non-system)
+
+    Supports conditional GET: send the returned ETag in If-None-Match to get 304.
     """
+    etag = await field_service.get_fields_etag(db, user_id, category, is_system)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
     fields = await field_service.get_fields(db, user_id, category, is_system)
+    set_etag(response, etag)
     return fields
 
+# IMPORTANT: Define /facets BEFORE /{field_id} to avoid route conflict
+@router.get("/facets", response_model=FieldFacetsResponse)
+@router.get("/facets/", response_model=FieldFacetsResponse)
+async def get_field_facets(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    user_id: str = Depends(get_current_user_id),
+):
+    """
+    Get category facets for the user's field library (field picker).
+
+    Served from the per-user field library cache; supports If-None-Match / 304.
+    """
+    library = await field_service.get_field_library(db, user_id)
+    etag = compute_etag((), library.etag, "facets")
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    set_etag(response, etag)
+    return FieldFacetsResponse(
+        total=library.total,
+        system_count=library.system_count,
+        custom_count=library.total - library.system_count,
+        categories=[
+            FieldCategoryFacet(category=category, count=count)
+            for category, count in library.categories
+        ],
+    )
+
 @router.get("/{field_id}", response_model=FieldResponse)
 async def get_field(
     field_id: str,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
 ):
     """Get single field by ID"""
     field = await field_service.get_by_id(db, field_id)
     if not field:
         raise HTTPException(status_code=404, detail="Field not found")
+
+    etag = compute_etag([field])
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     return field
 
 @router.patch("/{field_id}", response_model=FieldResponse)
@@ -1,10 +1,11 @@
 """ObjectField API Endpoints"""
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.middleware.auth import get_current_user_id
 from app.schemas import ObjectFieldCreate, ObjectFieldUpdate, ObjectFieldResponse
 from app.services import object_field_service
+from app.utils.etag import compute_etag, etag_matches, not_modified, set_etag
 
 router = APIRouter()
 
@@ -36,6 +37,8 @@ async def create_object_field(
 @router.get("", response_model=list[ObjectFieldResponse])
 @router.get("/", response_model=list[ObjectFieldResponse])
 async def list_object_fields(
+    request: Request,
+    response: Response,
     object_id: str = Query(..., description="Object ID to filter fields"),
     db: AsyncSession = Depends(get_db),
 ):
@@ -43,20 +46,34 @@ async def list_object_fields(
     Get all fields for an object.
 
     Example: GET /api/object-fields?object_id=obj_contact
+
+    Supports conditional GET: send the returned ETag in If-None-Match to get 304.
     """
+    etag = await object_field_service.get_fields_for_object_etag(db, object_id)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
     object_fields = await object_field_service.get_fields_for_object(db, object_id)
+    set_etag(response, etag)
     return object_fields
 
 @router.get("/{object_field_id}", response_model=ObjectFieldResponse)
 @router.get("/{object_field_id}/", response_model=ObjectFieldResponse)
 async def get_object_field(
     object_field_id: str,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
 ):
     """Get single object field by ID"""
     object_field = await object_field_service.get_by_id(db, object_field_id)
     if not object_field:
         raise HTTPException(status_code=404, detail="ObjectField not found")
+
+    etag = compute_etag([object_field])
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     return object_field
 
 @router.patch("/{object_field_id}", response_model=ObjectFieldResponse)
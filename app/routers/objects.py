@@ -1,10 +1,11 @@
 """Object API Endpoints"""
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.middleware.auth import get_current_user_id
 from app.schemas import ObjectCreate, ObjectUpdate, ObjectResponse
 from app.services import object_service
+from app.utils.etag import compute_etag, etag_matches, not_modified, set_etag
 
 router = APIRouter()
 
@@ -36,22 +37,36 @@ async def create_object(
 @router.get("", response_model=list[ObjectResponse])
 @router.get("/", response_model=list[ObjectResponse])
 async def list_objects(
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
     user_id: str = Depends(get_current_user_id),
 ):
-    """Get all user's objects"""
+    """Get all user's objects (supports If-None-Match / 304)"""
+    etag = await object_service.get_user_objects_etag(db, user_id)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
     objects = await object_service.get_user_objects(db, user_id)
+    set_etag(response, etag)
     return objects
 
 @router.get("/{object_id}", response_model=ObjectResponse)
 async def get_object(
     object_id: str,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
 ):
     """Get single object by ID"""
     obj = await object_service.get_by_id(db, object_id)
     if not obj:
         raise HTTPException(status_code=404, detail="Object not found")
+
+    etag = compute_etag([obj])
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     return obj
 
 @router.patch("/{object_id}", response_model=ObjectResponse)
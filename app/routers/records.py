@@ -1,12 +1,42 @@
 """Record API Endpoints - Dynamic JSONB data"""
-from fastapi import APIRouter, Depends, HTTPException, Query
+import asyncio
+from collections.abc import AsyncIterator, Callable, Sequence
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import Row, text
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.database import get_db
+from app.config import settings
+from app.database import get_db, get_read_db, get_read_session_factory
 from app.middleware.auth import get_current_user_id
-from app.schemas import RecordCreate, RecordUpdate, RecordResponse, RecordListResponse
+from app.schemas import (
+    RecordBulkCreate,
+    RecordCreate,
+    RecordListResponse,
+    RecordResponse,
+    RecordUpdate,
+)
 from app.services import record_service
+from app.utils.etag import compute_etag, etag_matches, not_modified, set_etag
+from app.utils.negotiation import NegotiatedResponse, NegotiatedRoute, negotiated_etag
+from app.utils.serialization import (
+    RecordJSONResponse,
+    RecordStreamingResponse,
+    record_dicts,
+    record_page,
+    record_page_envelope,
+    stream_records,
+)
 
-router = APIRouter()
+# Bodies and responses may be MessagePack (see app.utils.negotiation)
+router = APIRouter(route_class=NegotiatedRoute, default_response_class=NegotiatedResponse)
+
+# Each stream holds a pooled connection for its whole body; cap them per worker
+_stream_slots = asyncio.Semaphore(settings.RECORD_STREAM_MAX_CONCURRENT)
+
+# Server-side backstop for the stream deadline (transaction-local, like SET LOCAL)
+_STREAM_TIMEOUTS = text(
+    "SELECT set_config('statement_timeout', :timeout, true),"
+    " set_config('idle_in_transaction_session_timeout', :timeout, true)"
+)
 
 # Support both /api/records and /api/records/ (with and without trailing slash)
 @router.post("", response_model=RecordResponse, status_code=201)
@@ -37,55 +67,136 @@ async def create_record(
     record = await record_service.create_record(db, record_in, user_id)
     return record
 
-@router.get("", response_model=RecordListResponse)
-@router.get("/", response_model=RecordListResponse)
+@router.post("/bulk", response_model=list[RecordResponse], status_code=201)
+@router.post("/bulk/", response_model=list[RecordResponse], status_code=201)
+async def create_records_bulk(
+    bulk_in: RecordBulkCreate,
+    db: AsyncSession = Depends(get_db),
+    user_id: str = Depends(get_current_user_id),
+):
+    """
+    Create up to 1000 records of one object in a single transaction.
+
+    Example request:
+    ```json
+    {
+        "object_id": "obj_contact",
+        "records": [
+            {"fld_name": "Ali Yılmaz", "fld_email": "ali@example.com"},
+            {"fld_name": "Ayşe Demir", "fld_email": "ayse@example.com"}
+        ]
+    }
+    ```
+
+    All records are validated first; if any fails, nothing is created and the
+    422 response lists errors with the record index in `loc`.
+    """
+    records = await record_service.create_records_bulk(db, bulk_in, user_id)
+    return records
+
+@router.get("", response_model=RecordListResponse, response_class=RecordJSONResponse)
+@router.get("/", response_model=RecordListResponse, response_class=RecordJSONResponse)
 async def list_records(
+    request: Request,
     object_id: str = Query(..., description="Object ID to filter records"),
     page: int = Query(1, ge=1, description="Page number (1-indexed)"),
-    page_size: int = Query(50, ge=1, le=100, description="Records per page"),
-    db: AsyncSession = Depends(get_db),
+    page_size: int = Query(
+        50, ge=1, le=settings.RECORD_PAGE_SIZE_MAX, description="Records per page"
+    ),
+    db: AsyncSession = Depends(get_read_db),
+    session_factory: Callable[[], AsyncSession] = Depends(get_read_session_factory),
 ):
     """
     Get all records for an object with pagination.
 
     Example: GET /api/records?object_id=obj_contact&page=1&page_size=50
+
+    Supports conditional GET: a matching If-None-Match returns 304 without
+    serializing the page. Rows are encoded straight to JSON, or MessagePack
+    with `Accept: application/msgpack` (no per-record model validation).
+
+    Pages larger than RECORD_STREAM_THRESHOLD (e.g. 5,000 rows for a grid
+    export) are streamed as JSON from a DB cursor in batches, without an ETag.
     """
     skip = (page - 1) * page_size
-    records, total = await record_service.get_records_by_object(
+    if page_size > settings.RECORD_STREAM_THRESHOLD:
+        total = await record_service.count_records_by_object(db, object_id)
+        return _stream_rows(
+            session_factory,
+            lambda session: record_service.stream_record_rows_by_object(
+                session, object_id, skip=skip, limit=page_size,
+                batch_size=settings.RECORD_STREAM_BATCH_SIZE,
+            ),
+            record_page_envelope(total, page, page_size),
+        )
+
+    rows, total = await record_service.get_record_rows_by_object(
         db, object_id, skip=skip, limit=page_size
     )
-    return RecordListResponse(
-        total=total,
-        page=page,
-        page_size=page_size,
-        records=records,
-    )
+
+    etag = negotiated_etag(compute_etag(rows, total, page, page_size))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    response = RecordJSONResponse(record_page(rows, total, page, page_size))
+    set_etag(response, etag)
+    return response
 
 # IMPORTANT: Define /search BEFORE /{record_id} to avoid route conflict
-@router.get("/search", response_model=list[RecordResponse])
-@router.get("/search/", response_model=list[RecordResponse])
+@router.get("/search", response_model=list[RecordResponse], response_class=RecordJSONResponse)
+@router.get("/search/", response_model=list[RecordResponse], response_class=RecordJSONResponse)
 async def search_records(
+    request: Request,
     object_id: str = Query(..., description="Object ID"),
     q: str = Query(..., min_length=1, description="Search term"),
-    db: AsyncSession = Depends(get_db),
+    limit: int = Query(
+        50, ge=1, le=settings.RECORD_PAGE_SIZE_MAX, description="Maximum results"
+    ),
+    db: AsyncSession = Depends(get_read_db),
+    session_factory: Callable[[], AsyncSession] = Depends(get_read_session_factory),
 ):
     """
     Search records by primary_value (fast text search).
 
     Example: GET /api/records/search?object_id=obj_contact&q=Ali
+
+    Limits above RECORD_STREAM_THRESHOLD are streamed as JSON, without an ETag.
     """
-    records = await record_service.search_records(db, object_id, q)
-    return records
+    if limit > settings.RECORD_STREAM_THRESHOLD:
+        return _stream_rows(
+            session_factory,
+            lambda session: record_service.stream_search_record_rows(
+                session, object_id, q, limit=limit,
+                batch_size=settings.RECORD_STREAM_BATCH_SIZE,
+            ),
+        )
+
+    rows = await record_service.search_record_rows(db, object_id, q, limit=limit)
+
+    etag = negotiated_etag(compute_etag(rows, q))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    response = RecordJSONResponse(record_dicts(rows))
+    set_etag(response, etag)
+    return response
 
 @router.get("/{record_id}", response_model=RecordResponse)
 async def get_record(
     record_id: str,
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get single record by ID"""
     record = await record_service.get_by_id(db, record_id)
     if not record:
         raise HTTPException(status_code=404, detail="Record not found")
+
+    etag = negotiated_etag(compute_etag([record]))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     return record
 
 @router.patch("/{record_id}", response_model=RecordResponse)
@@ -124,3 +235,32 @@ async def delete_record(
     if not deleted:
         raise HTTPException(status_code=404, detail="Record not found")
     return None
+
+def _stream_rows(
+    session_factory: Callable[[], AsyncSession],
+    batches: Callable[[AsyncSession], AsyncIterator[Sequence[Row]]],
+    envelope: tuple[bytes, bytes] = (b"[", b"]"),
+) -> RecordStreamingResponse:
+    """
+    Stream record rows as JSON from a session that lives as long as the body.
+
+    At most RECORD_STREAM_MAX_CONCURRENT streams run per worker (503 beyond
+    that), and each is cut off after RECORD_STREAM_TIMEOUT_SECONDS both here
+    and in PostgreSQL.
+    """
+    if _stream_slots.locked():
+        raise HTTPException(
+            status_code=503,
+            detail="Too many concurrent record streams, please retry",
+            headers={"Retry-After": "1"},
+        )
+
+    timeout_ms = str(settings.RECORD_STREAM_TIMEOUT_SECONDS * 1000)
+
+    async def body() -> AsyncIterator[bytes]:
+        async with _stream_slots, session_factory() as session:
+            await session.execute(_STREAM_TIMEOUTS, {"timeout": timeout_ms})
+            async for chunk in stream_records(batches(session), envelope):
+                yield chunk
+
+    return RecordStreamingResponse(body(), deadline=settings.RECORD_STREAM_TIMEOUT_SECONDS)
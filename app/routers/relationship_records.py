@@ -1,12 +1,14 @@
 """RelationshipRecord API Endpoints - Record linking"""
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.middleware.auth import get_current_user_id
 from app.schemas import RelationshipRecordCreate, RelationshipRecordResponse
 from app.services import relationship_record_service
+from app.utils.negotiation import NegotiatedResponse, NegotiatedRoute
 
-router = APIRouter()
+# Bodies and responses may be MessagePack (see app.utils.negotiation)
+router = APIRouter(route_class=NegotiatedRoute, default_response_class=NegotiatedResponse)
 
 # Support both /api/relationship-records and /api/relationship-records/ (with and without trailing slash)
 @router.post("", response_model=RelationshipRecordResponse, status_code=201)
@@ -37,7 +39,7 @@ async def create_relationship_record(
 async def get_related_records(
     record_id: str,
     relationship_id: str = Query(..., description="Relationship ID"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get all records related to a specific record via relationship"""
     links = await relationship_record_service.get_related_records(
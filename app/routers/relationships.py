@@ -1,12 +1,14 @@
 """Relationship API Endpoints"""
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.middleware.auth import get_current_user_id
 from app.schemas import RelationshipCreate, RelationshipUpdate, RelationshipResponse
 from app.services import relationship_service
+from app.utils.negotiation import NegotiatedResponse, NegotiatedRoute
 
-router = APIRouter()
+# Bodies and responses may be MessagePack (see app.utils.negotiation)
+router = APIRouter(route_class=NegotiatedRoute, default_response_class=NegotiatedResponse)
 
 # Support both /api/relationships and /api/relationships/ (with and without trailing slash)
 @router.post("", response_model=RelationshipResponse, status_code=201)
@@ -50,7 +52,7 @@ async def create_relationship(
 @router.get("/{relationship_id}/", response_model=RelationshipResponse)
 async def get_relationship(
     relationship_id: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get single relationship by ID"""
     rel = await relationship_service.get_by_id(db, relationship_id)
@@ -85,7 +87,7 @@ async def update_relationship(
 @router.get("/objects/{object_id}/", response_model=list[RelationshipResponse])
 async def get_object_relationships(
     object_id: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get all relationships for an object"""
     relationships = await relationship_service.get_relationships_for_object(db, object_id)
@@ -1,10 +1,23 @@
 """Pydantic Schemas for Request/Response Validation"""
+from app.schemas.api_key import ApiKeyCreate, ApiKeyCreatedResponse, ApiKeyResponse
 from app.schemas.application import ApplicationCreate, ApplicationResponse, ApplicationUpdate
-from app.schemas.auth import TokenResponse, UserRegister, UserResponse
-from app.schemas.field import FieldCreate, FieldResponse, FieldUpdate
+from app.schemas.auth import RefreshRequest, TokenResponse, UserRegister, UserResponse
+from app.schemas.field import (
+    FieldCategoryFacet,
+    FieldCreate,
+    FieldFacetsResponse,
+    FieldResponse,
+    FieldUpdate,
+)
 from app.schemas.object import ObjectCreate, ObjectResponse, ObjectUpdate
 from app.schemas.object_field import ObjectFieldCreate, ObjectFieldResponse, ObjectFieldUpdate
-from app.schemas.record import RecordCreate, RecordListResponse, RecordResponse, RecordUpdate
+from app.schemas.record import (
+    RecordBulkCreate,
+    RecordCreate,
+    RecordListResponse,
+    RecordResponse,
+    RecordUpdate,
+)
 from app.schemas.relationship import RelationshipCreate, RelationshipResponse, RelationshipUpdate
 from app.schemas.relationship_record import (
     RelationshipRecordCreate,
@@ -16,6 +29,8 @@ __all__ = [
     "FieldCreate",
     "FieldUpdate",
     "FieldResponse",
+    "FieldCategoryFacet",
+    "FieldFacetsResponse",
     "ObjectCreate",
     "ObjectUpdate",
     "ObjectResponse",
@@ -23,6 +38,7 @@ __all__ = [
     "ObjectFieldUpdate",
     "ObjectFieldResponse",
     "RecordCreate",
+    "RecordBulkCreate",
     "RecordUpdate",
     "RecordResponse",
     "RecordListResponse",
@@ -38,4 +54,8 @@ __all__ = [
     "UserRegister",
     "UserResponse",
     "TokenResponse",
+    "RefreshRequest",
+    "ApiKeyCreate",
+    "ApiKeyResponse",
+    "ApiKeyCreatedResponse",
 ]
@@ -0,0 +1,28 @@
+"""API Key Schemas"""
+import uuid
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+
+class ApiKeyCreate(BaseModel):
+    """Schema for creating an API key"""
+    name: str = Field(..., min_length=1, max_length=255, description="Key name (e.g. 'CI pipeline')")
+    expires_in_days: int | None = Field(None, ge=1, le=3650, description="Lifetime in days (None = no expiry)")
+
+
+class ApiKeyResponse(BaseModel):
+    """Schema for API key response (the secret is never returned)"""
+    id: uuid.UUID
+    name: str
+    prefix: str
+    created_at: datetime
+    expires_at: datetime | None = None
+    revoked_at: datetime | None = None
+
+    model_config = {"from_attributes": True}
+
+
+class ApiKeyCreatedResponse(ApiKeyResponse):
+    """Schema for a newly created API key - the only time the full key is shown"""
+    key: str = Field(..., description="Full API key; send it as the X-API-Key header")
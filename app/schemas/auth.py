@@ -35,6 +35,13 @@ class TokenResponse(BaseModel):
     access_token: str
     token_type: str = "bearer"
     expires_in: int = 3600  # seconds (1 hour)
+    refresh_token: str | None = None
+    refresh_expires_in: int | None = None  # seconds
+
+
+class RefreshRequest(BaseModel):
+    """Schema for exchanging a refresh token"""
+    refresh_token: str = Field(..., min_length=1, description="Refresh token from login or the last refresh")
 
 
 class TokenBlacklist(BaseModel):
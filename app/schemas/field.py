@@ -41,3 +41,17 @@ class FieldResponse(FieldBase):
     created_by: uuid.UUID | None = None
 
     model_config = {"from_attributes": True}  # Pydantic 2.x (was orm_mode in v1)
+
+
+class FieldCategoryFacet(BaseModel):
+    """Field count for one category"""
+    category: str | None = Field(None, description="Category name (null = uncategorized)")
+    count: int
+
+
+class FieldFacetsResponse(BaseModel):
+    """Schema for field library facets (field picker)"""
+    total: int = Field(..., description="Fields visible to the user (global + own)")
+    system_count: int = Field(..., description="System fields")
+    custom_count: int = Field(..., description="Non-system fields")
+    categories: list[FieldCategoryFacet] = Field(..., description="Field counts per category")
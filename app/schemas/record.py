@@ -5,6 +5,8 @@ from typing import Any
 
 from pydantic import BaseModel, Field
 
+from app.config import settings
+
 
 class RecordBase(BaseModel):
     """Base schema with common fields"""
@@ -16,6 +18,14 @@ class RecordCreate(RecordBase):
     """Schema for creating a new record"""
 
 
+class RecordBulkCreate(BaseModel):
+    """Schema for creating many records of one object"""
+    object_id: str = Field(..., description="Object ID all records belong to")
+    records: list[dict[str, Any]] = Field(
+        ..., min_length=1, max_length=1000, description="Field data for each record (JSONB)"
+    )
+
+
 class RecordUpdate(BaseModel):
     """Schema for updating a record (all fields optional)"""
     data: dict[str, Any] | None = Field(None, description="Updated field data")
@@ -38,5 +48,5 @@ class RecordListResponse(BaseModel):
     """Schema for paginated record list"""
     total: int = Field(..., description="Total record count")
     page: int = Field(..., ge=1, description="Current page number")
-    page_size: int = Field(..., ge=1, le=100, description="Records per page")
+    page_size: int = Field(..., ge=1, le=settings.RECORD_PAGE_SIZE_MAX, description="Records per page")
     records: list[RecordResponse] = Field(..., description="List of records")
@@ -1,7 +1,9 @@
 """Business Services Layer"""
+from app.services.api_key_service import ApiKeyService, api_key_service
 from app.services.application_service import ApplicationService, application_service
 from app.services.auth_service import AuthService, auth_service
 from app.services.field_service import FieldService, field_service
+from app.services.metadata_cache import MetadataCache, metadata_cache
 from app.services.object_field_service import ObjectFieldService, object_field_service
 from app.services.object_service import ObjectService, object_service
 from app.services.record_service import RecordService, record_service
@@ -28,4 +30,8 @@ __all__ = [
     "application_service",
     "AuthService",
     "auth_service",
+    "ApiKeyService",
+    "api_key_service",
+    "MetadataCache",
+    "metadata_cache",
 ]
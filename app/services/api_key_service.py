@@ -0,0 +1,178 @@
+"""API Key Service - Issue, revoke and verify hashed API keys"""
+import uuid
+from datetime import UTC, datetime, timedelta
+from typing import NamedTuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models import ApiKey, User
+from app.schemas import ApiKeyCreate
+from app.services.base import BaseService
+from app.utils.cache import TTLCache
+from app.utils.invalidation import API_KEYS_TOPIC, invalidation_bus
+from app.utils.security import (
+    generate_api_key,
+    hash_api_key_secret,
+    split_api_key,
+    verify_api_key_secret,
+)
+
+
+class VerifiedKey(NamedTuple):
+    """What a worker remembers about a key it has verified"""
+    user_id: uuid.UUID
+    secret_hash: str
+    expires_at: datetime | None
+
+
+# prefix -> VerifiedKey; dropped on revocation in every worker
+_verified_keys = TTLCache(
+    "api_keys", maxsize=settings.API_KEY_CACHE_SIZE, ttl=settings.API_KEY_CACHE_TTL_SECONDS
+)
+
+
+class ApiKeyService(BaseService[ApiKey]):
+    """Service for API key operations"""
+
+    def __init__(self):
+        super().__init__(ApiKey)
+
+    async def create_api_key(
+        self,
+        db: AsyncSession,
+        key_in: ApiKeyCreate,
+        user_id: uuid.UUID,
+    ) -> tuple[ApiKey, str]:
+        """
+        Create an API key for the user.
+
+        Returns:
+            (stored key, full plain key - shown to the user once, never stored)
+        """
+        key, prefix, secret = generate_api_key()
+        expires_at = (
+            datetime.now(UTC) + timedelta(days=key_in.expires_in_days)
+            if key_in.expires_in_days else None
+        )
+        api_key = await self.create(db, {
+            "id": uuid.uuid4(),
+            "user_id": user_id,
+            "name": key_in.name,
+            "prefix": prefix,
+            "secret_hash": hash_api_key_secret(secret),
+            "expires_at": expires_at,
+        })
+        return api_key, key
+
+    async def get_user_api_keys(self, db: AsyncSession, user_id: uuid.UUID) -> list[ApiKey]:
+        """Get the user's API keys (newest first)"""
+        result = await db.execute(
+            select(ApiKey)
+            .where(ApiKey.user_id == user_id)
+            .order_by(ApiKey.created_at.desc())
+        )
+        return list(result.scalars().all())
+
+    async def revoke_api_key(
+        self,
+        db: AsyncSession,
+        key_id: uuid.UUID,
+        user_id: uuid.UUID,
+    ) -> bool:
+        """
+        Revoke one of the user's API keys.
+
+        Returns:
+            True if revoked, False if not found (or not the user's)
+        """
+        api_key = await self._fetch_by_id(db, key_id)
+        if api_key is None or api_key.user_id != user_id:
+            return False
+
+        if api_key.revoked_at is None:
+            api_key.revoked_at = datetime.now(UTC)
+            await invalidation_bus.publish(db, API_KEYS_TOPIC, api_key.prefix)
+            await db.flush()
+        return True
+
+    async def verify_api_key(self, db: AsyncSession, key: str) -> uuid.UUID | None:
+        """
+        Resolve an API key to its owner's user ID.
+
+        The prefix selects at most one row through its unique index; the secret
+        is then checked with a constant-time HMAC comparison. Verified keys are
+        remembered per worker, so repeat calls skip the database.
+
+        Returns:
+            User ID, or None if the key is malformed, unknown, revoked or expired
+        """
+        parts = split_api_key(key)
+        if parts is None:
+            return None
+        prefix, secret = parts
+
+        cached = _verified_keys.get(prefix)
+        entry = cached or await self._load_key(db, prefix)
+        if not _matches(entry, secret):
+            return None
+
+        if cached is None:
+            _verified_keys.set(prefix, entry)
+        return entry.user_id
+
+    def verified_prefix(self, key: str) -> str | None:
+        """
+        Prefix of a key this worker has already verified (no database access).
+
+        Returns:
+            Prefix, or None if the key is not cached or does not match
+        """
+        parts = split_api_key(key)
+        if parts is None:
+            return None
+        prefix, secret = parts
+        return prefix if _matches(_verified_keys.get(prefix), secret) else None
+
+    async def forget_user_keys(self, db: AsyncSession, user_id: uuid.UUID) -> None:
+        """Drop the user's keys from every worker's cache (e.g. on deactivation)"""
+        result = await db.execute(
+            select(ApiKey.prefix).where(ApiKey.user_id == user_id, ApiKey.revoked_at.is_(None))
+        )
+        prefixes = result.scalars().all()
+        if prefixes:
+            await invalidation_bus.publish(db, API_KEYS_TOPIC, *prefixes)
+
+    async def _load_key(self, db: AsyncSession, prefix: str) -> VerifiedKey | None:
+        result = await db.execute(
+            select(ApiKey.user_id, ApiKey.secret_hash, ApiKey.expires_at)
+            .join(User, User.id == ApiKey.user_id)
+            .where(
+                ApiKey.prefix == prefix,
+                ApiKey.revoked_at.is_(None),
+                User.is_active == True,
+            )
+        )
+        row = result.one_or_none()
+        return VerifiedKey(*row) if row is not None else None
+
+
+def _matches(entry: VerifiedKey | None, secret: str) -> bool:
+    """True if entry exists, the secret is correct and the key has not expired"""
+    if entry is None or not verify_api_key_secret(secret, entry.secret_hash):
+        return False
+    return entry.expires_at is None or entry.expires_at > datetime.now(UTC)
+
+
+def api_key_cache_stats() -> dict:
+    """Size and hit rate of the verified API key cache (this worker)"""
+    return _verified_keys.stats()
+
+
+# Singleton instance
+api_key_service = ApiKeyService()
+
+# Revoked keys stop working in every worker, not only after the cache TTL
+invalidation_bus.subscribe(API_KEYS_TOPIC, _verified_keys.pop)
+invalidation_bus.on_flush(_verified_keys.clear)
@@ -39,8 +39,7 @@ class ApplicationService(BaseService[Application]):
             return None
 
         app.published_at = datetime.now(UTC)
-        await db.commit()
-        await db.refresh(app)
+        await db.flush()
         return app
 
     async def update_application(
@@ -3,18 +3,52 @@ import uuid
 from datetime import UTC, datetime, timedelta
 
 from fastapi import HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import lambda_stmt, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import User, TokenBlacklist
-from app.schemas import UserRegister
+from app.config import settings
+from app.models import RefreshToken, User, TokenBlacklist
+from app.schemas import UserRegister, UserResponse
+from app.services.api_key_service import api_key_service
 from app.services.base import BaseService
+from app.services.last_login import last_login_buffer
+from app.services.revocation import revocation_key, revoked_tokens
+from app.utils.cache import TTLCache
+from app.utils.invalidation import REVOKED_TOPIC, USERS_TOPIC, invalidation_bus
 from app.utils.security import (
     create_access_token,
     decode_access_token,
-    hash_password,
-    verify_password,
+    generate_refresh_token,
+    hash_refresh_token,
+    hash_password_async,
+    verify_password_async,
+    PasswordHasherBusy,
     ACCESS_TOKEN_EXPIRE_MINUTES,
+    REFRESH_TOKEN_EXPIRE_DAYS,
+)
+
+
+class RefreshTokenReused(HTTPException):
+    """
+    A rotated refresh token was presented again.
+
+    Its family has been revoked in the session; the caller must commit that
+    revocation even though the request fails.
+    """
+
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+# str(user_id) -> UserResponse; dropped on profile changes in every worker
+_profiles = TTLCache(
+    "user_profiles",
+    maxsize=settings.USER_PROFILE_CACHE_SIZE,
+    ttl=settings.USER_PROFILE_CACHE_TTL_SECONDS,
 )
 
 
@@ -34,6 +68,30 @@ class AuthService(BaseService[User]):
         result = await db.execute(select(User).where(User.id == user_id))
         return result.scalar_one_or_none()
 
+    async def get_user_profile(self, db: AsyncSession, user_id: uuid.UUID) -> UserResponse | None:
+        """
+        Get the user's public profile from the per-worker cache.
+
+        Invalidated on profile changes and deactivation. last_login is written
+        behind, so it may lag by up to the cache TTL plus the flush interval.
+        """
+        profile = _profiles.get(str(user_id))
+        if profile is None:
+            user = await self.get_user_by_id(db, user_id)
+            if user is None:
+                return None
+            profile = UserResponse.model_validate(user)
+            _profiles.set(str(user_id), profile)
+        return profile
+
+    async def deactivate_user(self, db: AsyncSession, user_id: uuid.UUID) -> User | None:
+        """Deactivate a user (login is refused; cached profiles and API keys are dropped)"""
+        user = await self.update(db, user_id, {"is_active": False})
+        if user is not None:
+            # Cached keys would otherwise keep authenticating until their TTL
+            await api_key_service.forget_user_keys(db, user_id)
+        return user
+
     async def register_user(
         self,
         db: AsyncSession,
@@ -51,6 +109,7 @@ class AuthService(BaseService[User]):
 
         Raises:
             HTTPException 400: If email already exists
+            HTTPException 503: If the password pool is saturated
         """
         # Check if user already exists
         existing_user = await self.get_user_by_email(db, user_in.email)
@@ -60,8 +119,11 @@ class AuthService(BaseService[User]):
                 detail="Email already registered",
             )
 
-        # Hash password
-        hashed_password = hash_password(user_in.password)
+        # Hash password (off the event loop)
+        try:
+            hashed_password = await hash_password_async(user_in.password)
+        except PasswordHasherBusy:
+            raise self._password_pool_busy() from None
 
         # Create user
         user_data = {
@@ -75,8 +137,7 @@ class AuthService(BaseService[User]):
 
         new_user = User(**user_data)
         db.add(new_user)
-        await db.commit()
-        await db.refresh(new_user)
+        await db.flush()
 
         return new_user
 
@@ -99,6 +160,10 @@ class AuthService(BaseService[User]):
 
         Raises:
             HTTPException 401: If credentials are invalid
+            HTTPException 503: If the password pool is saturated
+
+        Note:
+            last_login is buffered and persisted by LastLoginBuffer, not here.
         """
         user = await self.get_user_by_email(db, email)
 
@@ -116,20 +181,33 @@ class AuthService(BaseService[User]):
                 detail="User account is inactive",
             )
 
-        # Verify password
-        if not verify_password(password, user.hashed_password):
+        # Verify password (off the event loop)
+        try:
+            password_ok = await verify_password_async(password, user.hashed_password)
+        except PasswordHasherBusy:
+            raise self._password_pool_busy() from None
+
+        if not password_ok:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password",
             )
 
-        # Update last login
-        user.last_login = datetime.now(UTC)
-        await db.commit()
-        await db.refresh(user)
+        # Update last login (written behind in batches)
+        last_login_buffer.record(user.id, datetime.now(UTC))
 
         return user
 
+    async def _invalidate(self, db: AsyncSession, db_obj: User) -> None:
+        await invalidation_bus.publish(db, USERS_TOPIC, str(db_obj.id))
+
+    def _password_pool_busy(self) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication is temporarily overloaded, please retry",
+            headers={"Retry-After": "1"},
+        )
+
     def create_token_for_user(self, user: User) -> dict:
         """
         Create JWT access token for user.
@@ -160,6 +238,142 @@ class AuthService(BaseService[User]):
             "jti": jti,  # Return jti for potential blacklist storage
         }
 
+    async def issue_refresh_token(
+        self,
+        db: AsyncSession,
+        user_id: uuid.UUID,
+        family_id: uuid.UUID | None = None,
+    ) -> tuple[str, RefreshToken]:
+        """
+        Create a refresh token and store its hash.
+
+        Args:
+            db: Database session
+            user_id: Token owner
+            family_id: Rotation family (None starts a new one, i.e. a new login)
+
+        Returns:
+            (plain token for the client, stored row)
+        """
+        token, refresh = self._new_refresh_token(user_id, family_id or uuid.uuid4())
+        db.add(refresh)
+        await db.flush()
+        return token, refresh
+
+    async def rotate_refresh_token(self, db: AsyncSession, token: str) -> tuple[User, str]:
+        """
+        Exchange a refresh token for a new one (the old one is revoked).
+
+        Reusing an already-rotated token means it leaked: the whole family is
+        revoked, logging out both the attacker and the legitimate client.
+
+        Args:
+            db: Database session
+            token: Plain refresh token
+
+        Returns:
+            (user, new plain refresh token)
+
+        Raises:
+            HTTPException 401: If the token is unknown or expired
+            RefreshTokenReused: If the token was already rotated (family revoked)
+            HTTPException 403: If the user is inactive
+        """
+        # Indexed lookup by keyed hash; the row lock serializes concurrent refreshes
+        result = await db.execute(
+            select(RefreshToken)
+            .where(RefreshToken.token_hash == hash_refresh_token(token))
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        refresh = result.scalar_one_or_none()
+        now = datetime.now(UTC)
+
+        if refresh is None or refresh.expires_at <= now:
+            raise self._invalid_refresh_token()
+
+        if refresh.revoked_at is not None:
+            await self.revoke_refresh_family(db, refresh.family_id)
+            raise RefreshTokenReused()
+
+        user = await self.get_user_by_id(db, refresh.user_id)
+        if user is None or not user.is_active:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="User account is inactive",
+            )
+
+        new_token, new_refresh = self._new_refresh_token(refresh.user_id, refresh.family_id)
+        refresh.revoked_at = now
+        refresh.replaced_by = new_refresh.id
+        db.add(new_refresh)
+        await db.flush()
+        return user, new_token
+
+    async def revoke_refresh_family(self, db: AsyncSession, family_id: uuid.UUID) -> None:
+        """Revoke every still-active token of a rotation family"""
+        await db.execute(
+            update(RefreshToken)
+            .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=datetime.now(UTC))
+            .execution_options(synchronize_session=False)
+        )
+
+    async def revoke_refresh_tokens(
+        self,
+        db: AsyncSession,
+        user_id: uuid.UUID,
+        token: str | None = None,
+    ) -> None:
+        """
+        Revoke refresh tokens on logout.
+
+        Args:
+            db: Database session
+            user_id: Logged-out user
+            token: Refresh token of the session (None revokes all of the user's sessions)
+        """
+        if token is None:
+            await db.execute(
+                update(RefreshToken)
+                .where(RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None))
+                .values(revoked_at=datetime.now(UTC))
+                .execution_options(synchronize_session=False)
+            )
+            return
+
+        result = await db.execute(
+            select(RefreshToken.family_id).where(
+                RefreshToken.token_hash == hash_refresh_token(token),
+                RefreshToken.user_id == user_id,
+            )
+        )
+        family_id = result.scalar_one_or_none()
+        if family_id is not None:
+            await self.revoke_refresh_family(db, family_id)
+
+    def _new_refresh_token(
+        self,
+        user_id: uuid.UUID,
+        family_id: uuid.UUID,
+    ) -> tuple[str, RefreshToken]:
+        token = generate_refresh_token()
+        refresh = RefreshToken(
+            id=uuid.uuid4(),
+            token_hash=hash_refresh_token(token),
+            user_id=user_id,
+            family_id=family_id,
+            expires_at=datetime.now(UTC) + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
+        )
+        return token, refresh
+
+    def _invalid_refresh_token(self) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
     async def is_token_blacklisted(self, db: AsyncSession, jti: str) -> bool:
         """
         Check if a token is blacklisted.
@@ -170,10 +384,17 @@ class AuthService(BaseService[User]):
 
         Returns:
             True if token is blacklisted, False otherwise
+
+        Answered from the in-memory revoked token set while it is loaded;
+        queries token_blacklist during startup, after a listener gap, or when
+        the invalidation bus is disabled.
         """
-        result = await db.execute(
-            select(TokenBlacklist).where(TokenBlacklist.jti == jti)
-        )
+        if revoked_tokens.loaded:
+            return revoked_tokens.contains(jti)
+
+        result = await db.execute(lambda_stmt(
+            lambda: select(TokenBlacklist.jti).where(TokenBlacklist.jti == jti)
+        ))
         return result.scalar_one_or_none() is not None
 
     async def blacklist_token(
@@ -220,8 +441,13 @@ class AuthService(BaseService[User]):
             expires_at=expires_at,
         )
         db.add(blacklist_entry)
-        await db.commit()
+        await invalidation_bus.publish(db, REVOKED_TOPIC, revocation_key(jti, expires_at))
+        await db.flush()
 
 
 # Singleton instance
 auth_service = AuthService()
+
+# Stay in sync with profile changes in every worker
+invalidation_bus.subscribe(USERS_TOPIC, _profiles.pop)
+invalidation_bus.on_flush(_profiles.clear)
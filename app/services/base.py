@@ -1,10 +1,12 @@
 """Base Service Class - Reusable CRUD operations"""
 from typing import Generic, TypeVar
 
-from sqlalchemy import func, select
+from sqlalchemy import Select, func, lambda_stmt, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import Base
+from app.services.metadata_cache import CachedRows, from_snapshot, metadata_cache, to_snapshot
+from app.utils.etag import compute_etag
 
 ModelType = TypeVar("ModelType", bound=Base)
 
@@ -15,10 +17,61 @@ class BaseService(Generic[ModelType]):
         self.model = model
 
     async def get_by_id(self, db: AsyncSession, id: str) -> ModelType | None:
-        """Get single record by ID"""
-        result = await db.execute(select(self.model).where(self.model.id == id))
+        """
+        Get single record by ID.
+
+        Served from the metadata cache for services that define `_cache_key`.
+        Cached results are detached copies - use `_fetch_by_id` when the
+        instance will be modified.
+        """
+        key = self._cache_key(id)
+        if key is None:
+            return await self._fetch_by_id(db, id)
+
+        snapshot = metadata_cache.get(key)
+        if snapshot is not None:
+            return from_snapshot(self.model, snapshot)
+
+        db_obj = await self._fetch_by_id(db, id)
+        if db_obj is not None:
+            metadata_cache.set(key, to_snapshot(db_obj))
+        return db_obj
+
+    async def _fetch_by_id(self, db: AsyncSession, id: str) -> ModelType | None:
+        """Load record by ID from the database (session-attached)"""
+        # Lambda statement: built and cache-keyed once per model, not per call
+        model = self.model
+        result = await db.execute(lambda_stmt(lambda: select(model).where(model.id == id)))
         return result.scalar_one_or_none()
 
+    async def _load_cached(self, db: AsyncSession, key: tuple, query: Select) -> CachedRows:
+        """Run a list query through the metadata cache (ETag is computed once per load)"""
+        cached = metadata_cache.get(key)
+        if cached is None:
+            result = await db.execute(query)
+            rows = list(result.scalars().all())
+            cached = CachedRows(
+                etag=compute_etag(rows),
+                snapshots=[to_snapshot(row) for row in rows],
+            )
+            metadata_cache.set(key, cached)
+        return cached
+
+    def _materialize(self, cached: CachedRows) -> list[ModelType]:
+        """Build detached instances from cached rows"""
+        return [from_snapshot(self.model, snapshot) for snapshot in cached.snapshots]
+
+    def _cache_key(self, id: str) -> tuple | None:
+        """Metadata cache key for `get_by_id` (None = not cached)"""
+        return None
+
+    async def _invalidate(self, db: AsyncSession, db_obj: ModelType) -> None:
+        """
+        Publish cache invalidations for db_obj (created/updated/deleted).
+
+        Called before commit so the NOTIFY joins the same transaction.
+        """
+
     async def get_all(
         self,
         db: AsyncSession,
@@ -35,8 +88,8 @@ class BaseService(Generic[ModelType]):
         """Create new record"""
         db_obj = self.model(**obj_in)
         db.add(db_obj)
-        await db.commit()
-        await db.refresh(db_obj)
+        await self._invalidate(db, db_obj)
+        await db.flush()
         return db_obj
 
     async def update(
@@ -46,7 +99,7 @@ class BaseService(Generic[ModelType]):
         obj_in: dict,
     ) -> ModelType | None:
         """Update existing record"""
-        db_obj = await self.get_by_id(db, id)
+        db_obj = await self._fetch_by_id(db, id)
         if not db_obj:
             return None
 
@@ -54,18 +107,19 @@ class BaseService(Generic[ModelType]):
             if value is not None:  # Only update non-None values
                 setattr(db_obj, field, value)
 
-        await db.commit()
-        await db.refresh(db_obj)
+        await self._invalidate(db, db_obj)
+        await db.flush()
         return db_obj
 
     async def delete(self, db: AsyncSession, id: str) -> bool:
         """Delete record by ID"""
-        db_obj = await self.get_by_id(db, id)
+        db_obj = await self._fetch_by_id(db, id)
         if not db_obj:
             return False
 
         await db.delete(db_obj)
-        await db.commit()
+        await self._invalidate(db, db_obj)
+        await db.flush()
         return True
 
     async def count_all(self, db: AsyncSession) -> int:
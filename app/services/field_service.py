@@ -1,5 +1,8 @@
 """Field Service - Field CRUD operations"""
 import uuid
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import Any
 
 from sqlalchemy import or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -7,6 +10,52 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.models import Field
 from app.schemas import FieldCreate, FieldUpdate
 from app.services.base import BaseService
+from app.services.metadata_cache import (
+    FIELDS_SCOPE,
+    GLOBAL_FIELDS_SCOPE,
+    OBJECT_FIELDS_SCOPE,
+    from_snapshot,
+    metadata_cache,
+    to_snapshot,
+    user_fields_scope,
+)
+from app.utils.etag import compute_etag
+from app.utils.invalidation import METADATA_TOPIC, invalidation_bus
+
+
+@dataclass(frozen=True)
+class FieldLibrary:
+    """
+    Materialized field library for one user (global fields + user's own).
+
+    Built once per cache load; category index and facets are precomputed so
+    filtered listings and the field picker never rescan the full library.
+    """
+    etag: str
+    snapshots: list[dict[str, Any]]
+    by_category: dict[str | None, list[dict[str, Any]]]
+    categories: list[tuple[str | None, int]]  # (category, count), sorted by category
+    system_count: int
+
+    @property
+    def total(self) -> int:
+        return len(self.snapshots)
+
+    @classmethod
+    def build(cls, fields: list[Field]) -> "FieldLibrary":
+        snapshots = [to_snapshot(field) for field in fields]
+        by_category: dict[str | None, list[dict[str, Any]]] = defaultdict(list)
+        for snapshot in snapshots:
+            by_category[snapshot["category"]].append(snapshot)
+
+        counts = Counter({category: len(items) for category, items in by_category.items()})
+        return cls(
+            etag=compute_etag(fields),
+            snapshots=snapshots,
+            by_category=dict(by_category),
+            categories=sorted(counts.items(), key=lambda item: (item[0] is None, item[0] or "")),
+            system_count=sum(1 for snapshot in snapshots if snapshot["is_system_field"]),
+        )
 
 
 class FieldService(BaseService[Field]):
@@ -27,6 +76,31 @@ class FieldService(BaseService[Field]):
         field_data["created_by"] = user_id
         return await self.create(db, field_data)
 
+    async def get_field_library(self, db: AsyncSession, user_id: uuid.UUID) -> FieldLibrary:
+        """
+        Get the user's field library (global + user's own) from the per-user cache.
+
+        Invalidated by global field changes and by changes to the user's own fields.
+        """
+        key = metadata_cache.key(
+            "field_library",
+            str(user_id),
+            scopes=[GLOBAL_FIELDS_SCOPE, user_fields_scope(user_id)],
+        )
+        library = metadata_cache.get(key)
+        if library is None:
+            result = await db.execute(
+                select(Field).where(
+                    or_(
+                        Field.is_global == True,
+                        Field.created_by == user_id
+                    )
+                )
+            )
+            library = FieldLibrary.build(list(result.scalars().all()))
+            metadata_cache.set(key, library)
+        return library
+
     async def get_fields(
         self,
         db: AsyncSession,
@@ -35,23 +109,32 @@ class FieldService(BaseService[Field]):
         is_system: bool | None = None,
     ) -> list[Field]:
         """Get fields (global + user's own), optionally filter by category and system"""
-        query = select(Field).where(
-            or_(
-                Field.is_global == True,
-                Field.created_by == user_id
-            )
-        )
+        library = await self.get_field_library(db, user_id)
 
         # Filter by category if provided
-        if category:
-            query = query.where(Field.category == category)
+        snapshots = library.by_category.get(category, []) if category else library.snapshots
 
         # Filter by system fields if provided
         if is_system is not None:
-            query = query.where(Field.is_system_field == is_system)
+            snapshots = [s for s in snapshots if s["is_system_field"] == is_system]
 
-        result = await db.execute(query)
-        return list(result.scalars().all())
+        return [from_snapshot(Field, snapshot) for snapshot in snapshots]
+
+    async def get_fields_etag(
+        self,
+        db: AsyncSession,
+        user_id: uuid.UUID,
+        category: str | None = None,
+        is_system: bool | None = None,
+    ) -> str:
+        """ETag of get_fields() (no query when the library is cached)"""
+        library = await self.get_field_library(db, user_id)
+        return compute_etag((), library.etag, category or None, is_system)
+
+    async def count_fields(self, db: AsyncSession, user_id: uuid.UUID) -> int:
+        """Number of fields visible to the user (global + user's own)"""
+        library = await self.get_field_library(db, user_id)
+        return library.total
 
     async def get_global_fields(self, db: AsyncSession) -> list[Field]:
         """Get all global (system) fields"""
@@ -81,5 +164,18 @@ class FieldService(BaseService[Field]):
         update_data = field_in.model_dump(exclude_unset=True)
         return await self.update(db, field_id, update_data)
 
+    def _cache_key(self, id: str) -> tuple:
+        return metadata_cache.key("field", id, scopes=[FIELDS_SCOPE])
+
+    async def _invalidate(self, db: AsyncSession, db_obj: Field) -> None:
+        # Global fields appear in every user's library; custom ones only in the owner's
+        library_scope = (
+            GLOBAL_FIELDS_SCOPE if db_obj.is_global else user_fields_scope(db_obj.created_by)
+        )
+        # Deleting a field cascades to its object_fields rows
+        await invalidation_bus.publish(
+            db, METADATA_TOPIC, FIELDS_SCOPE, OBJECT_FIELDS_SCOPE, library_scope
+        )
+
 # Singleton instance
 field_service = FieldService()
@@ -0,0 +1,149 @@
+"""Last Login Buffer - Write-behind batching of users.last_login updates"""
+import asyncio
+import contextlib
+import logging
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, column, or_, update, values
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models import User
+
+logger = logging.getLogger(__name__)
+
+
+class LastLoginBuffer:
+    """
+    Collects login timestamps in memory and writes them in one statement.
+
+    Login stays a read-only request; a background loop flushes the buffer
+    every `interval_seconds` (or sooner once `max_pending` users are waiting)
+    with a single UPDATE ... FROM (VALUES ...). last_login is advisory, so a
+    crash loses at most one interval of timestamps.
+
+    While the database is failing, flushes back off for `interval_seconds`
+    and the buffer holds at most `max_buffered` users (default: ten times
+    `max_pending`); logins of further users are dropped and counted.
+    """
+
+    def __init__(self, interval_seconds: float, max_pending: int, max_buffered: int | None = None):
+        self.interval_seconds = interval_seconds
+        self.max_pending = max_pending
+        self.max_buffered = max_buffered or max_pending * 10
+        self._pending: dict[uuid.UUID, datetime] = {}
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self.total_flushed = 0
+        self.last_flushed = 0
+        self.errors = 0
+        self.dropped = 0
+
+    def record(self, user_id: uuid.UUID, at: datetime) -> None:
+        """Buffer a login (the latest timestamp per user wins)"""
+        self._merge(user_id, at)
+        if len(self._pending) >= self.max_pending:
+            self._wakeup.set()
+
+    async def flush(self, db: AsyncSession) -> int:
+        """
+        Write all buffered timestamps in one UPDATE and commit.
+
+        Returns:
+            Number of users in the batch
+        """
+        batch, self._pending = self._pending, {}
+        if not batch:
+            return 0
+
+        rows = values(
+            column("id", UUID(as_uuid=True)),
+            column("last_login", DateTime(timezone=True)),
+            name="logins",
+        ).data(list(batch.items()))
+        users = User.__table__
+        try:
+            await db.execute(
+                update(users)
+                .where(users.c.id == rows.c.id)
+                # Never move last_login backwards (another worker may have flushed a later login)
+                .where(or_(users.c.last_login.is_(None), users.c.last_login < rows.c.last_login))
+                # A login is not a profile change: keep updated_at as is
+                .values(last_login=rows.c.last_login, updated_at=users.c.updated_at)
+            )
+            await db.commit()
+        except Exception:
+            # Put the batch back unless newer logins arrived meanwhile; no wakeup,
+            # the loop retries after its backoff
+            for user_id, at in batch.items():
+                self._merge(user_id, at)
+            raise
+
+        self.last_flushed = len(batch)
+        self.total_flushed += len(batch)
+        return len(batch)
+
+    async def run_once(self) -> None:
+        """Flush using a dedicated session"""
+        async with AsyncSessionLocal() as db:
+            await self.flush(db)
+
+    async def start(self) -> None:
+        """Start the background loop (no-op if already running)"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run_forever())
+
+    async def stop(self) -> None:
+        """Stop the background loop and write whatever is still buffered"""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        try:
+            await self.run_once()
+        except Exception:
+            logger.exception("Final last_login flush failed")
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self._pending),
+            "last_flushed": self.last_flushed,
+            "total_flushed": self.total_flushed,
+            "errors": self.errors,
+            "dropped": self.dropped,
+        }
+
+    def _merge(self, user_id: uuid.UUID, at: datetime) -> None:
+        previous = self._pending.get(user_id)
+        if previous is None and len(self._pending) >= self.max_buffered:
+            self.dropped += 1
+            return
+        if previous is None or at > previous:
+            self._pending[user_id] = at
+
+    async def _run_forever(self) -> None:
+        while True:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval_seconds)
+            self._wakeup.clear()
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.errors += 1
+                logger.exception("last_login flush failed")
+                # Back off instead of retrying at once (the buffer is likely still full)
+                await asyncio.sleep(self.interval_seconds)
+                self._wakeup.clear()
+
+
+# Singleton instance
+last_login_buffer = LastLoginBuffer(
+    interval_seconds=settings.LAST_LOGIN_FLUSH_INTERVAL_SECONDS,
+    max_pending=settings.LAST_LOGIN_MAX_PENDING,
+)
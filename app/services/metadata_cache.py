@@ -0,0 +1,135 @@
+"""Metadata Cache - Versioned in-process cache for objects, fields and object-fields"""
+import copy
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any, NamedTuple
+
+from sqlalchemy import inspect
+
+from app.config import settings
+from app.utils.cache import TTLCache
+from app.utils.invalidation import METADATA_TOPIC, invalidation_bus
+
+# Version scopes (bumped on every mutation that affects them)
+FIELDS_SCOPE = "fields"                # Any field change
+GLOBAL_FIELDS_SCOPE = "fields:global"  # Global (system) fields in every user's library
+OBJECT_FIELDS_SCOPE = "object_fields"  # ObjectField rows looked up by ID
+
+
+def user_fields_scope(user_id: Any) -> str:
+    """Scope covering the custom fields created by a user"""
+    return f"fields_of:{user_id}"
+
+
+def object_scope(object_id: str) -> str:
+    """Scope covering an object and its object-field list"""
+    return f"object:{object_id}"
+
+
+def user_objects_scope(user_id: Any) -> str:
+    """Scope covering the list of objects owned by a user"""
+    return f"objects_of:{user_id}"
+
+
+class CachedRows(NamedTuple):
+    """Cached query result: row snapshots plus the ETag computed when loaded"""
+    etag: str
+    snapshots: list[dict[str, Any]]
+
+
+class MetadataCache:
+    """
+    Schema metadata cache with version-stamped keys.
+
+    Every cache key embeds the current version of the scopes it depends on.
+    Mutations bump those versions, so stale entries become unreachable
+    immediately and age out of the bounded LRU on their own.
+
+    Versions come from one increasing clock and are kept for at most
+    `maxsize` scopes (least recently used forgotten first). Scopes without a
+    version of their own share the floor version, which moves past every
+    version handed out whenever a scope is forgotten - so forgetting a scope
+    invalidates it like a bump instead of resetting it to an old version.
+
+    Example:
+        key = metadata_cache.key("object_fields", object_id, scopes=[object_scope(object_id)])
+        metadata_cache.bump(object_scope(object_id))  # after a mutation
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = TTLCache("metadata", maxsize=maxsize, ttl=ttl)
+        self._versions: OrderedDict[str, int] = OrderedDict()
+        self._max_scopes = maxsize
+        self._clock = 0
+        self._floor = 0  # Version of scopes not in _versions
+
+    def version(self, scope: str) -> int:
+        """Current version of a scope (the floor until first bump)"""
+        version = self._versions.get(scope)
+        if version is None:
+            return self._floor
+        self._versions.move_to_end(scope)
+        return version
+
+    def bump(self, *scopes: str) -> None:
+        """Invalidate everything cached under the given scopes"""
+        for scope in scopes:
+            self._clock += 1
+            self._versions[scope] = self._clock
+            self._versions.move_to_end(scope)
+        while len(self._versions) > self._max_scopes:
+            self._versions.popitem(last=False)
+            # The forgotten scope now reads the floor: move it past every version in use
+            self._clock += 1
+            self._floor = self._clock
+
+    def key(self, kind: str, *parts: Hashable, scopes: list[str]) -> tuple:
+        """Build a cache key stamped with the current version of each scope"""
+        return (kind, *parts, *(self.version(scope) for scope in scopes))
+
+    def get(self, key: tuple) -> Any:
+        return self._cache.get(key)
+
+    def set(self, key: tuple, value: Any) -> None:
+        self._cache.set(key, value)
+
+    def clear(self) -> None:
+        """Drop all entries and move every scope to a new version"""
+        self._cache.clear()
+        self._versions.clear()
+        self._clock += 1
+        self._floor = self._clock
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+
+def to_snapshot(obj: Any) -> dict[str, Any]:
+    """Copy an ORM instance's column values into a plain dict"""
+    return {attr.key: getattr(obj, attr.key) for attr in inspect(obj).mapper.column_attrs}
+
+
+def from_snapshot(model: type, snapshot: dict[str, Any]) -> Any:
+    """
+    Build a fresh, transient ORM instance from a snapshot.
+
+    Each caller gets its own instance (JSONB values are deep-copied), so
+    cached data cannot be mutated through a returned object. Instances are
+    not attached to any session - use them for reads only.
+    """
+    values = {
+        key: copy.deepcopy(value) if isinstance(value, dict | list) else value
+        for key, value in snapshot.items()
+    }
+    return model(**values)
+
+
+# Singleton instance
+metadata_cache = MetadataCache(
+    maxsize=settings.METADATA_CACHE_SIZE,
+    ttl=settings.METADATA_CACHE_TTL_SECONDS,
+)
+
+# Apply invalidations published by any worker
+invalidation_bus.subscribe(METADATA_TOPIC, metadata_cache.bump)
+invalidation_bus.on_flush(metadata_cache.clear)
@@ -7,6 +7,14 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.models import ObjectField
 from app.schemas import ObjectFieldCreate, ObjectFieldUpdate
 from app.services.base import BaseService
+from app.services.metadata_cache import (
+    FIELDS_SCOPE,
+    OBJECT_FIELDS_SCOPE,
+    CachedRows,
+    metadata_cache,
+    object_scope,
+)
+from app.utils.invalidation import METADATA_TOPIC, invalidation_bus
 
 
 class ObjectFieldService(BaseService[ObjectField]):
@@ -33,12 +41,24 @@ class ObjectFieldService(BaseService[ObjectField]):
         object_id: str,
     ) -> list[ObjectField]:
         """Get all fields for a specific object"""
-        result = await db.execute(
+        cached = await self._get_fields_for_object_cached(db, object_id)
+        return self._materialize(cached)
+
+    async def get_fields_for_object_etag(self, db: AsyncSession, object_id: str) -> str:
+        """ETag of get_fields_for_object() (no query when the listing is cached)"""
+        cached = await self._get_fields_for_object_cached(db, object_id)
+        return cached.etag
+
+    async def _get_fields_for_object_cached(self, db: AsyncSession, object_id: str) -> CachedRows:
+        key = metadata_cache.key(
+            "object_fields", object_id, scopes=[object_scope(object_id), FIELDS_SCOPE]
+        )
+        query = (
             select(ObjectField)
             .where(ObjectField.object_id == object_id)
             .order_by(ObjectField.display_order)
         )
-        return list(result.scalars().all())
+        return await self._load_cached(db, key, query)
 
     async def update_object_field(
         self,
@@ -50,5 +70,13 @@ class ObjectFieldService(BaseService[ObjectField]):
         update_data = object_field_in.model_dump(exclude_unset=True)
         return await self.update(db, object_field_id, update_data)
 
+    def _cache_key(self, id: str) -> tuple:
+        return metadata_cache.key("object_field", id, scopes=[OBJECT_FIELDS_SCOPE])
+
+    async def _invalidate(self, db: AsyncSession, db_obj: ObjectField) -> None:
+        await invalidation_bus.publish(
+            db, METADATA_TOPIC, object_scope(db_obj.object_id), OBJECT_FIELDS_SCOPE
+        )
+
 # Singleton instance
 object_field_service = ObjectFieldService()
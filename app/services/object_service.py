@@ -7,6 +7,14 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.models import Object
 from app.schemas import ObjectCreate, ObjectUpdate
 from app.services.base import BaseService
+from app.services.metadata_cache import (
+    OBJECT_FIELDS_SCOPE,
+    CachedRows,
+    metadata_cache,
+    object_scope,
+    user_objects_scope,
+)
+from app.utils.invalidation import METADATA_TOPIC, invalidation_bus
 
 
 class ObjectService(BaseService[Object]):
@@ -31,10 +39,19 @@ class ObjectService(BaseService[Object]):
 
     async def get_user_objects(self, db: AsyncSession, user_id: uuid.UUID) -> list[Object]:
         """Get user's custom objects"""
-        result = await db.execute(
-            select(Object).where(Object.created_by == user_id)
+        cached = await self._get_user_objects_cached(db, user_id)
+        return self._materialize(cached)
+
+    async def get_user_objects_etag(self, db: AsyncSession, user_id: uuid.UUID) -> str:
+        """ETag of get_user_objects() (no query when the listing is cached)"""
+        cached = await self._get_user_objects_cached(db, user_id)
+        return cached.etag
+
+    async def _get_user_objects_cached(self, db: AsyncSession, user_id: uuid.UUID) -> CachedRows:
+        key = metadata_cache.key(
+            "objects_of", str(user_id), scopes=[user_objects_scope(user_id)]
         )
-        return list(result.scalars().all())
+        return await self._load_cached(db, key, select(Object).where(Object.created_by == user_id))
 
     async def get_objects(self, db: AsyncSession, user_id: uuid.UUID) -> list[Object]:
         """Alias for get_user_objects"""
@@ -50,5 +67,18 @@ class ObjectService(BaseService[Object]):
         update_data = object_in.model_dump(exclude_unset=True)
         return await self.update(db, object_id, update_data)
 
+    def _cache_key(self, id: str) -> tuple:
+        return metadata_cache.key("object", id, scopes=[object_scope(id)])
+
+    async def _invalidate(self, db: AsyncSession, db_obj: Object) -> None:
+        # Deleting an object cascades to its object_fields rows
+        await invalidation_bus.publish(
+            db,
+            METADATA_TOPIC,
+            object_scope(db_obj.id),
+            user_objects_scope(db_obj.created_by),
+            OBJECT_FIELDS_SCOPE,
+        )
+
 # Singleton instance
 object_service = ObjectService()
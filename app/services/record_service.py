@@ -1,13 +1,18 @@
 """Record Service - Record CRUD with JSONB handling"""
 import uuid
+from collections.abc import AsyncIterator, Sequence
 from typing import Any
 
-from sqlalchemy import func, select
+from fastapi import HTTPException, status
+from sqlalchemy import Row, func, lambda_stmt, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import Record
-from app.schemas import RecordCreate, RecordUpdate
+from app.schemas import RecordBulkCreate, RecordCreate, RecordUpdate
 from app.services.base import BaseService
+from app.services.record_validator import RecordValidationError, get_record_validator
+from app.utils.invalidation import RECORDS_TOPIC, invalidation_bus
+from app.utils.serialization import RECORD_COLUMNS
 
 
 class RecordService(BaseService[Record]):
@@ -30,20 +35,47 @@ class RecordService(BaseService[Record]):
             "fld_name": "John Doe",
             "fld_email": "john@example.com"
         }
+
+        Raises:
+            HTTPException 422: If data fails the object's field validation
         """
-        # Generate primary_value from first text field
-        primary_value = self._extract_primary_value(record_in.data)
+        validator = await get_record_validator(db, record_in.object_id)
+        try:
+            data = validator.validate(record_in.data)
+        except RecordValidationError as exc:
+            raise self._validation_error(exc) from None
 
-        record_data = {
-            "id": f"rec_{uuid.uuid4().hex[:8]}",
-            "object_id": record_in.object_id,
-            "data": record_in.data,
-            "primary_value": primary_value,
-            "created_by": user_id,
-            "updated_by": user_id,
-            "tenant_id": str(user_id),  # Multi-tenancy (String column)
-        }
-        return await self.create(db, record_data)
+        return await self.create(db, self._new_record_data(record_in.object_id, data, user_id))
+
+    async def create_records_bulk(
+        self,
+        db: AsyncSession,
+        bulk_in: RecordBulkCreate,
+        user_id: uuid.UUID,
+    ) -> list[Record]:
+        """
+        Create many records for one object in a single transaction.
+
+        All records are validated in one batch before anything is written.
+
+        Raises:
+            HTTPException 422: With errors for every invalid record
+        """
+        validator = await get_record_validator(db, bulk_in.object_id)
+        try:
+            items = validator.validate_many(bulk_in.records)
+        except RecordValidationError as exc:
+            raise self._validation_error(exc) from None
+
+        records = [
+            Record(**self._new_record_data(bulk_in.object_id, data, user_id))
+            for data in items
+        ]
+        db.add_all(records)
+        if records:
+            await self._invalidate(db, records[0])
+        await db.flush()
+        return records
 
     async def get_records_by_object(
         self,
@@ -57,23 +89,76 @@ class RecordService(BaseService[Record]):
         Returns: (records, total_count)
         """
         # Get total count
-        count_result = await db.execute(
-            select(func.count()).select_from(Record).where(Record.object_id == object_id)
-        )
-        total = count_result.scalar_one()
+        total = await self.count_records_by_object(db, object_id)
 
-        # Get records
-        result = await db.execute(
-            select(Record)
+        # Get records (lambda statements skip rebuilding the construct per call)
+        result = await db.execute(lambda_stmt(
+            lambda: select(Record)
             .where(Record.object_id == object_id)
             .offset(skip)
             .limit(limit)
             .order_by(Record.created_at.desc())
-        )
+        ))
         records = list(result.scalars().all())
 
         return records, total
 
+    async def get_record_rows_by_object(
+        self,
+        db: AsyncSession,
+        object_id: str,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> tuple[list[Row], int]:
+        """
+        Like get_records_by_object, but returns RECORD_COLUMNS tuples instead
+        of ORM instances (for the serialization fast path).
+        Returns: (rows, total_count)
+        """
+        total = await self.count_records_by_object(db, object_id)
+        result = await db.execute(lambda_stmt(
+            lambda: select(*RECORD_COLUMNS)
+            .where(Record.object_id == object_id)
+            .offset(skip)
+            .limit(limit)
+            .order_by(Record.created_at.desc())
+        ))
+        return list(result.all()), total
+
+    async def stream_record_rows_by_object(
+        self,
+        db: AsyncSession,
+        object_id: str,
+        skip: int = 0,
+        limit: int = 100,
+        batch_size: int = 500,
+    ) -> AsyncIterator[Sequence[Row]]:
+        """
+        Stream a page of RECORD_COLUMNS tuples from a server-side cursor.
+
+        Yields batches of up to batch_size rows; the session must stay open
+        until the iterator is exhausted.
+        """
+        result = await db.stream(
+            lambda_stmt(
+                lambda: select(*RECORD_COLUMNS)
+                .where(Record.object_id == object_id)
+                .offset(skip)
+                .limit(limit)
+                .order_by(Record.created_at.desc())
+            ),
+            execution_options={"yield_per": batch_size},
+        )
+        async for batch in result.partitions():
+            yield batch
+
+    async def count_records_by_object(self, db: AsyncSession, object_id: str) -> int:
+        """Count an object's records"""
+        result = await db.execute(lambda_stmt(
+            lambda: select(func.count()).select_from(Record).where(Record.object_id == object_id)
+        ))
+        return result.scalar_one()
+
     async def get_records(self, db: AsyncSession, object_id: str) -> list[Record]:
         """Alias for get_records_by_object (returns only records list)"""
         records, _ = await self.get_records_by_object(db, object_id)
@@ -91,20 +176,25 @@ class RecordService(BaseService[Record]):
 
         IMPORTANT: Merges data, doesn't replace!
         """
-        record = await self.get_by_id(db, record_id)
+        record = await self._fetch_by_id(db, record_id)
         if not record:
             return None
 
         # Merge data (don't replace!)
         if record_in.data:
-            record.data = {**record.data, **record_in.data}
+            validator = await get_record_validator(db, record.object_id)
+            try:
+                patch = validator.validate(record_in.data, partial=True)
+            except RecordValidationError as exc:
+                raise self._validation_error(exc) from None
+            record.data = {**record.data, **patch}
 
         # Update primary_value
         record.primary_value = self._extract_primary_value(record.data)
         record.updated_by = user_id
 
-        await db.commit()
-        await db.refresh(record)
+        await self._invalidate(db, record)
+        await db.flush()
         return record
 
     async def search_records(
@@ -127,6 +217,70 @@ class RecordService(BaseService[Record]):
         )
         return list(result.scalars().all())
 
+    async def search_record_rows(
+        self,
+        db: AsyncSession,
+        object_id: str,
+        search_term: str,
+        limit: int = 50,
+    ) -> list[Row]:
+        """Like search_records, but returns RECORD_COLUMNS tuples (serialization fast path)"""
+        result = await db.execute(self._search_rows_query(object_id, search_term, limit))
+        return list(result.all())
+
+    async def stream_search_record_rows(
+        self,
+        db: AsyncSession,
+        object_id: str,
+        search_term: str,
+        limit: int,
+        batch_size: int = 500,
+    ) -> AsyncIterator[Sequence[Row]]:
+        """Stream search results as batches of RECORD_COLUMNS tuples (see stream_record_rows_by_object)"""
+        result = await db.stream(
+            self._search_rows_query(object_id, search_term, limit),
+            execution_options={"yield_per": batch_size},
+        )
+        async for batch in result.partitions():
+            yield batch
+
+    def _search_rows_query(self, object_id: str, search_term: str, limit: int):
+        return (
+            select(*RECORD_COLUMNS)
+            .where(
+                Record.object_id == object_id,
+                Record.primary_value.ilike(f"%{search_term}%")
+            )
+            .limit(limit)
+        )
+
+    async def _invalidate(self, db: AsyncSession, db_obj: Record) -> None:
+        await invalidation_bus.publish(db, RECORDS_TOPIC, db_obj.object_id)
+
+    def _new_record_data(
+        self,
+        object_id: str,
+        data: dict[str, Any],
+        user_id: uuid.UUID,
+    ) -> dict[str, Any]:
+        """Column values for a new record"""
+        return {
+            "id": f"rec_{uuid.uuid4().hex[:8]}",
+            "object_id": object_id,
+            "data": data,
+            # Generate primary_value from first text field
+            "primary_value": self._extract_primary_value(data),
+            "created_by": user_id,
+            "updated_by": user_id,
+            "tenant_id": str(user_id),  # Multi-tenancy (String column)
+        }
+
+    def _validation_error(self, exc: RecordValidationError) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=exc.errors,
+        )
+
     def _extract_primary_value(self, data: dict[str, Any]) -> str | None:
         """
         Extract primary value from JSONB data (first text-like field).
@@ -0,0 +1,362 @@
+"""Record Validator - Compiled per-object validation and coercion of record data"""
+import math
+import re
+import sys
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from typing import Any
+from urllib.parse import urlsplit
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Field, ObjectField
+from app.services.metadata_cache import FIELDS_SCOPE, metadata_cache, object_scope
+
+EMAIL_PATTERN = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
+
+TEXT_TYPES = {"text", "textarea", "email", "phone", "url"}
+NUMBER_TYPES = {"number", "currency", "percentage"}
+# Numbers must fit a float: larger exponents cost unbounded time and memory to convert
+MAX_EXPONENT = sys.float_info.max_10_exp
+
+# A compiled check takes a raw value and returns the coerced value or raises ValueError
+Check = Callable[[Any], Any]
+
+
+class RecordValidationError(ValueError):
+    """Record data failed validation; `errors` uses FastAPI's error shape"""
+
+    def __init__(self, errors: list[dict]):
+        super().__init__(f"{len(errors)} validation error(s)")
+        self.errors = errors
+
+
+@dataclass(frozen=True)
+class FieldRule:
+    """Compiled rule for one field of an object"""
+    field_id: str
+    label: str
+    required: bool
+    check: Check
+
+
+class RecordValidator:
+    """
+    Validation and coercion function for one object's records.
+
+    Only fields attached to the object are checked; unknown keys pass through
+    unchanged so records can carry data for fields added later.
+    """
+
+    def __init__(self, rules: list[FieldRule]):
+        self.rules = rules
+        self._by_id = {rule.field_id: rule for rule in rules}
+        self._required = [rule for rule in rules if rule.required]
+
+    def validate(
+        self,
+        data: dict[str, Any],
+        partial: bool = False,
+        loc: tuple = ("body", "data"),
+    ) -> dict[str, Any]:
+        """
+        Validate and coerce record data.
+
+        Args:
+            data: Record data keyed by field ID
+            partial: Update mode - only keys present in data are checked
+            loc: Error location prefix
+
+        Returns:
+            New dict with coerced values
+
+        Raises:
+            RecordValidationError: With all errors found
+        """
+        errors: list[dict] = []
+        result = dict(data)
+
+        if not partial:
+            for rule in self._required:
+                if _is_empty(data.get(rule.field_id)):
+                    errors.append(_error(loc, rule.field_id, f"{rule.label} is required", "missing"))
+
+        for key, value in data.items():
+            rule = self._by_id.get(key)
+            if rule is None:
+                continue
+            if _is_empty(value):
+                if partial and rule.required:
+                    errors.append(_error(loc, key, f"{rule.label} is required", "missing"))
+                continue
+            try:
+                result[key] = rule.check(value)
+            except (ValueError, TypeError) as exc:
+                errors.append(_error(loc, key, f"{rule.label}: {exc}", "value_error"))
+
+        if errors:
+            raise RecordValidationError(errors)
+        return result
+
+    def validate_many(
+        self,
+        items: list[dict[str, Any]],
+        partial: bool = False,
+        loc: tuple = ("body", "records"),
+    ) -> list[dict[str, Any]]:
+        """Batch mode: validate all items, raising once with errors for every item"""
+        errors: list[dict] = []
+        results: list[dict[str, Any]] = []
+        for index, data in enumerate(items):
+            try:
+                results.append(self.validate(data, partial=partial, loc=(*loc, index)))
+            except RecordValidationError as exc:
+                errors.extend(exc.errors)
+
+        if errors:
+            raise RecordValidationError(errors)
+        return results
+
+
+def compile_validator(rows: list[tuple[ObjectField, Field]]) -> RecordValidator:
+    """Compile an object's field definitions (plus per-object overrides) into a validator"""
+    rules = []
+    for object_field, field in rows:
+        config = {**(field.config or {}), **(object_field.field_overrides or {})}
+        # Accept both flat config and the nested {"validation": {...}} form
+        validation = config.get("validation") or {}
+        config = {**config, **validation}
+        if "regex" in config and "pattern" not in config:
+            config["pattern"] = config["regex"]
+
+        rules.append(FieldRule(
+            field_id=field.id,
+            label=field.label,
+            required=bool(object_field.is_required or config.get("required")),
+            check=_compile_check(field.type, config),
+        ))
+    return RecordValidator(rules)
+
+
+async def get_record_validator(db: AsyncSession, object_id: str) -> RecordValidator:
+    """
+    Get the compiled validator for an object.
+
+    Cached in the metadata cache and keyed by the object's and the field
+    library's versions, so any schema change recompiles on next use.
+    """
+    key = metadata_cache.key(
+        "record_validator", object_id, scopes=[object_scope(object_id), FIELDS_SCOPE]
+    )
+    validator = metadata_cache.get(key)
+    if validator is None:
+        result = await db.execute(
+            select(ObjectField, Field)
+            .join(Field, ObjectField.field_id == Field.id)
+            .where(ObjectField.object_id == object_id)
+        )
+        validator = compile_validator([tuple(row) for row in result.all()])
+        metadata_cache.set(key, validator)
+    return validator
+
+
+# ============================================================================
+# Per-type check compilers
+# ============================================================================
+
+def _compile_check(field_type: str, config: dict) -> Check:
+    if field_type in TEXT_TYPES:
+        return _text_check(field_type, config)
+    if field_type in NUMBER_TYPES:
+        return _number_check(config)
+    if field_type == "boolean":
+        return _to_bool
+    if field_type == "date":
+        return _date_check(config)
+    if field_type == "datetime":
+        return _to_datetime
+    if field_type == "select":
+        return _select_check(config)
+    if field_type == "multiselect":
+        return _multiselect_check(config)
+    # file, reference and other types are stored as-is
+    return lambda value: value
+
+
+def _text_check(field_type: str, config: dict) -> Check:
+    min_length = config.get("minLength")
+    max_length = config.get("maxLength")
+    pattern_source = config.get("pattern") or (EMAIL_PATTERN if field_type == "email" else None)
+    pattern = _compile_pattern(pattern_source)
+    protocols = set(config.get("allowedProtocols") or ["http", "https"])
+    require_protocol = config.get("requireProtocol", True)
+
+    def check(value: Any) -> str:
+        if not isinstance(value, str):
+            raise TypeError("must be a string")
+        if min_length is not None and len(value) < min_length:
+            raise ValueError(f"must be at least {min_length} characters")
+        if max_length is not None and len(value) > max_length:
+            raise ValueError(f"must be at most {max_length} characters")
+        if pattern is not None and not pattern.fullmatch(value):
+            raise ValueError("has an invalid format")
+        if field_type == "url":
+            scheme = urlsplit(value).scheme
+            if (scheme or require_protocol) and scheme not in protocols:
+                raise ValueError(f"must use one of: {', '.join(sorted(protocols))}")
+        return value
+
+    return check
+
+
+def _number_check(config: dict) -> Check:
+    minimum = _parse_config_number(config.get("min"))
+    maximum = _parse_config_number(config.get("max"))
+    decimals = _parse_config_number(config.get("decimals"))
+
+    def check(value: Any) -> int | float:
+        if isinstance(value, bool):
+            raise TypeError("must be a number")
+        if isinstance(value, str):
+            try:
+                value = Decimal(value.strip())
+            except InvalidOperation:
+                raise ValueError("must be a number") from None
+        if not isinstance(value, int | float | Decimal):
+            raise TypeError("must be a number")
+        # NaN and Infinity break bound checks and cannot be stored in JSONB
+        if isinstance(value, float) and not math.isfinite(value):
+            raise ValueError("must be a number")
+        if isinstance(value, Decimal) and not value.is_finite():
+            raise ValueError("must be a number")
+        if isinstance(value, Decimal) and value and abs(value.adjusted()) > MAX_EXPONENT:
+            raise ValueError("is out of range")
+        if isinstance(value, int) and abs(value) > sys.float_info.max:
+            raise ValueError("is out of range")
+
+        if decimals is not None:
+            exponent = Decimal(str(value)).as_tuple().exponent
+            if isinstance(exponent, int) and -exponent > decimals:
+                raise ValueError(f"must have at most {decimals} decimal places")
+        if minimum is not None and value < minimum:
+            raise ValueError(f"must be >= {minimum}")
+        if maximum is not None and value > maximum:
+            raise ValueError(f"must be <= {maximum}")
+
+        if isinstance(value, Decimal):
+            return int(value) if value == value.to_integral_value() else float(value)
+        return value
+
+    return check
+
+
+def _to_bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    if value in (0, 1):
+        return bool(value)
+    if isinstance(value, str) and value.strip().lower() in ("true", "false", "yes", "no"):
+        return value.strip().lower() in ("true", "yes")
+    raise ValueError("must be true or false")
+
+
+def _date_check(config: dict) -> Check:
+    min_date = _parse_config_date(config.get("minDate"))
+    max_date = _parse_config_date(config.get("maxDate"))
+
+    def check(value: Any) -> str:
+        if not isinstance(value, str):
+            raise TypeError("must be an ISO date (YYYY-MM-DD)")
+        parsed = date.fromisoformat(value)
+        if min_date is not None and parsed < min_date:
+            raise ValueError(f"must be on or after {min_date.isoformat()}")
+        if max_date is not None and parsed > max_date:
+            raise ValueError(f"must be on or before {max_date.isoformat()}")
+        return parsed.isoformat()
+
+    return check
+
+
+def _to_datetime(value: Any) -> str:
+    if not isinstance(value, str):
+        raise TypeError("must be an ISO datetime")
+    return datetime.fromisoformat(value).isoformat()
+
+
+def _option_values(config: dict) -> frozenset:
+    return frozenset(
+        option["value"] if isinstance(option, dict) else option
+        for option in config.get("options") or []
+    )
+
+
+def _select_check(config: dict) -> Check:
+    options = _option_values(config)
+    allow_custom = config.get("allowCustom", False)
+
+    def check(value: Any) -> Any:
+        if options and not allow_custom and value not in options:
+            raise ValueError("is not a valid option")
+        return value
+
+    return check
+
+
+def _multiselect_check(config: dict) -> Check:
+    select_one = _select_check(config)
+    min_selections = config.get("minSelections")
+    max_selections = config.get("maxSelections")
+
+    def check(value: Any) -> list:
+        if not isinstance(value, list):
+            raise TypeError("must be a list")
+        if min_selections is not None and len(value) < min_selections:
+            raise ValueError(f"must have at least {min_selections} selections")
+        if max_selections is not None and len(value) > max_selections:
+            raise ValueError(f"must have at most {max_selections} selections")
+        return [select_one(item) for item in value]
+
+    return check
+
+
+def _compile_pattern(source: str | None) -> re.Pattern | None:
+    """Compile a configured pattern once; invalid patterns are ignored rather than blocking writes"""
+    if not source:
+        return None
+    try:
+        return re.compile(source)
+    except re.error:
+        return None
+
+
+def _parse_config_number(value: Any) -> int | float | None:
+    """Numeric config value (strings allowed); invalid values are ignored like bad patterns"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int | float):
+        return value if math.isfinite(value) else None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    if not math.isfinite(number):
+        return None
+    return int(number) if number.is_integer() else number
+
+
+def _parse_config_date(value: Any) -> date | None:
+    try:
+        return date.fromisoformat(value) if value else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == "" or value == []
+
+
+def _error(loc: tuple, field_id: str, msg: str, error_type: str) -> dict:
+    return {"loc": [*loc, field_id], "msg": msg, "type": error_type}
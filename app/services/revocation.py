@@ -0,0 +1,120 @@
+"""Revoked Tokens - Per-worker in-memory mirror of unexpired token_blacklist rows"""
+import asyncio
+import logging
+import time
+from datetime import UTC, datetime
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import AsyncSessionLocal
+from app.models import TokenBlacklist
+from app.utils.invalidation import REVOKED_TOPIC, InvalidationBus, invalidation_bus
+from app.utils.security import forget_token
+
+logger = logging.getLogger(__name__)
+
+PRUNE_INTERVAL_SECONDS = 60
+
+
+class RevokedTokenSet:
+    """
+    Exact set of revoked, not-yet-expired JWT IDs.
+
+    Loaded from token_blacklist each time the invalidation listener connects
+    and kept in sync through the bus, so revocation checks never touch the
+    database. Revocations are permanent until expiry, so merging sources is
+    always safe: an entry only leaves the set once its token has expired.
+
+    The set is only complete while the listener is up, so `loaded` is only set
+    while the bus is listening and is cleared on every disconnect. While not
+    loaded (startup, bus disabled, or a listener gap), callers must fall back
+    to the database.
+    """
+
+    def __init__(self, bus: InvalidationBus | None = None):
+        self._bus = bus or invalidation_bus
+        self._expiry: dict[str, float] = {}  # jti -> expires_at (unix timestamp)
+        self._next_prune = 0.0
+        self._reload_task: asyncio.Task | None = None
+        self._generation = 0
+        self.loaded = False
+
+    async def load(self, db: AsyncSession) -> None:
+        """Load all unexpired revocations from the database"""
+        generation = self._generation
+        result = await db.execute(
+            select(TokenBlacklist.jti, TokenBlacklist.expires_at)
+            .where(TokenBlacklist.expires_at > datetime.now(UTC))
+        )
+        # Merge: revocations received while the query ran must not be lost
+        self._expiry.update({jti: expires_at.timestamp() for jti, expires_at in result.all()})
+        # A listener gap during the query may have dropped revocations
+        self.loaded = self._bus.listening and generation == self._generation
+
+    async def reload(self) -> None:
+        """Reload using a dedicated session until loaded or the listener goes away"""
+        try:
+            while self._bus.listening and not self.loaded:
+                async with AsyncSessionLocal() as db:
+                    await self.load(db)
+        except Exception:
+            logger.exception("Failed to load revoked tokens; falling back to database checks")
+
+    def add(self, jti: str, expires_at: float) -> None:
+        """Record a revocation (expires_at is a unix timestamp)"""
+        self._expiry[jti] = expires_at
+
+    def contains(self, jti: str) -> bool:
+        """True if the token is revoked and not yet expired"""
+        now = time.time()
+        if now >= self._next_prune:
+            self.prune(now)
+        expires_at = self._expiry.get(jti)
+        return expires_at is not None and expires_at > now
+
+    def prune(self, now: float | None = None) -> None:
+        """Drop entries whose tokens have expired"""
+        now = time.time() if now is None else now
+        self._expiry = {jti: exp for jti, exp in self._expiry.items() if exp > now}
+        self._next_prune = now + PRUNE_INTERVAL_SECONDS
+
+    def invalidate(self) -> None:
+        """Listener gap: distrust the set until it has been reloaded while listening"""
+        self.loaded = False
+        self._generation += 1
+        if not self._bus.listening:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._reload_task is None or self._reload_task.done():
+            self._reload_task = loop.create_task(self.reload())
+
+    def stats(self) -> dict:
+        return {"loaded": self.loaded, "size": len(self._expiry)}
+
+    def _on_revoked(self, key: str) -> None:
+        """Bus handler - key is "<jti>:<expires_at timestamp>" """
+        jti, _, expires_at = key.rpartition(":")
+        try:
+            self.add(jti, float(expires_at))
+        except ValueError:
+            logger.warning("Ignoring malformed revocation key: %r", key)
+            return
+        forget_token(jti)
+
+
+def revocation_key(jti: str, expires_at: datetime) -> str:
+    """Bus key for a revoked token"""
+    return f"{jti}:{expires_at.timestamp()}"
+
+
+# Singleton instance
+revoked_tokens = RevokedTokenSet()
+
+# Stay in sync with blacklist writes in every worker
+invalidation_bus.subscribe(REVOKED_TOPIC, revoked_tokens._on_revoked)
+invalidation_bus.on_flush(revoked_tokens.invalidate)
+invalidation_bus.on_disconnect(revoked_tokens.invalidate)
@@ -0,0 +1,131 @@
+"""Token Blacklist Reaper - Background purge of expired token_blacklist rows"""
+import asyncio
+import contextlib
+import logging
+from datetime import UTC, datetime
+
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models import TokenBlacklist
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBlacklistReaper:
+    """
+    Periodically deletes expired blacklist entries in small batches.
+
+    Expired tokens already fail JWT verification, so their blacklist rows are
+    dead weight. Each batch is its own short transaction and uses
+    SKIP LOCKED, so several workers can run the reaper concurrently.
+    """
+
+    def __init__(self, interval_seconds: float, batch_size: int):
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self._task: asyncio.Task | None = None
+        self.total_purged = 0
+        self.last_purged = 0
+        self.last_run_at: datetime | None = None
+        self.table_rows = 0
+        self.table_bytes = 0
+        self.backlog = 0
+        self.errors = 0
+
+    async def purge_expired(self, db: AsyncSession) -> int:
+        """
+        Delete expired rows batch by batch until none are left.
+
+        Returns:
+            Number of rows deleted
+        """
+        expired = (
+            select(TokenBlacklist.jti)
+            .where(TokenBlacklist.expires_at < func.now())
+            .order_by(TokenBlacklist.expires_at)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        purged = 0
+        while True:
+            result = await db.execute(
+                delete(TokenBlacklist)
+                .where(TokenBlacklist.jti.in_(expired))
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+            purged += result.rowcount
+            if result.rowcount < self.batch_size:
+                return purged
+
+    async def collect_stats(self, db: AsyncSession) -> None:
+        """Refresh table size and purge backlog gauges"""
+        result = await db.execute(
+            select(
+                func.count(),
+                func.count().filter(TokenBlacklist.expires_at < func.now()),
+            ).select_from(TokenBlacklist)
+        )
+        self.table_rows, self.backlog = result.one()
+        self.table_bytes = (
+            await db.execute(text("SELECT pg_total_relation_size('token_blacklist')"))
+        ).scalar_one()
+
+    async def run_once(self) -> None:
+        """Purge and refresh stats using a dedicated session"""
+        async with AsyncSessionLocal() as db:
+            self.last_purged = await self.purge_expired(db)
+            self.total_purged += self.last_purged
+            await self.collect_stats(db)
+        self.last_run_at = datetime.now(UTC)
+
+    async def start(self) -> None:
+        """Start the background loop (no-op if already running)"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run_forever())
+
+    async def stop(self) -> None:
+        """Stop the background loop"""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    @property
+    def alive(self) -> bool:
+        """True while the background loop is running"""
+        return self._task is not None and not self._task.done()
+
+    def stats(self) -> dict:
+        return {
+            "table_rows": self.table_rows,
+            "table_bytes": self.table_bytes,
+            "backlog": self.backlog,
+            "last_purged": self.last_purged,
+            "total_purged": self.total_purged,
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+            "errors": self.errors,
+        }
+
+    async def _run_forever(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.errors += 1
+                logger.exception("Token blacklist purge failed")
+            await asyncio.sleep(self.interval_seconds)
+
+
+# Singleton instance
+token_blacklist_reaper = TokenBlacklistReaper(
+    interval_seconds=settings.TOKEN_BLACKLIST_PURGE_INTERVAL_SECONDS,
+    batch_size=settings.TOKEN_BLACKLIST_PURGE_BATCH_SIZE,
+)
@@ -0,0 +1,98 @@
+"""In-process caching utilities - Bounded LRU cache with TTL and hit/miss stats"""
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+# Every TTLCache registers itself here so stats and test resets can reach all of them
+_registry: list["TTLCache"] = []
+
+
+class TTLCache:
+    """
+    Bounded LRU cache with per-entry expiry.
+
+    Not thread-safe: designed for use from a single event loop per worker.
+
+    Usage:
+        cache = TTLCache("metadata", maxsize=10_000, ttl=300)
+        cache.set(("field", "fld_email"), snapshot)
+        cache.get(("field", "fld_email"))  # -> snapshot or None
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        _registry.append(self)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return cached value (and mark it recently used), or default if missing/expired"""
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        """Store value, evicting the least recently used entry when full"""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key: Hashable) -> Any:
+        """Remove and return value for key (None if missing)"""
+        entry = self._data.pop(key, None)
+        return entry[1] if entry is not None else None
+
+    def clear(self) -> None:
+        """Drop all entries (stats are kept)"""
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._data.get(key)
+        return entry is not None and entry[0] > time.monotonic()
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current size"""
+        lookups = self.hits + self.misses
+        return {
+            "name": self.name,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def all_cache_stats() -> list[dict]:
+    """Stats for every TTLCache created in this process"""
+    return [cache.stats() for cache in _registry]
+
+
+def clear_all_caches() -> None:
+    """Clear every TTLCache in this process (used by tests and full invalidation)"""
+    for cache in _registry:
+        cache.clear()
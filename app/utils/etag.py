@@ -0,0 +1,63 @@
+"""ETag helpers - Weak validators and conditional GET (304 Not Modified)"""
+import hashlib
+import json
+from collections.abc import Iterable
+from typing import Any
+
+from fastapi import Request, Response
+from sqlalchemy import inspect
+
+CACHE_CONTROL = "private, no-cache"  # Clients may store responses but must revalidate
+
+
+def _row_fingerprint(row: Any) -> str:
+    """
+    Cheap per-row version marker.
+
+    Rows with `updated_at` are identified by (id, updated_at); rows without it
+    (e.g. ObjectField) fall back to a hash of all column values.
+    """
+    updated_at = getattr(row, "updated_at", None)
+    if updated_at is not None:
+        return f"{row.id}@{updated_at.isoformat()}"
+
+    values = {attr.key: getattr(row, attr.key) for attr in inspect(row).mapper.column_attrs}
+    return json.dumps(values, sort_keys=True, default=str)
+
+
+def compute_etag(rows: Iterable[Any], *extra: Any) -> str:
+    """Weak ETag over a sequence of ORM rows plus extra discriminators (e.g. total)"""
+    digest = hashlib.blake2b(digest_size=12)
+    for part in extra:
+        digest.update(repr(part).encode())
+        digest.update(b"|")
+    for row in rows:
+        digest.update(_row_fingerprint(row).encode())
+        digest.update(b"\n")
+    return f'W/"{digest.hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check If-None-Match against etag (weak comparison, RFC 9110 13.1.2)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in header.split(",")
+    )
+
+
+def not_modified(etag: str) -> Response:
+    """Empty 304 response carrying the current validator"""
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+
+def set_etag(response: Response, etag: str) -> None:
+    """Attach validator headers to a 200 response"""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
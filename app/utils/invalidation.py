@@ -0,0 +1,214 @@
+"""Cross-worker cache invalidation via PostgreSQL LISTEN/NOTIFY"""
+import asyncio
+import contextlib
+import json
+import logging
+from collections import defaultdict
+from collections.abc import Callable, Iterable
+
+import asyncpg
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, SessionTransaction
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Topics
+METADATA_TOPIC = "metadata"  # keys: metadata cache scopes
+RECORDS_TOPIC = "records"    # keys: object IDs whose records changed
+REVOKED_TOPIC = "revoked"    # keys: revoked token JTIs
+API_KEYS_TOPIC = "api_keys"  # keys: prefixes of revoked API keys
+USERS_TOPIC = "users"        # keys: IDs of users whose profile changed
+READ_PINS_TOPIC = "read_pins"  # keys: clients to pin to the primary (read-your-writes)
+
+_NOTIFY = text("SELECT pg_notify(:channel, :payload)")
+
+# session.info key: [(bus, topic, keys)] published in the session's open transaction
+_PENDING = "pending_invalidations"
+
+
+class InvalidationBus:
+    """
+    Publishes cache invalidations with NOTIFY and applies them in every worker.
+
+    - `publish()` runs `pg_notify` inside the caller's transaction, so other
+      workers only hear about committed changes. The publishing worker
+      applies the invalidation itself right after the commit (also with the
+      bus disabled); a rollback drops it. Applying it earlier would let a
+      concurrent reader re-cache pre-commit data under the new version.
+    - Each worker runs one background LISTEN connection. Messages are applied
+      in every worker including the publisher.
+    - Whenever the listener (re)connects, notifications may have been missed,
+      so all flush handlers run (full cache flush).
+    - `listening` is True only while the LISTEN connection is up; disconnect
+      handlers run whenever it goes down. State that is only correct while
+      every notification is received must not be trusted otherwise.
+
+    Usage:
+        invalidation_bus.subscribe(METADATA_TOPIC, metadata_cache.bump)
+        invalidation_bus.on_flush(metadata_cache.clear)
+        await invalidation_bus.publish(db, METADATA_TOPIC, "object:obj_contact")
+    """
+
+    def __init__(self, dsn: str, channel: str, enabled: bool = True):
+        self.dsn = dsn
+        self.channel = channel
+        self.enabled = enabled
+        self._handlers: dict[str, list[Callable[[str], None]]] = defaultdict(list)
+        self._flush_handlers: list[Callable[[], None]] = []
+        self._disconnect_handlers: list[Callable[[], None]] = []
+        self._task: asyncio.Task | None = None
+        self.published = 0
+        self.received = 0
+        self.reconnects = 0
+        self.flushes = 0
+        self.listening = False
+
+    def subscribe(self, topic: str, handler: Callable[[str], None]) -> None:
+        """Call handler(key) for every invalidated key of a topic"""
+        self._handlers[topic].append(handler)
+
+    def on_flush(self, handler: Callable[[], None]) -> None:
+        """Call handler() when all cached state must be dropped"""
+        self._flush_handlers.append(handler)
+
+    def on_disconnect(self, handler: Callable[[], None]) -> None:
+        """Call handler() when the listener stops receiving notifications"""
+        self._disconnect_handlers.append(handler)
+
+    def apply(self, topic: str, keys: Iterable[str]) -> None:
+        """Apply an invalidation in this worker"""
+        for key in keys:
+            for handler in self._handlers.get(topic, ()):
+                handler(key)
+
+    def flush(self) -> None:
+        """Drop all cached state in this worker"""
+        self.flushes += 1
+        for handler in self._flush_handlers:
+            handler()
+
+    async def publish(self, db: AsyncSession | None, topic: str, *keys: str) -> None:
+        """
+        Invalidate keys in all workers once db commits.
+
+        Without a session (nothing to commit) keys are invalidated locally
+        right away.
+        """
+        if db is None:
+            self.apply(topic, keys)
+            return
+        db.info.setdefault(_PENDING, []).append((self, topic, keys))
+        if not self.enabled:
+            return
+
+        payload = json.dumps({"t": topic, "k": list(keys)}, separators=(",", ":"))
+        await db.execute(_NOTIFY, {"channel": self.channel, "payload": payload})
+        self.published += 1
+
+    async def start(self) -> None:
+        """Start the background listener (no-op when disabled or already running)"""
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._listen_forever())
+
+    async def stop(self) -> None:
+        """Stop the background listener"""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "listening": self.listening,
+            "published": self.published,
+            "received": self.received,
+            "reconnects": self.reconnects,
+            "flushes": self.flushes,
+        }
+
+    async def _listen_forever(self) -> None:
+        """Keep a LISTEN connection open, reconnecting with backoff"""
+        delay = 1.0
+        while True:
+            try:
+                await self._listen_once()
+                delay = 1.0
+            except asyncio.CancelledError:
+                raise
+            except (OSError, asyncio.TimeoutError, asyncpg.PostgresError, asyncpg.InterfaceError) as exc:
+                logger.warning("Invalidation listener disconnected: %s (retry in %.0fs)", exc, delay)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, settings.CACHE_INVALIDATION_MAX_BACKOFF_SECONDS)
+            except Exception:
+                # Never let the listener die: every worker cache would silently go stale
+                logger.exception("Invalidation listener failed (retry in %.0fs)", delay)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, settings.CACHE_INVALIDATION_MAX_BACKOFF_SECONDS)
+            self.reconnects += 1
+
+    async def _listen_once(self) -> None:
+        """Listen on one connection until it is lost"""
+        conn = await asyncpg.connect(self.dsn)
+        lost = asyncio.Event()
+        conn.add_termination_listener(lambda _conn: lost.set())
+        try:
+            await conn.add_listener(self.channel, self._on_notification)
+            self.listening = True
+            # Anything published while we were not listening was missed
+            self.flush()
+
+            while not lost.is_set():
+                try:
+                    await asyncio.wait_for(
+                        lost.wait(), timeout=settings.CACHE_INVALIDATION_KEEPALIVE_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    # Detect half-open connections that never report termination
+                    await asyncio.wait_for(conn.fetchval("SELECT 1"), timeout=5)
+        finally:
+            if self.listening:
+                self.listening = False
+                for handler in self._disconnect_handlers:
+                    handler()
+            with contextlib.suppress(Exception):
+                await conn.close(timeout=5)
+
+    def _on_notification(self, _conn: object, _pid: int, _channel: str, payload: str) -> None:
+        self.received += 1
+        try:
+            message = json.loads(payload)
+            self.apply(message["t"], message["k"])
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Ignoring malformed invalidation payload: %r", payload)
+
+
+@event.listens_for(Session, "after_commit")
+def apply_pending(session: Session) -> None:
+    """Apply invalidations published in the session's committed transaction"""
+    for bus, topic, keys in session.info.pop(_PENDING, ()):
+        bus.apply(topic, keys)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _drop_pending(session: Session, transaction: SessionTransaction) -> None:
+    # Still pending when the outermost transaction ends: it was rolled back
+    if transaction.parent is None:
+        session.info.pop(_PENDING, None)
+
+
+def _listener_dsn(database_url: str) -> str:
+    """Convert the SQLAlchemy URL (postgresql+asyncpg://) to a plain asyncpg DSN"""
+    return make_url(database_url).set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+# Singleton instance
+invalidation_bus = InvalidationBus(
+    dsn=_listener_dsn(settings.DATABASE_URL),
+    channel=settings.CACHE_INVALIDATION_CHANNEL,
+    enabled=settings.CACHE_INVALIDATION_ENABLED,
+)
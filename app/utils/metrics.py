@@ -0,0 +1,214 @@
+"""
+Runtime metrics - Route latency, DB time and pool usage in Prometheus text format
+
+Collection is lock-free: counters are plain ints and dicts updated from the
+worker's event loop (and SQLAlchemy's greenlets, which run on the same
+thread), so recording a request never awaits or blocks. Each worker keeps its
+own series; scrape workers individually (or run one worker per container).
+"""
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+POOL_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class Histogram:
+    """Fixed-bucket histogram (cumulative counts are computed when rendered)"""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+@dataclass(slots=True)
+class RequestStats:
+    """Database work done on behalf of the current request"""
+    statements: int = 0
+    db_seconds: float = 0.0
+    shapes: dict[str, int] = field(default_factory=dict)  # SQL text -> executions
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Statement shapes executed more than `threshold` times (N+1 suspects)"""
+        return [(sql, count) for sql, count in self.shapes.items() if count > threshold]
+
+
+# Set by MetricsMiddleware for the duration of each HTTP request
+current_request: ContextVar[RequestStats | None] = ContextVar("current_request", default=None)
+
+
+class Metrics:
+    """Per-worker metric registry"""
+
+    def __init__(self):
+        self.requests: defaultdict[tuple[str, str, int], int] = defaultdict(int)
+        self.errors: defaultdict[tuple[str, str], int] = defaultdict(int)
+        self.latency: dict[tuple[str, str], Histogram] = {}
+        self.db_seconds: dict[tuple[str, str], Histogram] = {}
+        self.db_statements: dict[tuple[str, str], Histogram] = {}
+        self.pool_wait: dict[str, Histogram] = {}
+        self.engines: dict[str, AsyncEngine] = {}
+
+    def observe_request(
+        self,
+        method: str,
+        route: str,
+        status: int,
+        seconds: float,
+        stats: RequestStats,
+    ) -> None:
+        """Record a finished request (route is the path template, e.g. /api/records/{record_id})"""
+        key = (method, route)
+        self.requests[(method, route, status)] += 1
+        if status >= 500:
+            self.errors[key] += 1
+        _histogram(self.latency, key, LATENCY_BUCKETS).observe(seconds)
+        _histogram(self.db_seconds, key, LATENCY_BUCKETS).observe(stats.db_seconds)
+        _histogram(self.db_statements, key, STATEMENT_BUCKETS).observe(stats.statements)
+
+    def observe_pool_wait(self, pool: str, seconds: float) -> None:
+        _histogram(self.pool_wait, pool, POOL_WAIT_BUCKETS).observe(seconds)
+
+    def instrument_engine(self, engine: AsyncEngine, name: str) -> None:
+        """Time every statement on engine and report its pool under `name`"""
+        self.engines[name] = engine
+        track_statements(engine)
+
+    def reset(self) -> None:
+        """Drop all recorded series (engines stay instrumented)"""
+        for series in (
+            self.requests, self.errors, self.latency,
+            self.db_seconds, self.db_statements, self.pool_wait,
+        ):
+            series.clear()
+
+    def render(self, caches: list[dict] = ()) -> str:
+        """Prometheus text exposition (version 0.0.4)"""
+        out: list[str] = []
+
+        _header(out, "canvas_http_requests_total", "counter", "HTTP requests by route and status")
+        for (method, route, status), value in sorted(self.requests.items()):
+            out.append(f"canvas_http_requests_total{_labels(method=method, route=route, status=status)} {value}")
+
+        _header(out, "canvas_http_errors_total", "counter", "HTTP 5xx responses and unhandled errors")
+        for (method, route), value in sorted(self.errors.items()):
+            out.append(f"canvas_http_errors_total{_labels(method=method, route=route)} {value}")
+
+        for name, help_text, series in (
+            ("canvas_http_request_duration_seconds", "Request latency", self.latency),
+            ("canvas_db_duration_seconds", "Time spent in SQL statements per request", self.db_seconds),
+            ("canvas_db_statements_per_request", "SQL statements executed per request", self.db_statements),
+        ):
+            _header(out, name, "histogram", help_text)
+            for (method, route), histogram in sorted(series.items()):
+                _render_histogram(out, name, histogram, method=method, route=route)
+
+        _header(out, "canvas_db_pool_wait_seconds", "histogram", "Time to check out a pooled connection")
+        for pool, histogram in sorted(self.pool_wait.items()):
+            _render_histogram(out, "canvas_db_pool_wait_seconds", histogram, pool=pool)
+
+        for name, help_text, read in (
+            ("canvas_db_pool_size", "Configured pool size", lambda p: p.size()),
+            ("canvas_db_pool_checked_out", "Connections in use", lambda p: p.checkedout()),
+            ("canvas_db_pool_overflow", "Connections above pool size", lambda p: p.overflow()),
+        ):
+            _header(out, name, "gauge", help_text)
+            for pool, engine in sorted(self.engines.items()):
+                out.append(f"{name}{_labels(pool=pool)} {read(engine.pool)}")
+
+        for name, kind, help_text, stat in (
+            ("canvas_cache_hits_total", "counter", "In-process cache hits", "hits"),
+            ("canvas_cache_misses_total", "counter", "In-process cache misses", "misses"),
+            ("canvas_cache_evictions_total", "counter", "In-process cache LRU evictions", "evictions"),
+            ("canvas_cache_size", "gauge", "In-process cache entries", "size"),
+            ("canvas_cache_hit_ratio", "gauge", "In-process cache hit rate", "hit_rate"),
+        ):
+            _header(out, name, kind, help_text)
+            for cache in caches:
+                out.append(f"{name}{_labels(cache=cache['name'])} {cache[stat]}")
+
+        return "\n".join(out) + "\n"
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Async queue pool that records connection checkout wait time.
+
+    Reported under the engine's `pool_logging_name` (kept across dispose()).
+    """
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            metrics.observe_pool_wait(
+                self._orig_logging_name or "default", time.perf_counter() - start
+            )
+
+
+def track_statements(engine: AsyncEngine) -> None:
+    """Count and time engine's statements into the current request's RequestStats"""
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    context._metrics_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = current_request.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.db_seconds += time.perf_counter() - context._metrics_start
+        stats.shapes[statement] = stats.shapes.get(statement, 0) + 1
+
+
+def _histogram(series: dict, key, buckets: tuple[float, ...]) -> Histogram:
+    histogram = series.get(key)
+    if histogram is None:
+        histogram = series[key] = Histogram(buckets)
+    return histogram
+
+
+def _header(out: list[str], name: str, kind: str, help_text: str) -> None:
+    out.append(f"# HELP {name} {help_text}")
+    out.append(f"# TYPE {name} {kind}")
+
+
+def _labels(**labels) -> str:
+    def escape(value) -> str:
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    return "{" + ",".join(f'{key}="{escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _render_histogram(out: list[str], name: str, histogram: Histogram, **labels) -> None:
+    cumulative = 0
+    for bound, count in zip((*histogram.buckets, "+Inf"), histogram.counts):
+        cumulative += count
+        out.append(f"{name}_bucket{_labels(**labels, le=bound)} {cumulative}")
+    out.append(f"{name}_sum{_labels(**labels)} {histogram.sum}")
+    out.append(f"{name}_count{_labels(**labels)} {histogram.count}")
+
+
+# Singleton instance
+metrics = Metrics()
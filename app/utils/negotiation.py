@@ -0,0 +1,153 @@
+"""
+Content negotiation - MessagePack alongside JSON for data endpoints
+
+Routers built with `route_class=NegotiatedRoute` accept request bodies sent
+as `Content-Type: application/msgpack` and answer in MessagePack when the
+`Accept` header prefers it. JSON stays the default. MessagePack payloads
+carry the same values as the JSON ones (datetimes and UUIDs as strings);
+request bodies may only hold values JSON can express.
+"""
+import math
+from collections.abc import Callable, Coroutine
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+import msgpack
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+MSGPACK_TYPES = (MSGPACK, "application/x-msgpack")
+
+# Format the current request's response should use (set by NegotiatedRoute)
+response_format: ContextVar[str] = ContextVar("response_format", default=JSON)
+
+
+def preferred_format(accept: str | None) -> str:
+    """MSGPACK if Accept ranks a MessagePack type above JSON, else JSON"""
+    if not accept:
+        return JSON
+
+    weights: dict[str, float] = {}
+    for part in accept.lower().split(","):
+        media_type, *params = (item.strip() for item in part.split(";"))
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[media_type] = max(q, weights.get(media_type, 0.0))
+
+    msgpack_q = max(weights.get(media_type, 0.0) for media_type in MSGPACK_TYPES)
+    json_q = max(weights.get(JSON, 0.0), weights.get("application/*", 0.0), weights.get("*/*", 0.0))
+    return MSGPACK if msgpack_q > json_q else JSON
+
+
+def negotiated_etag(etag: str) -> str:
+    """Distinct validator per representation (JSON ETags are unchanged)"""
+    if response_format.get() == MSGPACK:
+        return f'{etag[:-1]}.msgpack"'
+    return etag
+
+
+def packb(content: Any) -> bytes:
+    """Encode as MessagePack (datetimes and UUIDs as their JSON strings)"""
+    return msgpack.packb(content, default=_msgpack_default, use_bin_type=True)
+
+
+class NegotiatedResponse(JSONResponse):
+    """JSONResponse that renders MessagePack when the request negotiated it"""
+
+    def render(self, content: Any) -> bytes:
+        if response_format.get() == MSGPACK:
+            self.media_type = MSGPACK
+            return packb(content)
+        return super().render(content)
+
+
+class MsgPackRequest(Request):
+    """Request whose MessagePack body is handed to FastAPI as the parsed JSON body"""
+
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            # Decode errors surface as FastAPI's 400 "error parsing the body"
+            body = msgpack.unpackb(await self.body(), raw=False, ext_hook=_reject_ext, timestamp=0)
+            _check_json_value(body)
+            self._json = body
+        return self._json
+
+
+class NegotiatedRoute(APIRoute):
+    """
+    APIRoute with MessagePack request bodies and responses.
+
+    Use with `APIRouter(route_class=NegotiatedRoute,
+    default_response_class=NegotiatedResponse)`. Responses vary on Accept.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def negotiated_handler(request: Request) -> Response:
+            token = response_format.set(preferred_format(request.headers.get("accept")))
+            try:
+                content_type = request.headers.get("content-type", "")
+                if content_type.split(";")[0].strip().lower() in MSGPACK_TYPES:
+                    request = _as_json_request(request)
+                response = await handler(request)
+            finally:
+                response_format.reset(token)
+            response.headers.add_vary_header("Accept")
+            return response
+
+        return negotiated_handler
+
+
+def _as_json_request(request: Request) -> MsgPackRequest:
+    # FastAPI only parses bodies whose content type is JSON; the decoded
+    # MessagePack is returned by MsgPackRequest.json() instead
+    headers = [
+        (name, JSON.encode() if name == b"content-type" else value)
+        for name, value in request.scope["headers"]
+    ]
+    return MsgPackRequest({**request.scope, "headers": headers}, request.receive)
+
+
+def _reject_ext(code: int, _data: bytes) -> Any:
+    raise ValueError(f"MessagePack extension type {code} is not allowed")
+
+
+def _check_json_value(value: Any) -> None:
+    """Refuse what JSON cannot carry: bin, timestamps, non-string keys, NaN/Infinity"""
+    if value is None or isinstance(value, str | bool | int):
+        return
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            raise ValueError("Non-finite numbers are not allowed")
+        return
+    if isinstance(value, list):
+        for item in value:
+            _check_json_value(item)
+        return
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if not isinstance(key, str):
+                raise ValueError("Map keys must be strings")
+            _check_json_value(item)
+        return
+    raise ValueError(f"MessagePack {type(value).__name__} values are not allowed")
+
+
+def _msgpack_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat().replace("+00:00", "Z")
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"Cannot encode {type(value).__name__} as MessagePack")
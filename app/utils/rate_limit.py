@@ -1,7 +1,241 @@
-"""Rate limiting configuration using SlowAPI"""
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+"""Rate limiting - Token buckets shared by all workers on a host"""
+import contextlib
+import fcntl
+import hashlib
+import logging
+import math
+import mmap
+import os
+import stat
+import tempfile
+import time
+import uuid
+from collections.abc import Awaitable, Callable, Iterator
+from struct import Struct
 
-# Create limiter instance
-# Uses client IP address as the key for rate limiting
-limiter = Limiter(key_func=get_remote_address)
+from fastapi import Depends, HTTPException, Request, status
+
+from app.config import settings
+from app.middleware.auth import api_key_header, get_optional_user_id
+from app.services.api_key_service import api_key_service
+
+logger = logging.getLogger(__name__)
+
+HEADER = Struct("=8sQ")  # magic, slot count
+SLOT = Struct("=Qdd")  # key digest (0 = empty), tokens, updated_at (CLOCK_MONOTONIC)
+MAGIC = b"CVRLTB01"
+WAYS = 8  # Slots per set: a key lives in one set, chosen by its digest
+
+
+class SharedTokenBuckets:
+    """
+    Fixed-size, set-associative table of token buckets in a memory-mapped file.
+
+    Every worker maps the same file (under /dev/shm by default), so limits hold
+    for the whole host rather than per process. Each key costs one 24-byte slot;
+    when a set is full the least recently touched bucket is evicted - an idle
+    bucket has refilled to capacity anyway, so evicting it loses nothing.
+
+    Sets are guarded by fcntl byte-range locks on the file. Without a path the
+    table is anonymous memory, private to the process (used in tests).
+
+    The file lives in a world-writable directory, so it is opened without
+    following symlinks and must be a regular 0600 file owned by this user;
+    otherwise OSError is raised.
+    """
+
+    def __init__(self, path: str | None, slots: int):
+        self.sets = max(1, slots // WAYS)
+        self.slots = self.sets * WAYS
+        self.size = HEADER.size + self.slots * SLOT.size
+        self.allowed = 0
+        self.limited = 0
+        self.evictions = 0
+
+        if path is None:
+            self._fd = None
+            self._buf = mmap.mmap(-1, self.size)
+            HEADER.pack_into(self._buf, 0, MAGIC, self.slots)
+            return
+
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_NOFOLLOW | os.O_CLOEXEC, 0o600)
+        try:
+            _check_private(self._fd, path)
+        except OSError:
+            os.close(self._fd)
+            raise
+        fcntl.lockf(self._fd, fcntl.LOCK_EX)
+        try:
+            # First worker to start initializes the table. Only ever grow the
+            # file: shrinking it under another worker's mapping would crash it.
+            if os.fstat(self._fd).st_size < self.size:
+                os.ftruncate(self._fd, self.size)
+            self._buf = mmap.mmap(self._fd, self.size)
+            if HEADER.unpack_from(self._buf, 0) != (MAGIC, self.slots):
+                self._buf[:] = bytes(self.size)
+                HEADER.pack_into(self._buf, 0, MAGIC, self.slots)
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN)
+
+    def acquire(self, key: str, rate: float, capacity: float, cost: float = 1.0) -> float:
+        """
+        Take `cost` tokens from the bucket for key.
+
+        Args:
+            key: Bucket key (include the limit name - one key, one bucket)
+            rate: Refill rate in tokens per second
+            capacity: Bucket size (maximum burst)
+            cost: Tokens this request consumes
+
+        Returns:
+            0 if allowed, otherwise seconds until enough tokens are available
+        """
+        digest = int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little") or 1
+        start = HEADER.size + (digest % self.sets) * WAYS * SLOT.size
+
+        with self._locked(start, WAYS * SLOT.size):
+            now = time.monotonic()  # System-wide clock, comparable across workers
+            offset, tokens, updated_at = self._find(start, digest)
+            if updated_at is None:
+                tokens = capacity
+            else:
+                tokens = min(capacity, tokens + (now - updated_at) * rate)
+
+            if tokens >= cost:
+                tokens -= cost
+                retry_after = 0.0
+            else:
+                retry_after = (cost - tokens) / rate
+            SLOT.pack_into(self._buf, offset, digest, tokens, now)
+
+        if retry_after:
+            self.limited += 1
+        else:
+            self.allowed += 1
+        return retry_after
+
+    def clear(self) -> None:
+        """Reset every bucket"""
+        with self._locked(HEADER.size, self.slots * SLOT.size):
+            self._buf[HEADER.size:] = bytes(self.size - HEADER.size)
+
+    def stats(self) -> dict:
+        return {
+            "slots": self.slots,
+            "allowed": self.allowed,
+            "limited": self.limited,
+            "evictions": self.evictions,
+        }
+
+    def _find(self, start: int, digest: int) -> tuple[int, float, float | None]:
+        """Locate the key's slot in its set: existing bucket, else empty slot, else LRU victim"""
+        empty = None
+        victim, victim_updated_at = start, math.inf
+        for offset in range(start, start + WAYS * SLOT.size, SLOT.size):
+            key, tokens, updated_at = SLOT.unpack_from(self._buf, offset)
+            if key == digest:
+                return offset, tokens, updated_at
+            if key == 0:
+                if empty is None:
+                    empty = offset
+            elif updated_at < victim_updated_at:
+                victim, victim_updated_at = offset, updated_at
+
+        if empty is not None:
+            return empty, 0.0, None
+        self.evictions += 1
+        return victim, 0.0, None
+
+    @contextlib.contextmanager
+    def _locked(self, start: int, length: int) -> Iterator[None]:
+        if self._fd is None:
+            yield
+            return
+        fcntl.lockf(self._fd, fcntl.LOCK_EX, length, start)
+        try:
+            yield
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, length, start)
+
+
+def _check_private(fd: int, path: str) -> None:
+    """Refuse a table file another user could have planted or can write to"""
+    info = os.fstat(fd)
+    if not stat.S_ISREG(info.st_mode):
+        raise OSError(f"{path} is not a regular file")
+    if info.st_uid != os.getuid():
+        raise OSError(f"{path} is owned by uid {info.st_uid}")
+    if stat.S_IMODE(info.st_mode) != 0o600:
+        raise OSError(f"{path} has mode {stat.S_IMODE(info.st_mode):o}, expected 600")
+
+
+def _default_path() -> str:
+    # Table size is part of the name so workers with different settings never share a layout
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(directory, f"canvas_rate_limit.{settings.RATE_LIMIT_SLOTS}")
+
+
+def _open_buckets() -> SharedTokenBuckets:
+    path = settings.RATE_LIMIT_SHM_PATH or _default_path()
+    try:
+        return SharedTokenBuckets(path, settings.RATE_LIMIT_SLOTS)
+    except OSError:
+        logger.exception("Cannot map %s; rate limits will be per worker", path)
+        return SharedTokenBuckets(None, settings.RATE_LIMIT_SLOTS)
+
+
+# Singleton instance
+token_buckets = _open_buckets()
+
+
+def client_ip(request: Request) -> str:
+    """Rate limit key: the client's IP address"""
+    return request.client.host if request.client else "unknown"
+
+
+def rate_limit(name: str, per_minute: int, key: Callable[[Request], str] = client_ip) -> Callable[..., Awaitable[None]]:
+    """
+    Build a dependency enforcing `per_minute` requests per key.
+
+    Usage:
+        @router.post("/login", dependencies=[Depends(rate_limit("login", 10))])
+    """
+    async def dependency(request: Request) -> None:
+        if settings.RATE_LIMIT_ENABLED:
+            _enforce(f"{name}:{key(request)}", per_minute)
+
+    return dependency
+
+
+async def data_rate_limit(
+    request: Request,
+    user_id: uuid.UUID | None = Depends(get_optional_user_id),
+    api_key: str | None = Depends(api_key_header),
+) -> None:
+    """
+    Limit data endpoints per user (anonymous calls per IP).
+
+    API key calls are limited per key once this worker has verified the key
+    (cache only, no lookup). Unverified keys count against the client IP, so
+    made-up prefixes cannot be used to get fresh buckets.
+    """
+    if not settings.RATE_LIMIT_ENABLED:
+        return
+    if user_id is None:
+        prefix = api_key_service.verified_prefix(api_key) if api_key else None
+        if prefix is not None:
+            _enforce(f"data:api_key:{prefix}", settings.RATE_LIMIT_PER_MINUTE)
+        else:
+            _enforce(f"data:ip:{client_ip(request)}", settings.RATE_LIMIT_PER_MINUTE)
+        return
+    _enforce(f"data:user:{user_id}", settings.RATE_LIMIT_PER_MINUTE)
+
+
+def _enforce(key: str, per_minute: int) -> None:
+    retry_after = token_buckets.acquire(key, rate=per_minute / 60, capacity=per_minute)
+    if retry_after:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Rate limit exceeded",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
@@ -1,8 +1,19 @@
 """Security utilities - Password hashing, JWT tokens"""
+import asyncio
+import contextlib
+import hashlib
+import hmac
+import secrets
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime, timedelta
+from typing import Any
+
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.config import settings
+from app.utils.cache import TTLCache
 
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -11,6 +22,8 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 SECRET_KEY = settings.SECRET_KEY
 ALGORITHM = settings.JWT_ALGORITHM
 ACCESS_TOKEN_EXPIRE_MINUTES = 60  # 1 hour
+REFRESH_TOKEN_EXPIRE_DAYS = settings.REFRESH_TOKEN_EXPIRE_DAYS
+API_KEY_SCHEME = "cvk"
 
 
 def hash_password(password: str) -> str:
@@ -23,6 +36,93 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+class PasswordHasherBusy(Exception):
+    """Password pool is saturated or timed out - caller should answer 503"""
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a bounded thread pool so the event loop keeps serving.
+
+    bcrypt releases the GIL while hashing, so threads give real parallelism
+    without process pool overhead. Work beyond `max_pending` (running +
+    queued) is rejected immediately instead of piling up behind a login burst.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int, timeout: float):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bcrypt")
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.busy_seconds = 0.0
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.max_workers,
+            "pending": self.pending,
+            "queue_depth": max(0, self.pending - self.max_workers),
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+            "busy_seconds": round(self.busy_seconds, 3),
+        }
+
+    async def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise PasswordHasherBusy("Too many password operations in progress")
+
+        loop = asyncio.get_running_loop()
+        self.pending += 1
+        started = time.perf_counter()
+
+        def on_done(_future: Any) -> None:
+            # Runs in the worker thread; the slot is freed when the thread finishes,
+            # even if the caller already gave up waiting
+            with contextlib.suppress(RuntimeError):  # loop already closed
+                loop.call_soon_threadsafe(self._release, time.perf_counter() - started)
+
+        future = self._executor.submit(fn, *args)
+        future.add_done_callback(on_done)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise PasswordHasherBusy("Password operation timed out") from None
+
+    def _release(self, elapsed: float) -> None:
+        self.pending -= 1
+        self.completed += 1
+        self.busy_seconds += elapsed
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    timeout=settings.PASSWORD_HASH_TIMEOUT_SECONDS,
+)
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash password on the password pool (use from async code)"""
+    return await password_hasher.hash(password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify password on the password pool (use from async code)"""
+    return await password_hasher.verify(plain_password, hashed_password)
+
+
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
     """
     Create JWT access token.
@@ -46,15 +146,102 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
     return encoded_jwt
 
 
+# Verified tokens: sha256(token) -> decoded payload, each entry expiring at the token's exp
+_verified_tokens = TTLCache(
+    "jwt", maxsize=settings.JWT_CACHE_SIZE, ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60
+)
+# jti -> token digest, so revocation can drop the cached payload
+_digests_by_jti = TTLCache(
+    "jwt_jti", maxsize=settings.JWT_CACHE_SIZE, ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60
+)
+
+
 def decode_access_token(token: str) -> dict | None:
     """
     Decode and verify JWT token.
 
+    Verified payloads are cached by token digest until the token expires, so
+    repeated requests with the same token skip signature verification.
+    The returned dict is shared - do not modify it.
+
     Returns:
         Payload dict if valid, None if invalid/expired
     """
+    digest = hashlib.sha256(token.encode()).digest()
+    payload = _verified_tokens.get(digest)
+    if payload is not None:
+        return payload
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except JWTError:
         return None
+
+    ttl = payload.get("exp", 0) - time.time()
+    if ttl > 0:
+        _verified_tokens.set(digest, payload, ttl=ttl)
+        if payload.get("jti"):
+            _digests_by_jti.set(payload["jti"], digest, ttl=ttl)
+    return payload
+
+
+def forget_token(jti: str) -> None:
+    """Drop a revoked token from the verified token cache"""
+    digest = _digests_by_jti.pop(jti)
+    if digest is not None:
+        _verified_tokens.pop(digest)
+
+
+def generate_refresh_token() -> str:
+    """Create an opaque refresh token (256 random bits, URL-safe)"""
+    return secrets.token_urlsafe(32)
+
+
+def hash_refresh_token(token: str) -> str:
+    """
+    Keyed hash of a refresh token for storage and lookup.
+
+    Refresh tokens are random, so a fast HMAC is enough - unlike passwords they
+    cannot be brute-forced, and the digest stays usable as an index key.
+    """
+    return _keyed_hash(token)
+
+
+def generate_api_key() -> tuple[str, str, str]:
+    """
+    Create an API key.
+
+    Returns:
+        (full key "cvk_<prefix>_<secret>", prefix, secret)
+    """
+    prefix = secrets.token_hex(6)
+    secret = secrets.token_urlsafe(32)
+    return f"{API_KEY_SCHEME}_{prefix}_{secret}", prefix, secret
+
+
+def split_api_key(key: str) -> tuple[str, str] | None:
+    """Split a full API key into (prefix, secret), or None if malformed"""
+    scheme, _, rest = key.partition("_")
+    prefix, _, secret = rest.partition("_")
+    if scheme != API_KEY_SCHEME or not prefix or not secret:
+        return None
+    return prefix, secret
+
+
+def hash_api_key_secret(secret: str) -> str:
+    """Keyed hash of an API key secret (random, so HMAC rather than bcrypt)"""
+    return _keyed_hash(secret)
+
+
+def verify_api_key_secret(secret: str, secret_hash: str) -> bool:
+    """Constant-time check of an API key secret against its stored hash"""
+    return hmac.compare_digest(_keyed_hash(secret), secret_hash)
+
+
+def _keyed_hash(value: str) -> str:
+    return hmac.new(SECRET_KEY.encode(), value.encode(), hashlib.sha256).hexdigest()
+
+
+def token_cache_stats() -> dict:
+    """Size and hit rate of the verified token cache (this worker)"""
+    return _verified_tokens.stats()
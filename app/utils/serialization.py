@@ -0,0 +1,161 @@
+"""
+Record serialization fast path - JSON bytes straight from row tuples
+
+`RecordListResponse` validates every record from attributes and FastAPI then
+validates and serializes the page again. Record pages instead select plain
+column tuples (no ORM instances) and encode them once with orjson; the output
+matches `RecordResponse` field for field. Large pages are streamed: each
+batch of rows from the DB cursor is encoded and sent as it arrives.
+Buffered pages are sent as MessagePack instead when the request negotiated it.
+"""
+import asyncio
+import json
+import logging
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Sequence
+from typing import Any
+
+import orjson
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from app.models import Record
+from app.utils.negotiation import MSGPACK, NegotiatedResponse, packb, response_format
+
+logger = logging.getLogger(__name__)
+
+# Same order as RecordResponse fields
+RECORD_COLUMNS = (
+    Record.object_id,
+    Record.data,
+    Record.id,
+    Record.primary_value,
+    Record.created_at,
+    Record.updated_at,
+    Record.created_by,
+    Record.updated_by,
+    Record.tenant_id,
+)
+RECORD_KEYS = tuple(column.key for column in RECORD_COLUMNS)
+
+# UTC datetimes as "...Z", like pydantic
+ORJSON_OPTIONS = orjson.OPT_UTC_Z
+
+
+def record_dicts(rows: Iterable[Sequence[Any]]) -> list[dict[str, Any]]:
+    """RecordResponse-shaped dicts from RECORD_COLUMNS rows"""
+    keys = RECORD_KEYS
+    return [dict(zip(keys, row)) for row in rows]
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Encode with orjson.
+
+    Falls back to the stdlib for values orjson rejects (integers beyond
+    64 bits can appear in JSONB data).
+    """
+    try:
+        return orjson.dumps(content, option=ORJSON_OPTIONS)
+    except orjson.JSONEncodeError:
+        return json.dumps(
+            content, default=_json_default, ensure_ascii=False, separators=(",", ":")
+        ).encode()
+
+
+def dump_records(rows: Iterable[Sequence[Any]]) -> bytes:
+    """JSON array of records"""
+    return dumps(record_dicts(rows))
+
+
+def record_page(rows: Iterable[Sequence[Any]], total: int, page: int, page_size: int) -> dict[str, Any]:
+    """RecordListResponse-shaped dict"""
+    return {
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "records": record_dicts(rows),
+    }
+
+
+def dump_record_page(rows: Iterable[Sequence[Any]], total: int, page: int, page_size: int) -> bytes:
+    """JSON object shaped like RecordListResponse"""
+    return dumps(record_page(rows, total, page, page_size))
+
+
+def record_page_envelope(total: int, page: int, page_size: int) -> tuple[bytes, bytes]:
+    """Bytes before and after the records array of a streamed RecordListResponse"""
+    head = dumps({"total": total, "page": page, "page_size": page_size})
+    return head[:-1] + b',"records":[', b"]}"
+
+
+async def stream_records(
+    batches: AsyncIterable[Sequence[Sequence[Any]]],
+    envelope: tuple[bytes, bytes] = (b"[", b"]"),
+) -> AsyncIterator[bytes]:
+    """
+    Encode batches of record rows as one JSON document, chunk by chunk.
+
+    Only one batch is held in memory at a time; the default envelope makes
+    a bare array (like dump_records), record_page_envelope a page object.
+    """
+    head, tail = envelope
+    yield head
+    separator = b""
+    async for batch in batches:
+        if batch:
+            yield separator + dump_records(batch)[1:-1]
+            separator = b","
+    yield tail
+
+
+class RecordStreamingResponse(StreamingResponse):
+    """
+    Streamed record JSON (from `stream_records`) with an overall deadline.
+
+    The body holds a pooled DB connection until it finishes, so neither a
+    slow cursor nor a client that stops reading may keep it indefinitely:
+    after `deadline` seconds the response is cancelled and the body closed.
+    On client disconnect the body is closed right away as well.
+    """
+
+    media_type = "application/json"
+
+    def __init__(self, content: AsyncIterator[bytes], deadline: float):
+        super().__init__(content)
+        self.deadline = deadline
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            async with asyncio.timeout(self.deadline):
+                await super().__call__(scope, receive, send)
+        except TimeoutError:
+            logger.warning("Record stream cancelled after %ss deadline", self.deadline)
+        finally:
+            # Cancellation leaves the generator suspended; close it now to release its session
+            await self.body_iterator.aclose()
+
+
+class RecordJSONResponse(NegotiatedResponse):
+    """
+    JSON response for record payloads.
+
+    Use as `response_class` and return it with `record_dicts` / `record_page`
+    content (or bytes from `dump_records` / `dump_record_page`): FastAPI then
+    skips response_model validation and serialization (the response_model
+    still documents the schema). Content is encoded with orjson, or as
+    MessagePack when negotiated; bytes are sent as-is.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        if response_format.get() == MSGPACK:
+            self.media_type = MSGPACK
+            return packb(content)
+        return dumps(content)
+
+
+def _json_default(value: Any) -> str:
+    if hasattr(value, "isoformat"):
+        return value.isoformat().replace("+00:00", "Z")
+    return str(value)
@@ -0,0 +1,131 @@
+"""
+Microbenchmark - per-call CPU of building hot-path SQL statements
+
+Compares, for each hot query, what a request pays before the statement
+reaches the driver:
+
+- compile:  build the select() and compile it (no compiled cache at all)
+- select:   build the select() and compute its cache key (SQLAlchemy's
+            compiled cache hit path for ad-hoc constructs)
+- lambda:   lambda_stmt() as used by the services (construct and cache key
+            are derived once per code location)
+
+No database is needed. Usage:
+
+    python -m benchmarks.compiled_sql [--number 20000] [--json]
+"""
+import argparse
+import json
+import timeit
+
+from sqlalchemy import func, lambda_stmt, select
+from sqlalchemy.dialects import postgresql
+
+from app.models import Field, Record, TokenBlacklist
+
+DIALECT = postgresql.asyncpg.dialect()
+
+
+def get_by_id_select(model, id):
+    return select(model).where(model.id == id)
+
+
+def get_by_id_lambda(model, id):
+    return lambda_stmt(lambda: select(model).where(model.id == id))
+
+
+def records_page_select(object_id, skip, limit):
+    return (
+        select(Record)
+        .where(Record.object_id == object_id)
+        .offset(skip)
+        .limit(limit)
+        .order_by(Record.created_at.desc())
+    )
+
+
+def records_page_lambda(object_id, skip, limit):
+    return lambda_stmt(
+        lambda: select(Record)
+        .where(Record.object_id == object_id)
+        .offset(skip)
+        .limit(limit)
+        .order_by(Record.created_at.desc())
+    )
+
+
+def records_count_select(object_id):
+    return select(func.count()).select_from(Record).where(Record.object_id == object_id)
+
+
+def records_count_lambda(object_id):
+    return lambda_stmt(
+        lambda: select(func.count()).select_from(Record).where(Record.object_id == object_id)
+    )
+
+
+def blacklisted_select(jti):
+    return select(TokenBlacklist.jti).where(TokenBlacklist.jti == jti)
+
+
+def blacklisted_lambda(jti):
+    return lambda_stmt(lambda: select(TokenBlacklist.jti).where(TokenBlacklist.jti == jti))
+
+
+QUERIES = {
+    "get_by_id": (get_by_id_select, get_by_id_lambda, (Field, "fld_abcd1234")),
+    "records_page": (records_page_select, records_page_lambda, ("obj_abcd1234", 0, 100)),
+    "records_count": (records_count_select, records_count_lambda, ("obj_abcd1234",)),
+    "is_token_blacklisted": (blacklisted_select, blacklisted_lambda, ("jti-0000",)),
+}
+
+
+def _per_call_us(fn, number: int) -> float:
+    fn()  # warm up (first lambda call analyzes the closure)
+    best = min(timeit.repeat(fn, number=number, repeat=5))
+    return best / number * 1e6
+
+
+def run(number: int) -> dict:
+    results = {}
+    for name, (build_select, build_lambda, args) in QUERIES.items():
+        # Bind this iteration's builders (late-binding closures would see the last query's)
+        compile_us = _per_call_us(
+            lambda build=build_select, args=args: build(*args).compile(dialect=DIALECT), number // 10
+        )
+        select_us = _per_call_us(
+            lambda build=build_select, args=args: build(*args)._generate_cache_key(), number
+        )
+        lambda_us = _per_call_us(
+            lambda build=build_lambda, args=args: build(*args)._generate_cache_key(), number
+        )
+        results[name] = {
+            "compile_us": round(compile_us, 2),
+            "select_us": round(select_us, 2),
+            "lambda_us": round(lambda_us, 2),
+            "saved_us": round(select_us - lambda_us, 2),
+        }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=20_000, help="calls per timing run")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    results = run(args.number)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'query':<22}{'compile':>10}{'select':>10}{'lambda':>10}{'saved':>10}  (µs/call)")
+    for name, r in results.items():
+        print(
+            f"{name:<22}{r['compile_us']:>10}{r['select_us']:>10}"
+            f"{r['lambda_us']:>10}{r['saved_us']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Synthetic record values - deterministic, skewed, valid for their Field.type
+
+Shared by the load harness (seeding and write payloads) and the tenant
+generator. All randomness comes from the `random.Random` passed in, so the
+same seed yields the same values. Categorical choices follow a Zipf-like
+distribution: a few values are very common and most are rare, like real
+CRM data (and unlike uniform test data, which hides skewed-index plans).
+"""
+import random
+import unicodedata
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from itertools import accumulate
+from typing import Any
+
+FIRST_NAMES = (
+    "Ali", "Ayşe", "Mehmet", "Fatma", "Ahmet", "Zeynep", "Mustafa", "Elif", "Emre", "Merve",
+    "John", "Mary", "James", "Linda", "Robert", "Sofia", "Lucas", "Emma", "Noah", "Olivia",
+    "Hiroshi", "Yuki", "Wei", "Mei", "Ivan", "Olga", "Pierre", "Chloé", "Diego", "Lucía",
+)
+LAST_NAMES = (
+    "Yılmaz", "Kaya", "Demir", "Şahin", "Çelik", "Yıldız", "Öztürk", "Aydın", "Arslan", "Doğan",
+    "Smith", "Johnson", "Brown", "Garcia", "Miller", "Davis", "Martin", "Müller", "Rossi", "Silva",
+    "Tanaka", "Suzuki", "Wang", "Li", "Ivanov", "Dubois", "Moreau", "López", "Novak", "Kowalski",
+)
+WORDS = (
+    "acme", "global", "north", "prime", "blue", "delta", "nova", "summit", "vertex", "atlas",
+    "harbor", "pioneer", "quantum", "silver", "zenith", "orbit", "cedar", "falcon", "lumen", "apex",
+    "river", "stone", "bright", "core", "metro", "union", "alpha", "omega", "coastal", "urban",
+)
+DOMAINS = ("example.com", "example.org", "mail.example", "corp.example", "example.net")
+
+# All field types the record validator knows (see app.services.record_validator)
+FIELD_TYPES = (
+    "text", "textarea", "email", "phone", "url",
+    "number", "currency", "percentage",
+    "boolean", "date", "datetime", "select", "multiselect",
+)
+
+EPOCH = datetime(2020, 1, 1, tzinfo=timezone.utc)
+SPAN_SECONDS = 5 * 365 * 24 * 3600
+
+
+@lru_cache(maxsize=256)
+def _zipf_cum_weights(n: int, s: float) -> tuple[float, ...]:
+    return tuple(accumulate(1 / (rank ** s) for rank in range(1, n + 1)))
+
+
+def skewed_choice(rng: random.Random, population: tuple | list, s: float = 1.1) -> Any:
+    """Zipf-distributed choice: earlier items are picked far more often"""
+    return rng.choices(population, cum_weights=_zipf_cum_weights(len(population), s))[0]
+
+
+def skewed_index(rng: random.Random, n: int, s: float = 1.1) -> int:
+    """Zipf-distributed index in range(n)"""
+    return skewed_choice(rng, range(n), s)
+
+
+def person_name(rng: random.Random) -> str:
+    return f"{skewed_choice(rng, FIRST_NAMES)} {skewed_choice(rng, LAST_NAMES)}"
+
+
+def select_options(rng: random.Random, count: int) -> list[dict[str, str]]:
+    """Field config options ({"value", "label"}) for select and multiselect fields"""
+    words = rng.sample(WORDS, k=min(count, len(WORDS)))
+    return [{"value": word, "label": word.title()} for word in words]
+
+
+def field_config(rng: random.Random, field_type: str) -> dict:
+    """A plausible Field.config for the type (options, bounds, decimals)"""
+    if field_type in ("select", "multiselect"):
+        return {"options": select_options(rng, rng.randint(3, 12))}
+    if field_type == "currency":
+        return {"min": 0, "decimals": 2}
+    if field_type == "percentage":
+        return {"min": 0, "max": 100}
+    if field_type == "text":
+        return {"maxLength": 255}
+    return {}
+
+
+def field_value(rng: random.Random, field_type: str, config: dict | None = None, serial: int = 0) -> Any:
+    """
+    A value that passes the record validator for the type and config.
+
+    `serial` makes otherwise repetitive values unique enough (emails, URLs).
+    """
+    config = config or {}
+    if field_type == "text":
+        return person_name(rng)
+    if field_type == "textarea":
+        return " ".join(skewed_choice(rng, WORDS) for _ in range(rng.randint(5, 30)))
+    if field_type == "email":
+        local = unicodedata.normalize("NFKD", skewed_choice(rng, FIRST_NAMES).lower())
+        return f"{local.encode('ascii', 'ignore').decode()}.{serial}@{skewed_choice(rng, DOMAINS)}"
+    if field_type == "phone":
+        return f"+90 5{rng.randint(0, 99):02d} {rng.randint(0, 9_999_999):07d}"
+    if field_type == "url":
+        return f"https://{skewed_choice(rng, WORDS)}.{skewed_choice(rng, DOMAINS)}/{serial}"
+    if field_type == "number":
+        return int(rng.paretovariate(1.5) * 10)
+    if field_type == "currency":
+        return round(rng.lognormvariate(7, 1.5), 2)
+    if field_type == "percentage":
+        return min(100, round(rng.betavariate(2, 5) * 100, 1))
+    if field_type == "boolean":
+        return rng.random() < 0.8
+    if field_type == "date":
+        return (EPOCH + timedelta(seconds=rng.randrange(SPAN_SECONDS))).date().isoformat()
+    if field_type == "datetime":
+        return (EPOCH + timedelta(seconds=rng.randrange(SPAN_SECONDS))).isoformat()
+    if field_type in ("select", "multiselect"):
+        options = [option["value"] for option in config.get("options") or []] or list(WORDS)
+        if field_type == "select":
+            return skewed_choice(rng, options)
+        return sorted({skewed_choice(rng, options) for _ in range(rng.randint(1, 3))})
+    return None
+
+
+def record_data(rng: random.Random, fields: list[dict], serial: int = 0, fill_rate: float = 1.0) -> dict:
+    """
+    Record data keyed by field ID for `fields` ({"id", "type", "config"},
+    optionally "fill_rate").
+
+    The first field is always filled (it becomes primary_value); the others
+    with probability `fill_rate` (or their own), so wide objects get
+    realistically sparse rows.
+    """
+    data = {}
+    for index, field in enumerate(fields):
+        if index and rng.random() >= field.get("fill_rate", fill_rate):
+            continue
+        data[field["id"]] = field_value(rng, field["type"], field.get("config"), serial)
+    return data
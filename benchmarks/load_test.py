@@ -0,0 +1,573 @@
+"""
+Load test - throughput and latency of the API under a realistic request mix
+
+Migrates the Postgres in DATABASE_URL (alembic), seeds a dataset through the
+services, boots `app.main:app` with uvicorn and runs closed-loop virtual
+users against it. Each virtual user logs in once, then issues requests picked
+from a weighted mix until the duration is up:
+
+    list_records     GET   /api/records?object_id=...&page=N
+    get_record       GET   /api/records/{id}
+    search_records   GET   /api/records/search?object_id=...&q=...
+    related_records  GET   /api/relationship-records/records/{id}/related
+    create_record    POST  /api/records
+    patch_record     PATCH /api/records/{id}
+    login            POST  /api/auth/login
+
+Requests, errors, RPS and p50/p95/p99 latency are reported per endpoint;
+`--json` / `--output` give machine-readable results (with the git commit)
+for comparing versions. The booted server runs with rate limiting disabled,
+which would otherwise cap every virtual user at RATE_LIMIT_PER_MINUTE.
+The same seed gives the same dataset values and the same request sequence
+per virtual user. Usage:
+
+    python -m benchmarks.load_test [--records 10000] [--concurrency 32] [--duration 30]
+        [--mix list_records=50,login=0] [--workers 1] [--seed 1] [--json] [--output FILE]
+
+    # Seed once, reuse the dataset (or one from benchmarks.synthetic_tenant)
+    python -m benchmarks.load_test --manifest dataset.json
+
+    # Seed a wide, skewed tenant with the COPY-based generator instead
+    python -m benchmarks.load_test --synthetic --records 1000000 --manifest tenant.json
+
+    # Against an already running server
+    python -m benchmarks.load_test --url http://127.0.0.1:8000 --manifest dataset.json
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import time
+import uuid
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+
+import httpx
+
+from benchmarks.datagen import field_config, field_value, person_name, record_data, skewed_choice, skewed_index
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+PASSWORD = "LoadTest-Passw0rd"
+PAGE_SIZE = 50
+
+DEFAULT_MIX = {
+    "list_records": 30,
+    "get_record": 15,
+    "search_records": 15,
+    "related_records": 15,
+    "create_record": 10,
+    "patch_record": 10,
+    "login": 5,
+}
+
+# (name, Field.type) of the seeded objects; the first field becomes primary_value
+CONTACT_FIELDS = (
+    ("name", "text"),
+    ("email", "email"),
+    ("phone", "phone"),
+    ("stage", "select"),
+    ("tags", "multiselect"),
+    ("score", "number"),
+    ("revenue", "currency"),
+    ("active", "boolean"),
+    ("since", "date"),
+)
+COMPANY_FIELDS = (("company_name", "text"), ("industry", "select"), ("website", "url"))
+
+# Record IDs kept in the manifest as request targets (get, patch, related)
+SAMPLE_SIZE = 1000
+
+
+@dataclass
+class Dataset:
+    """What the load generator needs to know about seeded data (saved as the manifest)"""
+    password: str
+    emails: list[str]
+    object_id: str  # Records listed, searched and created
+    fields: list[dict]  # {"id", "type", "config"} of object_id's fields
+    record_ids: list[str]  # Sample of object_id's records
+    relationship_id: str  # Links from object_id's records
+    search_terms: list[str]
+    counts: dict[str, int] = field(default_factory=dict)
+
+    def save(self, path: str | Path) -> None:
+        Path(path).write_text(json.dumps(asdict(self), ensure_ascii=False, indent=2))
+
+    @classmethod
+    def load(cls, path: str | Path) -> "Dataset":
+        return cls(**json.loads(Path(path).read_text()))
+
+
+# ============================================================================
+# Database setup
+# ============================================================================
+
+def migrate() -> None:
+    """Bring the schema to head (no-op when already migrated)"""
+    subprocess.run([sys.executable, "-m", "alembic", "upgrade", "head"], cwd=REPO_ROOT, check=True)
+
+
+async def seed(records: int, users: int, links_per_record: int, seed: int) -> Dataset:
+    """
+    Seed users, a contact and a company object, records and lookup links.
+
+    Metadata and records go through the services (records via the bulk
+    endpoint's service call, so they are validated like API writes); links
+    are inserted in batches. Emails carry a random run tag so the same
+    database can be seeded repeatedly; all other values depend on `seed`.
+    """
+    # Imported here: --url runs against a remote server need no local settings
+    from sqlalchemy import insert
+
+    from app.database import AsyncSessionLocal, engine
+    from app.models import RelationshipRecord
+    from app.schemas import ObjectCreate, RelationshipCreate, UserRegister
+    from app.services import auth_service, object_service, relationship_service
+
+    rng = random.Random(seed)
+    tag = uuid.uuid4().hex[:8]
+
+    async with AsyncSessionLocal() as db:
+        emails = [f"loadtest-{tag}-{i}@example.com" for i in range(users)]
+        owners = [
+            await auth_service.register_user(
+                db, UserRegister(email=email, password=PASSWORD, full_name=person_name(rng))
+            )
+            for email in emails
+        ]
+        owner_id = owners[0].id
+
+        contact = await object_service.create_object(
+            db, ObjectCreate(name="contact", label="Contact", plural_name="Contacts"), owner_id
+        )
+        company = await object_service.create_object(
+            db, ObjectCreate(name="company", label="Company", plural_name="Companies"), owner_id
+        )
+        contact_fields = await create_fields(db, contact.id, CONTACT_FIELDS, rng, owner_id)
+        company_fields = await create_fields(db, company.id, COMPANY_FIELDS, rng, owner_id)
+        relationship = await relationship_service.create_relationship(
+            db,
+            RelationshipCreate(
+                name="contact_company",
+                from_object_id=contact.id,
+                to_object_id=company.id,
+                type="lookup",
+                from_label="Company",
+                to_label="Contacts",
+            ),
+            owner_id,
+        )
+        await db.commit()
+
+        company_ids = await create_records(db, company.id, company_fields, max(1, records // 10), rng, owner_id)
+        contact_ids = await create_records(db, contact.id, contact_fields, records, rng, owner_id)
+
+        # Popular companies collect most contacts
+        links = [
+            {
+                "id": f"lnk_{uuid.UUID(int=rng.getrandbits(128)).hex[:16]}",
+                "relationship_id": relationship.id,
+                "from_record_id": contact_id,
+                "to_record_id": company_ids[skewed_index(rng, len(company_ids))],
+                "relationship_metadata": {},
+                "created_by": owner_id,
+            }
+            for contact_id in contact_ids
+            for _ in range(links_per_record)
+        ]
+        for start in range(0, len(links), 5000):
+            await db.execute(insert(RelationshipRecord), links[start:start + 5000])
+        await db.commit()
+
+    await engine.dispose()
+
+    return Dataset(
+        password=PASSWORD,
+        emails=emails,
+        object_id=contact.id,
+        fields=contact_fields,
+        record_ids=rng.sample(contact_ids, k=min(SAMPLE_SIZE, len(contact_ids))),
+        relationship_id=relationship.id,
+        search_terms=sorted({name.split()[0] for name in (person_name(rng) for _ in range(200))}),
+        counts={"users": users, "records": records, "companies": len(company_ids), "links": len(links)},
+    )
+
+
+async def create_fields(db, object_id: str, specs, rng: random.Random, owner_id) -> list[dict]:
+    """Create fields and attach them to the object; returns {"id", "type", "config"} dicts"""
+    from app.schemas import FieldCreate, ObjectFieldCreate
+    from app.services import field_service, object_field_service
+
+    fields = []
+    for order, (name, field_type) in enumerate(specs):
+        config = field_config(rng, field_type)
+        created = await field_service.create_field(
+            db,
+            FieldCreate(name=name, label=name.replace("_", " ").title(), type=field_type, config=config),
+            owner_id,
+        )
+        await object_field_service.create_object_field(
+            db,
+            ObjectFieldCreate(object_id=object_id, field_id=created.id, display_order=order, is_required=order == 0),
+            owner_id,
+        )
+        fields.append({"id": created.id, "type": field_type, "config": config})
+    return fields
+
+
+async def create_records(db, object_id: str, fields: list[dict], count: int, rng: random.Random, owner_id) -> list[str]:
+    """Create records in bulk-endpoint sized batches, committing each; returns their IDs"""
+    from app.schemas import RecordBulkCreate
+    from app.services import record_service
+
+    ids = []
+    for start in range(0, count, 1000):
+        batch = [
+            record_data(rng, fields, serial=serial, fill_rate=0.8)
+            for serial in range(start, min(start + 1000, count))
+        ]
+        created = await record_service.create_records_bulk(
+            db, RecordBulkCreate(object_id=object_id, records=batch), owner_id
+        )
+        ids.extend(record.id for record in created)
+        await db.commit()
+    return ids
+
+
+# ============================================================================
+# Server
+# ============================================================================
+
+def boot_server(port: int, workers: int) -> subprocess.Popen:
+    """Start uvicorn serving app.main:app (rate limiting off, access log off)"""
+    env = {**os.environ, "RATE_LIMIT_ENABLED": "false", "DEBUG": "false", "LOG_LEVEL": "WARNING"}
+    return subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(workers), "--no-access-log", "--log-level", "warning",
+        ],
+        cwd=REPO_ROOT,
+        env=env,
+    )
+
+
+async def wait_until_healthy(base_url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while True:
+            try:
+                if (await client.get("/api/health")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"Server at {base_url} not healthy after {timeout:.0f}s")
+            await asyncio.sleep(0.2)
+
+
+# ============================================================================
+# Load generator
+# ============================================================================
+
+# A scenario builds (method, path, httpx request kwargs) for one request
+Scenario = Callable[[random.Random, Dataset, int], tuple[str, str, dict]]
+
+
+def _list_records(rng: random.Random, dataset: Dataset, serial: int) -> tuple[str, str, dict]:
+    # Most users stay on the first pages
+    pages = max(1, math.ceil(dataset.counts.get("records", 0) / PAGE_SIZE))
+    page = 1 + skewed_index(rng, min(pages, 100))
+    return "GET", "/api/records", {
+        "params": {"object_id": dataset.object_id, "page": page, "page_size": PAGE_SIZE}
+    }
+
+
+def _get_record(rng: random.Random, dataset: Dataset, serial: int) -> tuple[str, str, dict]:
+    return "GET", f"/api/records/{skewed_choice(rng, dataset.record_ids)}", {}
+
+
+def _search_records(rng: random.Random, dataset: Dataset, serial: int) -> tuple[str, str, dict]:
+    return "GET", "/api/records/search", {
+        "params": {"object_id": dataset.object_id, "q": skewed_choice(rng, dataset.search_terms)}
+    }
+
+
+def _related_records(rng: random.Random, dataset: Dataset, serial: int) -> tuple[str, str, dict]:
+    record_id = skewed_choice(rng, dataset.record_ids)
+    return "GET", f"/api/relationship-records/records/{record_id}/related", {
+        "params": {"relationship_id": dataset.relationship_id}
+    }
+
+
+def _create_record(rng: random.Random, dataset: Dataset, serial: int) -> tuple[str, str, dict]:
+    return "POST", "/api/records", {
+        "json": {"object_id": dataset.object_id, "data": record_data(rng, dataset.fields, serial, fill_rate=0.8)}
+    }
+
+
+def _patch_record(rng: random.Random, dataset: Dataset, serial: int) -> tuple[str, str, dict]:
+    target = rng.choice(dataset.fields[1:] or dataset.fields)
+    value = field_value(rng, target["type"], target.get("config"), serial)
+    return "PATCH", f"/api/records/{skewed_choice(rng, dataset.record_ids)}", {
+        "json": {"data": {target["id"]: value}}
+    }
+
+
+def _login(rng: random.Random, dataset: Dataset, serial: int) -> tuple[str, str, dict]:
+    return "POST", "/api/auth/login", {
+        "data": {"username": rng.choice(dataset.emails), "password": dataset.password}
+    }
+
+
+SCENARIOS: dict[str, Scenario] = {
+    "list_records": _list_records,
+    "get_record": _get_record,
+    "search_records": _search_records,
+    "related_records": _related_records,
+    "create_record": _create_record,
+    "patch_record": _patch_record,
+    "login": _login,
+}
+UNAUTHENTICATED = frozenset({"login"})
+
+
+@dataclass(slots=True)
+class EndpointStats:
+    latencies: list[float] = field(default_factory=list)  # Seconds
+    statuses: Counter = field(default_factory=Counter)  # "200", "429", "error" (transport)
+
+
+def parse_mix(spec: str | None) -> dict[str, int]:
+    """DEFAULT_MIX updated with "name=weight,..." overrides"""
+    mix = dict(DEFAULT_MIX)
+    for part in filter(None, (spec or "").split(",")):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise SystemExit(f"Unknown scenario {name!r}; choose from {', '.join(SCENARIOS)}")
+        mix[name] = int(weight)
+    if not any(mix.values()):
+        raise SystemExit("The mix has no scenario with a positive weight")
+    return mix
+
+
+async def get_token(client: httpx.AsyncClient, dataset: Dataset, email: str) -> str:
+    response = await client.post("/api/auth/login", data={"username": email, "password": dataset.password})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def virtual_user(
+    client: httpx.AsyncClient,
+    dataset: Dataset,
+    mix: dict[str, int],
+    token: str,
+    rng: random.Random,
+    measure_from: float,
+    deadline: float,
+    stats: dict[str, EndpointStats],
+) -> None:
+    """Issue requests back to back until the deadline; only those started after warm-up count"""
+    names = [name for name, weight in mix.items() if weight > 0]
+    weights = [mix[name] for name in names]
+    auth = {"Authorization": f"Bearer {token}"}
+    serial = rng.randrange(1_000_000_000)
+
+    while (started := time.perf_counter()) < deadline:
+        name = rng.choices(names, weights)[0]
+        method, path, kwargs = SCENARIOS[name](rng, dataset, serial)
+        serial += 1
+        headers = None if name in UNAUTHENTICATED else auth
+        try:
+            response = await client.request(method, path, headers=headers, **kwargs)
+            status = str(response.status_code)
+        except httpx.TransportError:
+            status = "error"
+        if started >= measure_from:
+            endpoint = stats[name]
+            endpoint.latencies.append(time.perf_counter() - started)
+            endpoint.statuses[status] += 1
+
+
+async def run_load(
+    base_url: str,
+    dataset: Dataset,
+    mix: dict[str, int],
+    concurrency: int,
+    duration: float,
+    warmup: float,
+    seed: int,
+) -> dict:
+    stats = {name: EndpointStats() for name, weight in mix.items() if weight > 0}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        tokens = [await get_token(client, dataset, email) for email in dataset.emails]
+        measure_from = time.perf_counter() + warmup
+        deadline = measure_from + duration
+        await asyncio.gather(*(
+            virtual_user(
+                client, dataset, mix, tokens[index % len(tokens)],
+                random.Random(seed * 1_000_003 + index), measure_from, deadline, stats,
+            )
+            for index in range(concurrency)
+        ))
+        elapsed = time.perf_counter() - measure_from
+
+    return summarize(stats, elapsed)
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0-100) of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def _summary(latencies: list[float], statuses: Counter, elapsed: float) -> dict:
+    ordered = sorted(latencies)
+    errors = sum(count for status, count in statuses.items() if status == "error" or int(status) >= 400)
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "rps": round(len(ordered) / elapsed, 1) if elapsed > 0 else 0.0,
+        "p50_ms": round(percentile(ordered, 50) * 1000, 2),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 2),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 2),
+        "max_ms": round(ordered[-1] * 1000, 2) if ordered else 0.0,
+        "status": dict(sorted(statuses.items())),
+    }
+
+
+def summarize(stats: dict[str, EndpointStats], elapsed: float) -> dict:
+    """Per-endpoint and overall results"""
+    all_latencies: list[float] = []
+    all_statuses: Counter = Counter()
+    for endpoint in stats.values():
+        all_latencies.extend(endpoint.latencies)
+        all_statuses.update(endpoint.statuses)
+    return {
+        "elapsed_s": round(elapsed, 2),
+        "endpoints": {
+            name: _summary(endpoint.latencies, endpoint.statuses, elapsed)
+            for name, endpoint in stats.items()
+        },
+        "total": _summary(all_latencies, all_statuses, elapsed),
+    }
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_table(results: dict) -> None:
+    columns = ("requests", "errors", "rps", "p50_ms", "p95_ms", "p99_ms", "max_ms")
+    print(f"{'endpoint':<18}" + "".join(f"{column:>10}" for column in columns))
+    rows = {**results["endpoints"], "total": results["total"]}
+    for name, summary in rows.items():
+        print(f"{name:<18}" + "".join(f"{summary[column]:>10}" for column in columns))
+
+
+async def main_async(args: argparse.Namespace) -> dict:
+    mix = parse_mix(args.mix)
+
+    if args.manifest and Path(args.manifest).exists():
+        dataset = Dataset.load(args.manifest)
+    else:
+        if args.url:
+            raise SystemExit("--url needs an existing --manifest (seeding writes to the local DATABASE_URL)")
+        if not args.skip_migrate:
+            migrate()
+        if args.synthetic:
+            from benchmarks import synthetic_tenant
+            dataset = await synthetic_tenant.generate(synthetic_tenant.options(
+                records=args.records,
+                users=args.users,
+                links_per_record=args.links_per_record,
+                seed=args.seed,
+            ))
+        else:
+            dataset = await seed(args.records, args.users, args.links_per_record, args.seed)
+        if args.manifest:
+            dataset.save(args.manifest)
+
+    server = None
+    base_url = args.url
+    if base_url is None:
+        server = boot_server(args.port, args.workers)
+        base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        await wait_until_healthy(base_url)
+        results = await run_load(base_url, dataset, mix, args.concurrency, args.duration, args.warmup, args.seed)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "started_at": datetime.now(UTC).isoformat(),
+            "url": base_url,
+            "workers": args.workers if server is not None else None,
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "warmup_s": args.warmup,
+            "seed": args.seed,
+            "mix": mix,
+            "dataset": dataset.counts,
+        },
+        **results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=10_000, help="contact records to seed")
+    parser.add_argument("--users", type=int, default=10, help="users to seed (virtual users share them)")
+    parser.add_argument("--links-per-record", type=int, default=1, help="company links per contact")
+    parser.add_argument("--synthetic", action="store_true", help="seed with benchmarks.synthetic_tenant")
+    parser.add_argument("--manifest", help="dataset manifest: loaded if it exists, else written after seeding")
+    parser.add_argument("--skip-migrate", action="store_true", help="do not run alembic upgrade head")
+    parser.add_argument("--url", help="target a running server instead of booting one")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers")
+    parser.add_argument("--concurrency", type=int, default=32, help="virtual users")
+    parser.add_argument("--duration", type=float, default=30.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=5.0, help="unmeasured seconds first")
+    parser.add_argument("--mix", help='weights, e.g. "list_records=50,login=0" (defaults: %s)' % (
+        ",".join(f"{name}={weight}" for name, weight in DEFAULT_MIX.items())))
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    parser.add_argument("--output", help="also write the JSON results to this file")
+    args = parser.parse_args()
+
+    results = asyncio.run(main_async(args))
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print_table(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark - record page serialization, before and after the fast path
+
+- pydantic:  ORM rows -> RecordListResponse (from_attributes) -> FastAPI's
+             serialize_response (validate + serialize again) -> JSONResponse
+- fast:      column tuples -> dump_record_page (orjson) -> RecordJSONResponse
+
+No database is needed. Usage:
+
+    python -m benchmarks.record_serialization [--page-size 100] [--seconds 2] [--json]
+"""
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from datetime import UTC, datetime, timedelta
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.models import Record
+from app.schemas import RecordListResponse
+from app.utils.serialization import RECORD_KEYS, RecordJSONResponse, dump_record_page
+
+
+def make_rows(count: int, fields: int = 12) -> list[tuple]:
+    """Realistic record rows (same fld_ keys on every row)"""
+    now = datetime.now(UTC)
+    user = uuid.uuid4()
+    rows = []
+    for i in range(count):
+        data = {f"fld_{n:08x}": f"value {i}-{n}" for n in range(fields)}
+        data["fld_amount"] = i * 1.25
+        data["fld_active"] = i % 2 == 0
+        values = {
+            "object_id": "obj_contact",
+            "data": data,
+            "id": f"rec_{i:08x}",
+            "primary_value": f"value {i}-0",
+            "created_at": now - timedelta(minutes=i),
+            "updated_at": now,
+            "created_by": user,
+            "updated_by": user,
+            "tenant_id": None,
+        }
+        rows.append(tuple(values[key] for key in RECORD_KEYS))
+    return rows
+
+
+async def pydantic_page(records: list[Record], field) -> bytes:
+    page = RecordListResponse(total=1000, page=1, page_size=len(records), records=records)
+    content = await serialize_response(field=field, response_content=page)
+    return JSONResponse(content).body
+
+
+async def fast_page(rows: list[tuple]) -> bytes:
+    return RecordJSONResponse(dump_record_page(rows, total=1000, page=1, page_size=len(rows))).body
+
+
+async def _throughput(make_page, seconds: float) -> float:
+    await make_page()  # warm up
+    pages = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        await make_page()
+        pages += 1
+    return pages / seconds
+
+
+async def run(page_size: int, seconds: float) -> dict:
+    rows = make_rows(page_size)
+    records = [Record(**dict(zip(RECORD_KEYS, row))) for row in rows]
+    field = create_model_field(name="response", type_=RecordListResponse, mode="serialization")
+
+    before = await _throughput(lambda: pydantic_page(records, field), seconds)
+    after = await _throughput(lambda: fast_page(rows), seconds)
+    return {
+        "page_size": page_size,
+        "pydantic_pages_per_s": round(before, 1),
+        "fast_pages_per_s": round(after, 1),
+        "speedup": round(after / before, 2),
+        "bytes_per_page": len(await fast_page(rows)),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--seconds", type=float, default=2.0, help="duration of each timing run")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.page_size, args.seconds))
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for key, value in results.items():
+        print(f"{key:<24}{value}")
+
+
+if __name__ == "__main__":
+    main()
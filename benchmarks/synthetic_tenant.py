@@ -0,0 +1,449 @@
+"""
+Synthetic tenant generator - wide objects, millions of records, dense link graphs
+
+Builds one tenant in the Postgres at DATABASE_URL for benchmarking and
+capacity planning:
+
+- metadata through the services: users, objects, 50+ fields per object of
+  mixed Field.type (with options and bounds), object fields, relationships
+- records and relationship_records bulk-loaded with COPY, generated in
+  worker processes while the previous chunk is being copied
+
+Data is skewed like production: object sizes, select values, names, link
+targets and record owners follow Zipf-like distributions, later custom
+fields are increasingly sparse, created_at clusters in recent months and
+N:N link out-degrees are heavy-tailed. Everything is derived from `--seed`
+(chunk by chunk, so `--jobs` does not change the output); only metadata IDs
+are assigned by the services. Writes a load harness manifest:
+
+    python -m benchmarks.synthetic_tenant --records 2000000 --objects 4 --fields 60 \\
+        --links-per-record 3 --seed 7 --manifest tenant.json
+    python -m benchmarks.load_test --manifest tenant.json
+
+Seed a database once per seed: emails and record IDs repeat for the same seed.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from collections import deque
+from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor
+from datetime import UTC, datetime, timedelta
+
+import orjson
+
+from benchmarks.datagen import (
+    FIRST_NAMES,
+    LAST_NAMES,
+    WORDS,
+    field_config,
+    person_name,
+    record_data,
+    skewed_choice,
+    skewed_index,
+)
+from benchmarks.load_test import PASSWORD, SAMPLE_SIZE, Dataset, migrate
+
+# Share of each Field.type among generated fields (text-heavy, like real CRMs)
+FIELD_TYPE_WEIGHTS = {
+    "text": 25, "textarea": 5, "email": 5, "phone": 5, "url": 3,
+    "number": 10, "currency": 5, "percentage": 3,
+    "boolean": 10, "date": 10, "datetime": 3, "select": 12, "multiselect": 4,
+}
+
+OBJECT_NAMES = ("contact", "company", "deal", "ticket", "activity", "product", "invoice", "project")
+
+# created_at lies before this instant (fixed, so output does not depend on the clock)
+ANCHOR = datetime(2025, 1, 1, tzinfo=UTC)
+RECENT_DAYS = 180  # Mean age of a record
+MAX_AGE_DAYS = 5 * 365
+
+MAX_OUT_DEGREE = 1000
+CHUNK_SIZE = 20_000  # Rows generated per task and sent per COPY
+
+RECORD_COLUMNS = (
+    "id", "object_id", "data", "primary_value",
+    "created_at", "updated_at", "created_by", "updated_by", "tenant_id",
+)
+LINK_COLUMNS = (
+    "id", "relationship_id", "from_record_id", "to_record_id",
+    "relationship_metadata", "created_at", "created_by",
+)
+
+_ID_MULTIPLIER = 0x9E3779B97F4A7C15  # Odd: serial -> ID is a bijection modulo 2**64
+
+
+def record_id(salt: int, serial: int) -> str:
+    """
+    Record ID of an object's `serial`-th record.
+
+    Unique within the object and random-looking (like service IDs), and
+    computable anywhere, so link chunks need no ID lookup table.
+    """
+    return f"rec_{(serial * _ID_MULTIPLIER + salt) % 2**64:016x}"
+
+
+def _chunk_rng(seed: int, *key) -> random.Random:
+    return random.Random(":".join(map(str, (seed, *key))))
+
+
+def _timestamps(rng: random.Random) -> tuple[datetime, datetime]:
+    age = min(rng.expovariate(1 / RECENT_DAYS), MAX_AGE_DAYS)
+    created_at = ANCHOR - timedelta(days=age)
+    # Most records are never edited after creation
+    updated_at = created_at if rng.random() < 0.6 else created_at + timedelta(days=rng.uniform(0, age))
+    return created_at, updated_at
+
+
+# ============================================================================
+# Chunk generators (run in worker processes)
+# ============================================================================
+
+def generate_records(seed: int, spec: dict, start: int, stop: int, users: list[str], tenant_id: str) -> list[tuple]:
+    """COPY rows (RECORD_COLUMNS) for serials start..stop of one object"""
+    rng = _chunk_rng(seed, "records", spec["index"], start)
+    fields, salt, object_id = spec["fields"], spec["salt"], spec["id"]
+    rows = []
+    for serial in range(start, stop):
+        data = record_data(rng, fields, serial=serial)
+        owner = users[skewed_index(rng, len(users))]
+        created_at, updated_at = _timestamps(rng)
+        rows.append((
+            record_id(salt, serial),
+            object_id,
+            orjson.dumps(data).decode(),
+            data[fields[0]["id"]][:255],
+            created_at,
+            updated_at,
+            owner,
+            owner,
+            tenant_id,
+        ))
+    return rows
+
+
+def generate_links(seed: int, link: dict, start: int, stop: int, users: list[str], skew: float) -> list[tuple]:
+    """COPY rows (LINK_COLUMNS) for from-records start..stop of one relationship"""
+    rng = _chunk_rng(seed, "links", link["index"], start)
+    source, target = link["from"], link["to"]
+    rows = []
+    for serial in range(start, stop):
+        if link["type"] == "lookup":
+            degree = 1
+        else:
+            # Pareto(2) - 1 has mean 1 and a heavy tail: most records have a few links, some hundreds
+            degree = min(MAX_OUT_DEGREE, int(link["mean_degree"] * (rng.paretovariate(2.0) - 1) + 0.5))
+        from_id = record_id(source["salt"], serial)
+        targets = {skewed_index(rng, target["count"], skew) for _ in range(degree)}
+        for target_serial in sorted(targets):
+            if source["id"] == target["id"] and target_serial == serial:
+                continue
+            metadata = {"role": skewed_choice(rng, WORDS)} if rng.random() < 0.3 else {}
+            created_at, _ = _timestamps(rng)
+            rows.append((
+                f"lnk_{rng.getrandbits(64):016x}",
+                link["id"],
+                from_id,
+                record_id(target["salt"], target_serial),
+                orjson.dumps(metadata).decode(),
+                created_at,
+                users[skewed_index(rng, len(users))],
+            ))
+    return rows
+
+
+# ============================================================================
+# Metadata (through the services)
+# ============================================================================
+
+async def create_metadata(db, args: argparse.Namespace, rng: random.Random) -> dict:
+    """Users, objects, fields and relationships; returns the plan the COPY phase follows"""
+    from fastapi import HTTPException
+
+    from app.schemas import FieldCreate, ObjectCreate, ObjectFieldCreate, RelationshipCreate, UserRegister
+    from app.services import (
+        auth_service,
+        field_service,
+        object_field_service,
+        object_service,
+        relationship_service,
+    )
+
+    emails = [f"tenant-{args.seed}-{i}@example.com" for i in range(args.users)]
+    try:
+        users = [
+            await auth_service.register_user(
+                db, UserRegister(email=email, password=PASSWORD, full_name=person_name(rng))
+            )
+            for email in emails
+        ]
+    except HTTPException as exc:
+        raise SystemExit(f"{exc.detail}: seed {args.seed} was already generated in this database") from None
+    owner_id = users[0].id
+
+    # Object sizes are Zipf-skewed too: the first object holds most records
+    weights = [1 / (index + 1) for index in range(args.objects)]
+    sizes = [int(args.records * weight / sum(weights)) for weight in weights]
+    sizes[0] += args.records - sum(sizes)
+
+    type_names = list(FIELD_TYPE_WEIGHTS)
+    type_weights = list(FIELD_TYPE_WEIGHTS.values())
+    objects = []
+    for index, count in enumerate(sizes):
+        name = OBJECT_NAMES[index] if index < len(OBJECT_NAMES) else f"object_{index}"
+        obj = await object_service.create_object(
+            db,
+            ObjectCreate(name=name, label=name.title(), plural_name=f"{name.title()}s"),
+            owner_id,
+        )
+        fields = []
+        for order in range(args.fields):
+            # First field is the text primary value; later custom fields are ever sparser
+            field_type = "text" if order == 0 else rng.choices(type_names, type_weights)[0]
+            config = field_config(rng, field_type)
+            field_name = f"{name}_{field_type}_{order:02d}"
+            created = await field_service.create_field(
+                db,
+                FieldCreate(
+                    name=field_name,
+                    label=field_name.replace("_", " ").title(),
+                    type=field_type,
+                    config=config,
+                    category=name.title(),
+                ),
+                owner_id,
+            )
+            await object_field_service.create_object_field(
+                db,
+                ObjectFieldCreate(
+                    object_id=obj.id, field_id=created.id, display_order=order, is_required=order == 0
+                ),
+                owner_id,
+            )
+            fields.append({
+                "id": created.id,
+                "type": field_type,
+                "config": config,
+                "fill_rate": 1.0 if order == 0 else round(max(0.02, 0.97 ** order), 3),
+            })
+        objects.append({
+            "index": index,
+            "name": name,
+            "id": obj.id,
+            "count": count,
+            "salt": rng.getrandbits(64),
+            "fields": fields,
+        })
+
+    # Self N:N on the largest object, every other object looks up to it,
+    # and neighbouring smaller objects are N:N linked
+    pairs = [(objects[0], objects[0], "N:N")]
+    pairs += [(obj, objects[0], "lookup") for obj in objects[1:]]
+    pairs += [(objects[i], objects[i + 1], "N:N") for i in range(1, len(objects) - 1)]
+    links = []
+    for source, target, kind in pairs:
+        if not source["count"] or not target["count"]:
+            continue
+        created = await relationship_service.create_relationship(
+            db,
+            RelationshipCreate(
+                name=f"{source['name']}_{target['name']}_{kind.replace(':', '').lower()}",
+                from_object_id=source["id"],
+                to_object_id=target["id"],
+                type=kind,
+                from_label=target["name"].title(),
+                to_label=source["name"].title(),
+            ),
+            owner_id,
+        )
+        links.append({
+            "index": len(links),
+            "id": created.id,
+            "type": kind,
+            # Only what link chunks need (these dicts are pickled per chunk)
+            "from": {key: source[key] for key in ("id", "salt", "count")},
+            "to": {key: target[key] for key in ("id", "salt", "count")},
+            "mean_degree": args.links_per_record,
+        })
+
+    await db.commit()
+    return {
+        "emails": emails,
+        "users": [str(user.id) for user in users],
+        "tenant_id": str(owner_id),
+        "objects": objects,
+        "links": links,
+    }
+
+
+# ============================================================================
+# COPY
+# ============================================================================
+
+async def copy_chunks(
+    connection,
+    table: str,
+    columns: tuple[str, ...],
+    tasks: Iterable[tuple],
+    generate: Callable[..., list[tuple]],
+    executor: ProcessPoolExecutor,
+    jobs: int,
+) -> int:
+    """COPY the rows of each task in order, generating up to 2 * jobs chunks ahead"""
+    loop = asyncio.get_running_loop()
+    tasks = iter(tasks)
+    pending: deque = deque()
+
+    def submit() -> None:
+        task = next(tasks, None)
+        if task is not None:
+            pending.append(loop.run_in_executor(executor, generate, *task))
+
+    for _ in range(2 * jobs):
+        submit()
+    copied = 0
+    while pending:
+        rows = await pending.popleft()
+        submit()
+        await connection.copy_records_to_table(table, records=rows, columns=columns)
+        copied += len(rows)
+    return copied
+
+
+def _ranges(count: int) -> Iterable[tuple[int, int]]:
+    return ((start, min(start + CHUNK_SIZE, count)) for start in range(0, count, CHUNK_SIZE))
+
+
+async def load_data(plan: dict, args: argparse.Namespace) -> dict[str, int]:
+    """COPY all records, then all links, each table in one transaction; then ANALYZE"""
+    from sqlalchemy import text
+
+    from app.database import engine
+
+    counts = {}
+    with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+        async with engine.connect() as conn:
+            driver = (await conn.get_raw_connection()).driver_connection
+
+            started = time.perf_counter()
+            async with driver.transaction():
+                counts["records"] = await copy_chunks(
+                    driver, "records", RECORD_COLUMNS,
+                    (
+                        (args.seed, obj, start, stop, plan["users"], plan["tenant_id"])
+                        for obj in plan["objects"]
+                        for start, stop in _ranges(obj["count"])
+                    ),
+                    generate_records, executor, args.jobs,
+                )
+            _progress("records", counts["records"], started)
+
+            started = time.perf_counter()
+            async with driver.transaction():
+                counts["links"] = await copy_chunks(
+                    driver, "relationship_records", LINK_COLUMNS,
+                    (
+                        (args.seed, link, start, stop, plan["users"], args.link_skew)
+                        for link in plan["links"]
+                        for start, stop in _ranges(link["from"]["count"])
+                    ),
+                    generate_links, executor, args.jobs,
+                )
+            _progress("links", counts["links"], started)
+
+            await conn.execute(text("ANALYZE records"))
+            await conn.execute(text("ANALYZE relationship_records"))
+            await conn.commit()
+    await engine.dispose()
+    return counts
+
+
+def _progress(what: str, rows: int, started: float) -> None:
+    elapsed = time.perf_counter() - started
+    print(f"copied {rows:,} {what} in {elapsed:.1f}s ({rows / max(elapsed, 1e-9):,.0f} rows/s)", file=sys.stderr)
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def build_manifest(plan: dict, counts: dict[str, int], rng: random.Random) -> Dataset:
+    """Load harness dataset: the largest object and its self N:N relationship"""
+    main = plan["objects"][0]
+    serials = rng.sample(range(main["count"]), k=min(SAMPLE_SIZE, main["count"]))
+    return Dataset(
+        password=PASSWORD,
+        emails=plan["emails"],
+        object_id=main["id"],
+        fields=main["fields"],
+        record_ids=[record_id(main["salt"], serial) for serial in serials],
+        relationship_id=plan["links"][0]["id"],
+        search_terms=sorted({*FIRST_NAMES, *LAST_NAMES}),
+        counts={
+            "users": len(plan["users"]),
+            "records": main["count"],
+            "records_total": counts["records"],
+            "links": counts["links"],
+            "objects": len(plan["objects"]),
+            "fields_per_object": len(main["fields"]),
+        },
+    )
+
+
+async def generate(args: argparse.Namespace) -> Dataset:
+    """Create the tenant described by args and return its load harness manifest"""
+    from app.database import AsyncSessionLocal
+
+    rng = random.Random(args.seed)
+    async with AsyncSessionLocal() as db:
+        plan = await create_metadata(db, args, rng)
+    counts = await load_data(plan, args)
+    return build_manifest(plan, counts, rng)
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--records", type=int, default=1_000_000, help="records across all objects")
+    parser.add_argument("--objects", type=int, default=4)
+    parser.add_argument("--fields", type=int, default=60, help="fields per object")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--links-per-record", type=float, default=3.0, help="mean N:N out-degree")
+    parser.add_argument("--link-skew", type=float, default=0.8, help="Zipf exponent of link targets")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="generator processes")
+    parser.add_argument("--seed", type=int, default=1)
+
+
+def options(**overrides) -> argparse.Namespace:
+    """Generator arguments with CLI defaults for anything not overridden (for the load harness)"""
+    parser = argparse.ArgumentParser()
+    add_arguments(parser)
+    return parser.parse_args([], namespace=argparse.Namespace(**overrides))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_arguments(parser)
+    parser.add_argument("--manifest", help="write the load harness manifest here")
+    parser.add_argument("--skip-migrate", action="store_true", help="do not run alembic upgrade head")
+    parser.add_argument("--json", action="store_true", help="print the manifest counts as JSON")
+    args = parser.parse_args()
+    if args.records < 1 or args.objects < 1 or args.fields < 1 or args.users < 1:
+        parser.error("--records, --objects, --fields and --users must be positive")
+
+    if not args.skip_migrate:
+        migrate()
+    dataset = asyncio.run(generate(args))
+    if args.manifest:
+        dataset.save(args.manifest)
+    if args.json:
+        print(json.dumps(dataset.counts, indent=2))
+        return
+    for key, value in dataset.counts.items():
+        print(f"{key:<20}{value:,}")
+
+
+if __name__ == "__main__":
+    main()
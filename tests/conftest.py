@@ -1,19 +1,28 @@
 """Pytest configuration and shared fixtures"""
 import asyncio
+import contextlib
 import pytest
 import uuid
 from typing import AsyncGenerator
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from httpx import AsyncClient, ASGITransport
 from app.main import app
-from app.database import Base, get_db
+from app.database import Base, get_db, get_read_db, get_read_session_factory
 from app.config import settings
+from app.utils.cache import clear_all_caches
+from app.utils.invalidation import apply_pending
+from app.utils.metrics import track_statements
+from app.utils.rate_limit import token_buckets
 
 # Use existing database for tests (will use transactions and rollback)
 # Note: auth.users table is managed by Supabase and already exists
 test_engine = create_async_engine(settings.DATABASE_URL, echo=False)
 TestSessionLocal = async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
 
+# Per-request statement counts (X-DB-* headers, N+1 warnings) cover the test engine too
+track_statements(test_engine)
+
 @pytest.fixture(scope="session")
 def event_loop():
     """Create event loop for async tests"""
@@ -21,6 +30,19 @@ def event_loop():
     yield loop
     loop.close()
 
+@pytest.fixture(autouse=True)
+def reset_caches():
+    """
+    Clear in-process caches between tests.
+
+    Test transactions are rolled back, so anything cached during a test
+    would otherwise leak into the next one.
+    """
+    clear_all_caches()
+    token_buckets.clear()
+    yield
+    clear_all_caches()
+
 # Note: We don't create auth.users table - it's managed by Supabase
 # Foreign keys to auth.users will work automatically since the table already exists
 
@@ -38,6 +60,8 @@ async def db_session() -> AsyncGenerator[AsyncSession, None]:
         # Override commit to use flush instead (don't commit in tests)
         async def fake_commit():
             await session.flush()
+            # Cache invalidations are applied as a real commit would
+            apply_pending(session.sync_session)
 
         session.commit = fake_commit
 
@@ -56,14 +80,49 @@ async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
     """
     async def override_get_db():
         yield db_session
+        # Like get_db: the unit of work commits after the route returns
+        await db_session.commit()
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    # Streaming routes open sessions from this factory; lend them the test session
+    app.dependency_overrides[get_read_session_factory] = lambda: lambda: contextlib.nullcontext(db_session)
 
     async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test", follow_redirects=True) as ac:
         yield ac
 
     app.dependency_overrides.clear()
 
+@pytest.fixture
+def query_budget():
+    """
+    Assert the maximum number of SQL statements a block may run.
+
+    Usage:
+        async def test_list_records(client, query_budget):
+            with query_budget(2):
+                await client.get("/api/records?object_id=obj_x")
+
+    On failure the statements are listed, so a new N+1 is easy to spot.
+    """
+    @contextlib.contextmanager
+    def budget(max_statements: int):
+        statements: list[str] = []
+
+        def count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(" ".join(statement.split()))
+
+        event.listen(test_engine.sync_engine, "after_cursor_execute", count)
+        try:
+            yield statements
+        finally:
+            event.remove(test_engine.sync_engine, "after_cursor_execute", count)
+        assert len(statements) <= max_statements, (
+            f"{len(statements)} SQL statements, budget {max_statements}:\n" + "\n".join(statements)
+        )
+
+    return budget
+
 @pytest.fixture
 async def test_user_id() -> uuid.UUID:
     """Get a fixed UUID for test user"""
@@ -0,0 +1,95 @@
+"""Tests for API key endpoints and API key authentication"""
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import ApiKey
+from app.services import auth_service
+
+
+@pytest.mark.asyncio
+async def test_create_api_key_and_authenticate(client: AsyncClient, auth_headers: dict):
+    """Test a new API key authenticates requests via X-API-Key"""
+    response = await client.post("/api/api-keys", json={"name": "CI"}, headers=auth_headers)
+
+    assert response.status_code == 201
+    data = response.json()
+    assert data["key"].startswith(f"cvk_{data['prefix']}_")
+
+    response = await client.get("/api/auth/me", headers={"X-API-Key": data["key"]})
+    assert response.status_code == 200
+    assert response.json()["email"] == "test@example.com"
+
+
+@pytest.mark.asyncio
+async def test_api_key_secret_is_hashed(
+    client: AsyncClient,
+    auth_headers: dict,
+    db_session: AsyncSession,
+):
+    """Test only the prefix and a hash of the secret are stored"""
+    response = await client.post("/api/api-keys", json={"name": "CI"}, headers=auth_headers)
+    key = response.json()["key"]
+
+    result = await db_session.execute(select(ApiKey))
+    stored = result.scalar_one()
+    assert stored.secret_hash not in key
+    assert "key" not in (await client.get("/api/api-keys", headers=auth_headers)).json()[0]
+
+
+@pytest.mark.asyncio
+async def test_wrong_secret_is_rejected(client: AsyncClient, auth_headers: dict):
+    """Test a known prefix with the wrong secret returns 401"""
+    response = await client.post("/api/api-keys", json={"name": "CI"}, headers=auth_headers)
+    prefix = response.json()["prefix"]
+
+    response = await client.get("/api/auth/me", headers={"X-API-Key": f"cvk_{prefix}_wrong"})
+
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_revoked_api_key_is_rejected(client: AsyncClient, auth_headers: dict):
+    """Test revocation takes effect even after the key was cached"""
+    response = await client.post("/api/api-keys", json={"name": "CI"}, headers=auth_headers)
+    data = response.json()
+    key_headers = {"X-API-Key": data["key"]}
+    assert (await client.get("/api/auth/me", headers=key_headers)).status_code == 200
+
+    response = await client.delete(f"/api/api-keys/{data['id']}", headers=auth_headers)
+    assert response.status_code == 204
+
+    response = await client.get("/api/auth/me", headers=key_headers)
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_api_key_cannot_manage_api_keys(client: AsyncClient, auth_headers: dict):
+    """Test key management requires a bearer token, not an API key"""
+    response = await client.post("/api/api-keys", json={"name": "CI"}, headers=auth_headers)
+    data = response.json()
+    key_headers = {"X-API-Key": data["key"]}
+
+    assert (await client.get("/api/api-keys", headers=key_headers)).status_code == 401
+    assert (await client.post("/api/api-keys", json={"name": "x"}, headers=key_headers)).status_code == 401
+    assert (await client.delete(f"/api/api-keys/{data['id']}", headers=key_headers)).status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_deactivated_user_api_key_is_rejected(
+    client: AsyncClient,
+    auth_headers: dict,
+    db_session: AsyncSession,
+):
+    """Test deactivation stops cached API keys from authenticating"""
+    response = await client.post("/api/api-keys", json={"name": "CI"}, headers=auth_headers)
+    key_headers = {"X-API-Key": response.json()["key"]}
+    assert (await client.get("/api/auth/me", headers=key_headers)).status_code == 200
+
+    user = await auth_service.get_user_by_email(db_session, "test@example.com")
+    await auth_service.deactivate_user(db_session, user.id)
+    await db_session.commit()
+
+    response = await client.get("/api/auth/me", headers=key_headers)
+    assert response.status_code == 401
@@ -3,8 +3,9 @@ import pytest
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import User, TokenBlacklist
+from app.models import RefreshToken, TokenBlacklist
 from app.services import auth_service
+from app.services.last_login import last_login_buffer
 
 
 # ============================================================================
@@ -223,8 +224,9 @@ async def test_login_updates_last_login(client: AsyncClient, db_session: AsyncSe
         }
     )
 
-    # Check last_login is now set
-    user = await auth_service.get_user_by_id(db_session, user_id)
+    # Check last_login is now set once the write-behind buffer is flushed
+    await last_login_buffer.flush(db_session)
+    await db_session.refresh(user)
     assert user.last_login is not None
 
 
@@ -244,6 +246,24 @@ async def test_get_current_user(client: AsyncClient, auth_headers: dict):
     assert "hashed_password" not in data
 
 
+@pytest.mark.asyncio
+async def test_get_current_user_profile_invalidated_on_deactivation(
+    client: AsyncClient,
+    auth_headers: dict,
+    db_session: AsyncSession,
+):
+    """Test the cached /me profile is dropped when the user is deactivated"""
+    response = await client.get("/api/auth/me", headers=auth_headers)
+    assert response.json()["is_active"] is True
+
+    user = await auth_service.get_user_by_email(db_session, "test@example.com")
+    await auth_service.deactivate_user(db_session, user.id)
+    await db_session.commit()
+
+    response = await client.get("/api/auth/me", headers=auth_headers)
+    assert response.json()["is_active"] is False
+
+
 @pytest.mark.asyncio
 async def test_get_current_user_without_token(client: AsyncClient):
     """Test that /me endpoint returns 403 without token"""
@@ -356,6 +376,120 @@ async def test_multiple_logins_different_tokens(client: AsyncClient):
     assert response.status_code == 200
 
 
+# ============================================================================
+# Refresh Token Tests
+# ============================================================================
+
+async def _login_with_refresh(client: AsyncClient) -> dict:
+    await client.post(
+        "/api/auth/register",
+        json={"email": "user@example.com", "password": "Password123", "full_name": "User"}
+    )
+    response = await client.post(
+        "/api/auth/login",
+        data={"username": "user@example.com", "password": "Password123"}
+    )
+    return response.json()
+
+
+@pytest.mark.asyncio
+async def test_login_returns_refresh_token(client: AsyncClient, db_session: AsyncSession):
+    """Test login issues a refresh token and stores only its hash"""
+    data = await _login_with_refresh(client)
+
+    assert data["refresh_token"]
+    assert data["refresh_expires_in"] == 7 * 24 * 3600
+
+    from sqlalchemy import select
+    result = await db_session.execute(select(RefreshToken))
+    stored = result.scalars().all()
+    assert len(stored) == 1
+    assert stored[0].token_hash != data["refresh_token"]
+
+
+@pytest.mark.asyncio
+async def test_refresh_rotates_token(client: AsyncClient):
+    """Test refresh returns a working access token and a new refresh token"""
+    data = await _login_with_refresh(client)
+
+    response = await client.post(
+        "/api/auth/refresh", json={"refresh_token": data["refresh_token"]}
+    )
+
+    assert response.status_code == 200
+    refreshed = response.json()
+    assert refreshed["refresh_token"] != data["refresh_token"]
+
+    response = await client.get(
+        "/api/auth/me", headers={"Authorization": f"Bearer {refreshed['access_token']}"}
+    )
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_refresh_token_reuse_revokes_family(client: AsyncClient):
+    """Test reusing a rotated refresh token revokes its replacement too"""
+    data = await _login_with_refresh(client)
+    response = await client.post(
+        "/api/auth/refresh", json={"refresh_token": data["refresh_token"]}
+    )
+    rotated = response.json()["refresh_token"]
+
+    # Replay the old token
+    response = await client.post(
+        "/api/auth/refresh", json={"refresh_token": data["refresh_token"]}
+    )
+    assert response.status_code == 401
+
+    # The token issued by the first rotation is now revoked as well
+    response = await client.post("/api/auth/refresh", json={"refresh_token": rotated})
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_refresh_fails_after_logout(client: AsyncClient):
+    """Test logout revokes the session's refresh token family"""
+    data = await _login_with_refresh(client)
+    headers = {"Authorization": f"Bearer {data['access_token']}"}
+
+    response = await client.post(
+        "/api/auth/logout", headers=headers, json={"refresh_token": data["refresh_token"]}
+    )
+    assert response.status_code == 204
+
+    response = await client.post(
+        "/api/auth/refresh", json={"refresh_token": data["refresh_token"]}
+    )
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_logout_without_refresh_token_revokes_all_sessions(client: AsyncClient):
+    """Test logout with no body revokes every refresh token of the user"""
+    data = await _login_with_refresh(client)
+    other = (await client.post(
+        "/api/auth/login",
+        data={"username": "user@example.com", "password": "Password123"}
+    )).json()
+
+    response = await client.post(
+        "/api/auth/logout", headers={"Authorization": f"Bearer {data['access_token']}"}
+    )
+    assert response.status_code == 204
+
+    for refresh_token in (data["refresh_token"], other["refresh_token"]):
+        response = await client.post("/api/auth/refresh", json={"refresh_token": refresh_token})
+        assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_refresh_with_unknown_token(client: AsyncClient):
+    """Test refresh with an unknown token returns 401"""
+    response = await client.post("/api/auth/refresh", json={"refresh_token": "not-a-token"})
+
+    assert response.status_code == 401
+
+
 # ============================================================================
 # Password Security Tests
 # ============================================================================
@@ -508,7 +642,7 @@ async def test_register_empty_full_name(client: AsyncClient):
 
 @pytest.mark.asyncio
 async def test_login_case_sensitive_email(client: AsyncClient):
-    """Test that email login is case-insensitive (depends on DB collation)"""
+    """Test that email login is case-sensitive (users.email is a plain String column)"""
     # Register with lowercase
     await client.post(
         "/api/auth/register",
@@ -528,6 +662,7 @@ async def test_login_case_sensitive_email(client: AsyncClient):
         }
     )
 
-    # This test documents current behavior
-    # Note: Most databases treat emails as case-insensitive by default
-    # If this fails, consider normalizing emails to lowercase in the service layer
+    # This test documents current behavior: emails are matched exactly
+    # If this changes, consider normalizing emails to lowercase in the service layer
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Incorrect email or password"
@@ -42,3 +42,22 @@ async def test_get_field_not_found(client: AsyncClient, auth_headers: dict):
     response = await client.get("/api/fields/fld_nonexistent", headers=auth_headers)
 
     assert response.status_code == 404
+
+@pytest.mark.asyncio
+async def test_list_fields_conditional_get(client: AsyncClient, auth_headers: dict):
+    """Test If-None-Match returns 304 until the field library changes"""
+    await client.post("/api/fields", headers=auth_headers, json={"name": "email", "label": "Email", "type": "email"})
+
+    response = await client.get("/api/fields", headers=auth_headers)
+    etag = response.headers["etag"]
+    assert etag.startswith('W/"')
+
+    response = await client.get("/api/fields", headers={**auth_headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+    # Creating a field changes the ETag
+    await client.post("/api/fields", headers=auth_headers, json={"name": "phone", "label": "Phone", "type": "phone"})
+    response = await client.get("/api/fields", headers={**auth_headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
@@ -1,7 +1,12 @@
 """Integration tests for Record endpoints (JSONB)"""
+import asyncio
+
+import msgpack
 import pytest
 from httpx import AsyncClient
 
+from app.routers import records as records_router
+
 @pytest.mark.asyncio
 async def test_create_and_get_record(client: AsyncClient, auth_headers: dict):
     """Test creating record with JSONB data and retrieving it"""
@@ -76,3 +81,151 @@ async def test_list_records_with_pagination(client: AsyncClient, auth_headers: d
     assert data["page"] == 1
     assert data["page_size"] == 3
     assert len(data["records"]) == 3
+
+
+@pytest.mark.asyncio
+async def test_list_records_query_budget(client: AsyncClient, auth_headers: dict, query_budget):
+    """Test a record page costs one count and one page query, whatever its size"""
+    obj_response = await client.post(
+        "/api/objects",
+        headers=auth_headers,
+        json={"name": "contact", "label": "Contact", "plural_name": "Contacts"}
+    )
+    assert obj_response.status_code == 201
+    object_id = obj_response.json()["id"]
+    await client.post(
+        "/api/records/bulk",
+        headers=auth_headers,
+        json={"object_id": object_id, "records": [{"fld_name": f"User {i}"} for i in range(20)]}
+    )
+
+    with query_budget(2):
+        response = await client.get(
+            f"/api/records?object_id={object_id}&page_size=20",
+            headers=auth_headers
+        )
+
+    assert response.status_code == 200
+    assert len(response.json()["records"]) == 20
+
+
+@pytest.mark.asyncio
+async def test_list_records_streams_large_pages(client: AsyncClient, auth_headers: dict):
+    """Test pages above the stream threshold are streamed as one JSON document"""
+    obj_response = await client.post(
+        "/api/objects",
+        headers=auth_headers,
+        json={"name": "contact", "label": "Contact", "plural_name": "Contacts"}
+    )
+    assert obj_response.status_code == 201
+    object_id = obj_response.json()["id"]
+    await client.post(
+        "/api/records/bulk",
+        headers=auth_headers,
+        json={"object_id": object_id, "records": [{"fld_name": f"User {i}"} for i in range(150)]}
+    )
+
+    response = await client.get(
+        f"/api/records?object_id={object_id}&page=1&page_size=120",
+        headers=auth_headers
+    )
+
+    assert response.status_code == 200
+    assert "etag" not in response.headers
+    data = response.json()
+    assert data["total"] == 150
+    assert data["page_size"] == 120
+    assert len(data["records"]) == 120
+
+
+@pytest.mark.asyncio
+async def test_too_many_streams_are_refused(client: AsyncClient, auth_headers: dict, monkeypatch):
+    """Test streams beyond the per-worker cap get 503 instead of waiting on the pool"""
+    monkeypatch.setattr(records_router, "_stream_slots", asyncio.Semaphore(0))
+
+    response = await client.get(
+        "/api/records?object_id=obj_contact&page_size=120",
+        headers=auth_headers
+    )
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+
+
+@pytest.mark.asyncio
+async def test_records_in_msgpack(client: AsyncClient, auth_headers: dict):
+    """Test MessagePack request bodies and negotiated MessagePack responses"""
+    obj_response = await client.post(
+        "/api/objects",
+        headers=auth_headers,
+        json={"name": "contact", "label": "Contact", "plural_name": "Contacts"}
+    )
+    assert obj_response.status_code == 201
+    object_id = obj_response.json()["id"]
+    msgpack_headers = {
+        **auth_headers,
+        "Content-Type": "application/msgpack",
+        "Accept": "application/msgpack",
+    }
+
+    create_response = await client.post(
+        "/api/records/bulk",
+        headers=msgpack_headers,
+        content=msgpack.packb(
+            {"object_id": object_id, "records": [{"fld_name": f"User {i}"} for i in range(3)]}
+        ),
+    )
+    assert create_response.status_code == 201
+    assert create_response.headers["content-type"] == "application/msgpack"
+    assert len(msgpack.unpackb(create_response.content)) == 3
+
+    list_response = await client.get(
+        f"/api/records?object_id={object_id}", headers=msgpack_headers
+    )
+    json_response = await client.get(f"/api/records?object_id={object_id}", headers=auth_headers)
+
+    assert list_response.headers["content-type"] == "application/msgpack"
+    assert "Accept" in list_response.headers["vary"]
+    assert msgpack.unpackb(list_response.content) == json_response.json()
+    assert list_response.headers["etag"] != json_response.headers["etag"]
+    assert json_response.headers["content-type"] == "application/json"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("value", [float("nan"), "NaN", float("inf"), "Infinity"])
+async def test_non_finite_numbers_are_rejected(client: AsyncClient, auth_headers: dict, value):
+    """Test NaN and Infinity are 422s on create and bulk create, not server errors"""
+    obj_response = await client.post(
+        "/api/objects",
+        headers=auth_headers,
+        json={"name": "deal", "label": "Deal", "plural_name": "Deals"}
+    )
+    assert obj_response.status_code == 201
+    object_id = obj_response.json()["id"]
+    field_response = await client.post(
+        "/api/fields",
+        headers=auth_headers,
+        json={"name": "amount", "label": "Amount", "type": "number", "config": {"min": 0}}
+    )
+    field_id = field_response.json()["id"]
+    await client.post(
+        "/api/object-fields",
+        headers=auth_headers,
+        json={"object_id": object_id, "field_id": field_id}
+    )
+
+    # httpx writes float NaN/Infinity as the bare JSON extensions Python's parser accepts
+    single = await client.post(
+        "/api/records",
+        headers=auth_headers,
+        json={"object_id": object_id, "data": {field_id: value}}
+    )
+    bulk = await client.post(
+        "/api/records/bulk",
+        headers=auth_headers,
+        json={"object_id": object_id, "records": [{field_id: 1}, {field_id: value}]}
+    )
+
+    assert single.status_code == 422
+    assert bulk.status_code == 422
+    assert bulk.json()["detail"][0]["loc"] == ["body", "records", 1, field_id]
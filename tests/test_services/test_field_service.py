@@ -36,3 +36,20 @@ async def test_get_user_fields(db_session, test_user_id):
 
     assert len(fields) == 2
     assert fields[0].name in ["email", "phone"]
+
+@pytest.mark.asyncio
+async def test_field_library_facets_refresh_after_create(db_session, test_user_id):
+    """Test cached field library facets are invalidated by field creation"""
+    field1_in = FieldCreate(name="email", label="Email", type="email", category="Contact Info")
+    await field_service.create_field(db_session, field1_in, user_id=test_user_id)
+
+    library = await field_service.get_field_library(db_session, test_user_id)
+    before = dict(library.categories)["Contact Info"]
+
+    field2_in = FieldCreate(name="phone", label="Phone", type="phone", category="Contact Info")
+    await field_service.create_field(db_session, field2_in, user_id=test_user_id)
+    await db_session.commit()  # Invalidations apply on commit
+
+    library = await field_service.get_field_library(db_session, test_user_id)
+    assert dict(library.categories)["Contact Info"] == before + 1
+    assert await field_service.count_fields(db_session, test_user_id) == library.total
@@ -0,0 +1,94 @@
+"""Unit tests for the write-behind last_login buffer"""
+import asyncio
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import User
+from app.services.last_login import LastLoginBuffer
+
+def test_record_keeps_latest_login():
+    """Test repeated logins by one user collapse into the latest timestamp"""
+    buffer = LastLoginBuffer(interval_seconds=60, max_pending=10)
+    user_id = uuid.uuid4()
+    now = datetime.now(UTC)
+
+    buffer.record(user_id, now)
+    buffer.record(user_id, now - timedelta(seconds=5))
+
+    assert buffer.stats()["pending"] == 1
+    assert buffer._pending[user_id] == now
+
+class FailingSession:
+    async def execute(self, _stmt):
+        raise ConnectionError("database unavailable")
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_batch_without_wakeup():
+    """Test a failed flush puts the batch back, doesn't trigger an immediate retry, and stays bounded"""
+    buffer = LastLoginBuffer(interval_seconds=60, max_pending=2, max_buffered=3)
+    now = datetime.now(UTC)
+    users = [uuid.uuid4() for _ in range(3)]
+    for user_id in users:
+        buffer.record(user_id, now)
+    buffer._wakeup.clear()
+
+    with pytest.raises(ConnectionError):
+        await buffer.flush(FailingSession())
+
+    assert buffer.stats()["pending"] == 3
+    assert not buffer._wakeup.is_set()
+
+    buffer.record(uuid.uuid4(), now)
+    buffer.record(users[0], now + timedelta(seconds=1))
+
+    assert buffer.stats()["pending"] == 3
+    assert buffer.stats()["dropped"] == 1
+    assert buffer._pending[users[0]] == now + timedelta(seconds=1)
+
+@pytest.mark.asyncio
+async def test_loop_backs_off_after_failure(monkeypatch):
+    """Test the background loop sleeps after a failed flush instead of spinning"""
+    buffer = LastLoginBuffer(interval_seconds=30, max_pending=1)
+    sleeps = []
+
+    async def failing_run():
+        buffer._wakeup.set()  # As if the batch went back over max_pending
+        raise ConnectionError("database unavailable")
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+        raise asyncio.CancelledError
+
+    monkeypatch.setattr(buffer, "run_once", failing_run)
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+    buffer._wakeup.set()
+
+    with pytest.raises(asyncio.CancelledError):
+        await buffer._run_forever()
+
+    assert sleeps == [30]
+    assert buffer.stats()["errors"] == 1
+
+@pytest.mark.asyncio
+async def test_flush_writes_batch(db_session: AsyncSession):
+    """Test a flush updates every buffered user in one statement"""
+    users = [
+        User(email=f"user{i}@example.com", hashed_password="x", full_name=f"User {i}")
+        for i in range(3)
+    ]
+    db_session.add_all(users)
+    await db_session.flush()
+
+    buffer = LastLoginBuffer(interval_seconds=60, max_pending=10)
+    now = datetime.now(UTC)
+    for user in users:
+        buffer.record(user.id, now)
+
+    assert await buffer.flush(db_session) == 3
+    assert buffer.stats()["pending"] == 0
+    for user in users:
+        await db_session.refresh(user)
+        assert user.last_login == now
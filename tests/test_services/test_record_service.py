@@ -1,5 +1,7 @@
 """Unit tests for Record Service (JSONB handling)"""
 import pytest
+from sqlalchemy import event
+from sqlalchemy.engine.default import CACHE_HIT
 from app.services import record_service, object_service
 from app.schemas import RecordCreate, ObjectCreate, RecordUpdate
 
@@ -54,3 +56,24 @@ async def test_update_record_merges_data(db_session, test_user_id):
     # Should merge, not replace
     assert updated.data["fld_name"] == "Ali Yılmaz"  # Still exists!
     assert updated.data["fld_email"] == "newemail@example.com"  # Updated
+
+@pytest.mark.asyncio
+async def test_get_records_by_object_reuses_compiled_sql(db_session, test_user_id):
+    """Test the record list queries hit the compiled SQL cache on later calls"""
+    object_in = ObjectCreate(name="contact", label="Contact", plural_name="Contacts")
+    obj = await object_service.create_object(db_session, object_in, user_id=test_user_id)
+    await record_service.get_records_by_object(db_session, obj.id)
+
+    cache_hits = []
+
+    def record_cache_hit(conn, cursor, statement, parameters, context, executemany):
+        cache_hits.append(context.cache_hit is CACHE_HIT)
+
+    sync_engine = db_session.bind.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", record_cache_hit)
+    try:
+        await record_service.get_records_by_object(db_session, obj.id, skip=10, limit=5)
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", record_cache_hit)
+
+    assert cache_hits == [True, True]
@@ -0,0 +1,99 @@
+"""Unit tests for compiled record validators"""
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.record_validator import RecordValidationError, compile_validator
+
+def make_row(field_id, field_type, config=None, is_required=False, overrides=None):
+    """(ObjectField, Field) pair as returned by the validator query"""
+    field = SimpleNamespace(id=field_id, label=field_id, type=field_type, config=config or {})
+    object_field = SimpleNamespace(is_required=is_required, field_overrides=overrides or {})
+    return object_field, field
+
+def test_required_field_missing():
+    """Test required fields must be present on create"""
+    validator = compile_validator([make_row("fld_name", "text", is_required=True)])
+
+    with pytest.raises(RecordValidationError) as exc_info:
+        validator.validate({"fld_other": "x"})
+
+    assert exc_info.value.errors[0]["loc"] == ["body", "data", "fld_name"]
+    # Partial updates only check provided keys
+    assert validator.validate({"fld_other": "x"}, partial=True) == {"fld_other": "x"}
+
+def test_number_coercion_and_bounds():
+    """Test numeric strings are coerced and min/max enforced"""
+    validator = compile_validator([make_row("fld_amount", "currency", {"min": 0, "decimals": 2})])
+
+    assert validator.validate({"fld_amount": "12.50"}) == {"fld_amount": 12.5}
+    with pytest.raises(RecordValidationError):
+        validator.validate({"fld_amount": -1})
+    with pytest.raises(RecordValidationError):
+        validator.validate({"fld_amount": 1.234})
+
+@pytest.mark.parametrize("value", ["NaN", "Infinity", "-inf", float("nan"), float("inf")])
+@pytest.mark.parametrize("config", [{}, {"min": 0, "max": 100}])
+def test_number_rejects_non_finite(value, config):
+    """Test NaN and Infinity are validation errors, with or without bounds"""
+    validator = compile_validator([make_row("fld_amount", "number", config)])
+
+    with pytest.raises(RecordValidationError) as exc_info:
+        validator.validate({"fld_amount": value})
+
+    assert exc_info.value.errors[0]["msg"].endswith("must be a number")
+
+@pytest.mark.parametrize("value", ["1e99999999", "1e5000", "-1e5000", 10 ** 400])
+def test_number_rejects_huge_exponents(value):
+    """Test numbers beyond float range are rejected before conversion"""
+    validator = compile_validator([make_row("fld_amount", "number")])
+
+    with pytest.raises(RecordValidationError) as exc_info:
+        validator.validate({"fld_amount": value})
+
+    assert exc_info.value.errors[0]["msg"].endswith("is out of range")
+
+def test_number_bounds_from_string_config():
+    """Test string min/max/decimals in field config are compared as numbers"""
+    validator = compile_validator([
+        make_row("fld_amount", "number", {"min": "0", "max": "100.5", "decimals": "1"})
+    ])
+
+    assert validator.validate({"fld_amount": "100.5"}) == {"fld_amount": 100.5}
+    with pytest.raises(RecordValidationError) as exc_info:
+        validator.validate({"fld_amount": 101})
+    assert exc_info.value.errors[0]["msg"].endswith("must be <= 100.5")
+
+def test_email_pattern_and_nested_validation_config():
+    """Test regex from {"validation": {...}} config and default email pattern"""
+    validator = compile_validator([
+        make_row("fld_email", "email"),
+        make_row("fld_code", "text", {"validation": {"regex": "[A-Z]{3}"}}),
+    ])
+
+    assert validator.validate({"fld_email": "ali@example.com", "fld_code": "ABC"})
+    with pytest.raises(RecordValidationError) as exc_info:
+        validator.validate({"fld_email": "not-an-email", "fld_code": "abc"})
+    assert len(exc_info.value.errors) == 2
+
+def test_select_uses_object_overrides():
+    """Test per-object field_overrides replace field config options"""
+    row = make_row(
+        "fld_status", "select",
+        {"options": [{"value": "new"}]},
+        overrides={"options": [{"value": "open"}]},
+    )
+    validator = compile_validator([row])
+
+    assert validator.validate({"fld_status": "open"}) == {"fld_status": "open"}
+    with pytest.raises(RecordValidationError):
+        validator.validate({"fld_status": "new"})
+
+def test_validate_many_reports_record_index():
+    """Test batch mode collects errors for every record"""
+    validator = compile_validator([make_row("fld_done", "boolean")])
+
+    assert validator.validate_many([{"fld_done": "true"}]) == [{"fld_done": True}]
+    with pytest.raises(RecordValidationError) as exc_info:
+        validator.validate_many([{"fld_done": True}, {"fld_done": "maybe"}])
+    assert exc_info.value.errors[0]["loc"] == ["body", "records", 1, "fld_done"]
@@ -0,0 +1,73 @@
+"""Unit tests for the in-memory revoked token set"""
+import time
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from app.services.revocation import RevokedTokenSet, revocation_key
+from app.utils.invalidation import InvalidationBus
+
+def test_contains_revoked_until_expiry():
+    """Test revoked JTIs are found until their token expires"""
+    revoked = RevokedTokenSet()
+    revoked.add("jti-active", time.time() + 60)
+    revoked.add("jti-expired", time.time() - 1)
+
+    assert revoked.contains("jti-active") is True
+    assert revoked.contains("jti-expired") is False
+    assert revoked.contains("jti-unknown") is False
+
+def test_prune_drops_expired_entries():
+    """Test pruning keeps memory bounded by unexpired revocations"""
+    revoked = RevokedTokenSet()
+    revoked.add("jti-active", time.time() + 60)
+    revoked.add("jti-expired", time.time() - 1)
+
+    revoked.prune()
+
+    assert revoked.stats()["size"] == 1
+
+def test_bus_key_round_trip():
+    """Test revocations published on the bus are applied with their expiry"""
+    revoked = RevokedTokenSet()
+    expires_at = datetime.now(UTC) + timedelta(minutes=5)
+
+    revoked._on_revoked(revocation_key("jti-1", expires_at))
+
+    assert revoked.contains("jti-1") is True
+
+class FakeResult:
+    def all(self):
+        return []
+
+class FakeSession:
+    async def execute(self, _stmt):
+        return FakeResult()
+
+@pytest.mark.asyncio
+async def test_not_loaded_unless_bus_is_listening():
+    """Test a disabled or disconnected bus keeps checks on the database"""
+    bus = InvalidationBus(dsn="postgresql://localhost/test", channel="test", enabled=False)
+    revoked = RevokedTokenSet(bus)
+
+    await revoked.load(FakeSession())
+    assert revoked.loaded is False
+
+    bus.listening = True
+    await revoked.load(FakeSession())
+    assert revoked.loaded is True
+
+@pytest.mark.asyncio
+async def test_disconnect_invalidates():
+    """Test losing the listener connection distrusts the set"""
+    bus = InvalidationBus(dsn="postgresql://localhost/test", channel="test", enabled=False)
+    revoked = RevokedTokenSet(bus)
+    bus.on_disconnect(revoked.invalidate)
+    bus.listening = True
+    await revoked.load(FakeSession())
+
+    bus.listening = False
+    for handler in bus._disconnect_handlers:
+        handler()
+
+    assert revoked.loaded is False
@@ -0,0 +1,93 @@
+"""Tests for the expired token_blacklist reaper"""
+import asyncio
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import TokenBlacklist
+from app.services.token_blacklist_reaper import TokenBlacklistReaper
+
+def blacklist_rows(count: int, expires_at: datetime) -> list[TokenBlacklist]:
+    return [
+        TokenBlacklist(jti=str(uuid.uuid4()), user_id=uuid.uuid4(), expires_at=expires_at)
+        for _ in range(count)
+    ]
+
+async def remaining(db: AsyncSession, rows: list[TokenBlacklist]) -> set[str]:
+    result = await db.execute(
+        select(TokenBlacklist.jti).where(TokenBlacklist.jti.in_([row.jti for row in rows]))
+    )
+    return set(result.scalars().all())
+
+@pytest.mark.asyncio
+async def test_purge_deletes_only_expired_rows(db_session: AsyncSession):
+    """Test expired rows are deleted and unexpired revocations are kept"""
+    now = datetime.now(UTC)
+    expired = blacklist_rows(3, now - timedelta(minutes=1))
+    active = blacklist_rows(2, now + timedelta(hours=1))
+    db_session.add_all(expired + active)
+    await db_session.flush()
+
+    reaper = TokenBlacklistReaper(interval_seconds=60, batch_size=100)
+    purged = await reaper.purge_expired(db_session)
+
+    assert purged >= 3
+    assert await remaining(db_session, expired) == set()
+    assert await remaining(db_session, active) == {row.jti for row in active}
+
+@pytest.mark.asyncio
+async def test_purge_works_in_batches(db_session: AsyncSession, query_budget):
+    """Test a backlog larger than the batch size is drained with several deletes"""
+    expired = blacklist_rows(5, datetime.now(UTC) - timedelta(minutes=1))
+    db_session.add_all(expired)
+    await db_session.flush()
+
+    reaper = TokenBlacklistReaper(interval_seconds=60, batch_size=2)
+    with query_budget(100) as statements:
+        await reaper.purge_expired(db_session)
+
+    deletes = [statement for statement in statements if statement.startswith("DELETE")]
+    assert len(deletes) >= 3
+    assert await remaining(db_session, expired) == set()
+
+@pytest.mark.asyncio
+async def test_collect_stats_reports_backlog(db_session: AsyncSession):
+    """Test stats count table rows and rows waiting to be purged"""
+    now = datetime.now(UTC)
+    db_session.add_all(
+        blacklist_rows(2, now - timedelta(minutes=1)) + blacklist_rows(1, now + timedelta(hours=1))
+    )
+    await db_session.flush()
+
+    reaper = TokenBlacklistReaper(interval_seconds=60, batch_size=100)
+    await reaper.collect_stats(db_session)
+    stats = reaper.stats()
+
+    assert stats["table_rows"] >= 3
+    assert stats["backlog"] >= 2
+    assert stats["table_bytes"] > 0
+
+@pytest.mark.asyncio
+async def test_stop_cancels_loop_and_failures_are_counted(monkeypatch):
+    """Test a failing run is counted without ending the loop, and stop cancels it"""
+    reaper = TokenBlacklistReaper(interval_seconds=0, batch_size=100)
+    runs = []
+
+    async def failing_run():
+        runs.append(True)
+        raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(reaper, "run_once", failing_run)
+
+    await reaper.start()
+    while len(runs) < 2:
+        await asyncio.sleep(0)
+    assert reaper.alive is True
+
+    await reaper.stop()
+
+    assert reaper.alive is False
+    assert reaper.stats()["errors"] >= 2
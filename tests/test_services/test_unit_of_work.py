@@ -0,0 +1,52 @@
+"""Tests for the per-request unit of work (get_db)"""
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from starlette.requests import Request
+
+from app.database import get_db
+from app.schemas import FieldCreate, FieldUpdate
+from app.services import field_service
+
+
+def _request(method: str) -> Request:
+    return Request({"type": "http", "method": method, "headers": []})
+
+
+@pytest.mark.asyncio
+async def test_services_flush_without_committing(db_session, test_user_id):
+    """Test service writes are left for the request to commit"""
+    async def no_commit():
+        raise AssertionError("services must not commit")
+
+    db_session.commit = no_commit
+
+    field = await field_service.create_field(
+        db_session, FieldCreate(name="email", label="Email", type="email"), user_id=test_user_id
+    )
+    updated = await field_service.update_field(db_session, field.id, FieldUpdate(label="E-mail"))
+    assert updated.label == "E-mail"
+    assert await field_service.delete(db_session, field.id) is True
+
+
+@pytest.mark.asyncio
+async def test_get_requests_are_read_only():
+    """Test GET sessions run in a READ ONLY transaction"""
+    sessions = get_db(_request("GET"))
+    session = await anext(sessions)
+
+    with pytest.raises(DBAPIError, match="read-only"):
+        await session.execute(text("UPDATE token_blacklist SET jti = jti WHERE false"))
+    await sessions.aclose()
+
+
+@pytest.mark.asyncio
+async def test_write_requests_without_changes_do_not_commit():
+    """Test a POST that only reads ends without a commit"""
+    sessions = get_db(_request("POST"))
+    session = await anext(sessions)
+    await session.execute(text("SELECT 1"))
+
+    assert session.info.get("wrote") is None
+    with pytest.raises(StopAsyncIteration):
+        await anext(sessions)
@@ -0,0 +1,80 @@
+"""Unit tests for in-process caches"""
+import time
+
+from app.services.metadata_cache import MetadataCache, object_scope
+from app.utils.cache import TTLCache
+
+def test_cache_hit_and_miss_stats():
+    """Test hits and misses are counted"""
+    cache = TTLCache("test", maxsize=10, ttl=60)
+    cache.set("a", 1)
+
+    assert cache.get("a") == 1
+    assert cache.get("missing") is None
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+
+def test_cache_evicts_least_recently_used():
+    """Test cache stays within maxsize and evicts LRU entry"""
+    cache = TTLCache("test", maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" is now least recently used
+    cache.set("c", 3)
+
+    assert len(cache) == 2
+    assert "a" in cache
+    assert "b" not in cache
+    assert cache.stats()["evictions"] == 1
+
+def test_cache_entry_expires():
+    """Test entries are dropped after their TTL"""
+    cache = TTLCache("test", maxsize=10, ttl=60)
+    cache.set("a", 1, ttl=0.01)
+    time.sleep(0.02)
+
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+def test_metadata_cache_bump_changes_key():
+    """Test bumping a scope makes previously cached entries unreachable"""
+    cache = MetadataCache(maxsize=10, ttl=60)
+    scopes = [object_scope("obj_contact")]
+
+    old_key = cache.key("object", "obj_contact", scopes=scopes)
+    cache.set(old_key, {"id": "obj_contact"})
+    cache.bump(object_scope("obj_contact"))
+    new_key = cache.key("object", "obj_contact", scopes=scopes)
+
+    assert new_key != old_key
+    assert cache.get(new_key) is None
+    assert cache.version(object_scope("obj_contact")) == 1
+
+def test_metadata_cache_versions_are_bounded():
+    """Test forgotten scopes read a newer version instead of an old one"""
+    cache = MetadataCache(maxsize=2, ttl=60)
+    old_key = cache.key("object", "obj_a", scopes=[object_scope("obj_a")])
+    cache.set(old_key, {"id": "obj_a"})
+    cache.bump(object_scope("obj_a"))
+    bumped_key = cache.key("object", "obj_a", scopes=[object_scope("obj_a")])
+    cache.set(bumped_key, {"id": "obj_a"})
+
+    cache.bump(object_scope("obj_b"), object_scope("obj_c"), object_scope("obj_d"))
+    key = cache.key("object", "obj_a", scopes=[object_scope("obj_a")])
+
+    assert len(cache._versions) == 2
+    assert key not in (old_key, bumped_key)
+    assert cache.get(key) is None
+
+def test_metadata_cache_clear_invalidates_all_scopes():
+    """Test clear moves bumped and never-bumped scopes to a new version"""
+    cache = MetadataCache(maxsize=10, ttl=60)
+    cache.bump(object_scope("obj_a"))
+    keys = [cache.key("object", scope, scopes=[object_scope(scope)]) for scope in ("obj_a", "obj_b")]
+
+    cache.clear()
+
+    assert all(cache.key("object", key[1], scopes=[object_scope(key[1])]) != key for key in keys)
@@ -0,0 +1,119 @@
+"""Tests for the response compression middleware"""
+import gzip
+
+import brotli
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.responses import JSONResponse, Response, StreamingResponse
+
+from app.middleware.compression import CompressionMiddleware, negotiate_encoding
+from app.utils.cache import TTLCache
+
+PAYLOAD = [{"id": f"fld_{i:08x}", "label": "Email Address", "type": "email"} for i in range(100)]
+
+
+@pytest.mark.parametrize("header,expected", [
+    ("gzip, deflate, br", "br"),
+    ("gzip", "gzip"),
+    ("br;q=0.5, gzip;q=0.9", "gzip"),
+    ("br;q=0, gzip;q=0", None),
+    ("*", "br"),
+    ("identity", None),
+    ("", None),
+])
+def test_negotiate_encoding(header, expected):
+    """Test the preferred supported coding is chosen, honouring q=0"""
+    assert negotiate_encoding(header) == expected
+
+
+def _client(endpoint, cache: TTLCache | None = None) -> AsyncClient:
+    app = CompressionMiddleware(endpoint, minimum_size=500, cache=cache)
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
+async def _raw_get(client: AsyncClient, path: str, encoding: str):
+    # httpx would transparently decode; read the raw bytes instead
+    request = client.build_request("GET", path, headers={"Accept-Encoding": encoding})
+    response = await client.send(request, stream=True)
+    body = b"".join([chunk async for chunk in response.aiter_raw()])
+    return response, body
+
+
+@pytest.mark.asyncio
+async def test_large_json_is_compressed():
+    """Test gzip and brotli bodies decode to the original JSON"""
+    async with _client(JSONResponse(PAYLOAD)) as client:
+        response, body = await _raw_get(client, "/", "gzip")
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert int(response.headers["content-length"]) == len(body)
+        assert gzip.decompress(body) == JSONResponse(PAYLOAD).body
+
+        response, body = await _raw_get(client, "/", "br")
+        assert response.headers["content-encoding"] == "br"
+        assert brotli.decompress(body) == JSONResponse(PAYLOAD).body
+
+
+@pytest.mark.asyncio
+async def test_small_and_binary_bodies_are_not_compressed():
+    """Test the size threshold and content-type allowlist"""
+    async with _client(JSONResponse({"ok": True})) as client:
+        response, _ = await _raw_get(client, "/", "gzip")
+        assert "content-encoding" not in response.headers
+
+    async with _client(Response(b"\x89PNG" * 1000, media_type="image/png")) as client:
+        response, _ = await _raw_get(client, "/", "gzip")
+        assert "content-encoding" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_uncompressed_responses_vary_on_accept_encoding():
+    """Test identity responses of compressible types still tell caches they vary"""
+    async with _client(JSONResponse(PAYLOAD)) as client:
+        response, body = await _raw_get(client, "/", "identity")
+        assert "content-encoding" not in response.headers
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert body == JSONResponse(PAYLOAD).body
+
+    async with _client(JSONResponse({"ok": True})) as client:
+        response, _ = await _raw_get(client, "/", "gzip")
+        assert response.headers["vary"] == "Accept-Encoding"
+
+    async with _client(Response(b"\x89PNG" * 1000, media_type="image/png")) as client:
+        response, _ = await _raw_get(client, "/", "identity")
+        assert "vary" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_streamed_body_is_compressed_chunk_by_chunk():
+    """Test streaming responses are compressed without a Content-Length"""
+    async def chunks():
+        yield b"["
+        yield b",".join(b'{"id":"rec_%d"}' % i for i in range(200))
+        yield b"]"
+
+    async with _client(StreamingResponse(chunks(), media_type="application/json")) as client:
+        response, body = await _raw_get(client, "/", "gzip")
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert gzip.decompress(body).startswith(b'[{"id":"rec_0"}')
+
+
+@pytest.mark.asyncio
+async def test_metadata_responses_are_compressed_once_per_etag():
+    """Test precompressed bytes are reused for the same URL and ETag"""
+    cache = TTLCache("test_compressed", maxsize=10, ttl=60)
+    endpoint = JSONResponse(PAYLOAD, headers={"ETag": 'W/"abc"'})
+
+    async with _client(endpoint, cache=cache) as client:
+        first, first_body = await _raw_get(client, "/api/fields", "br")
+        second, second_body = await _raw_get(client, "/api/fields", "br")
+        await _raw_get(client, "/api/records", "br")  # not a metadata route
+
+    assert first.headers["content-encoding"] == second.headers["content-encoding"] == "br"
+    assert first.headers["etag"] == second.headers["etag"] == 'W/"abc"'
+    assert first_body == second_body
+    assert brotli.decompress(second_body) == endpoint.body
+    assert cache.stats()["hits"] == 1
+    assert len(cache) == 1
@@ -0,0 +1,111 @@
+"""Unit tests for the cross-worker invalidation bus"""
+import asyncio
+import json
+
+import asyncpg
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.utils.invalidation import METADATA_TOPIC, InvalidationBus
+
+def make_bus() -> InvalidationBus:
+    return InvalidationBus(dsn="postgresql://localhost/test", channel="test", enabled=False)
+
+@pytest.mark.asyncio
+async def test_publish_applies_locally():
+    """Test publish without a session invalidates in the current worker immediately"""
+    bus = make_bus()
+    seen = []
+    bus.subscribe(METADATA_TOPIC, seen.append)
+
+    await bus.publish(None, METADATA_TOPIC, "fields", "object:obj_contact")
+
+    assert seen == ["fields", "object:obj_contact"]
+
+@pytest.mark.asyncio
+async def test_publish_applies_locally_after_commit():
+    """Test the publishing worker invalidates only once the transaction commits"""
+    bus = make_bus()
+    seen = []
+    bus.subscribe(METADATA_TOPIC, seen.append)
+    session = Session(create_engine("sqlite://"))
+    session.execute(text("SELECT 1"))
+
+    await bus.publish(session, METADATA_TOPIC, "fields")
+    assert seen == []
+
+    session.commit()
+    assert seen == ["fields"]
+
+@pytest.mark.asyncio
+async def test_rolled_back_publish_is_dropped():
+    """Test invalidations of a rolled back transaction are never applied"""
+    bus = make_bus()
+    seen = []
+    bus.subscribe(METADATA_TOPIC, seen.append)
+    session = Session(create_engine("sqlite://"))
+    session.execute(text("SELECT 1"))
+
+    await bus.publish(session, METADATA_TOPIC, "fields")
+    session.rollback()
+    session.execute(text("SELECT 1"))
+    session.commit()
+
+    assert seen == []
+
+def test_notification_dispatches_to_topic_handlers():
+    """Test NOTIFY payloads from other workers reach subscribers"""
+    bus = make_bus()
+    seen = []
+    bus.subscribe(METADATA_TOPIC, seen.append)
+    bus.subscribe("other", lambda key: pytest.fail("wrong topic"))
+
+    payload = json.dumps({"t": METADATA_TOPIC, "k": ["fields"]})
+    bus._on_notification(None, 1, "test", payload)
+
+    assert seen == ["fields"]
+    assert bus.stats()["received"] == 1
+
+def test_malformed_notification_is_ignored():
+    """Test garbage payloads don't raise inside the listener callback"""
+    bus = make_bus()
+    bus._on_notification(None, 1, "test", "not-json")
+
+    assert bus.stats()["received"] == 1
+
+def test_flush_calls_flush_handlers():
+    """Test a listener gap triggers a full flush"""
+    bus = make_bus()
+    flushed = []
+    bus.on_flush(lambda: flushed.append(True))
+
+    bus.flush()
+
+    assert flushed == [True]
+
+@pytest.mark.asyncio
+async def test_listener_survives_unexpected_errors(monkeypatch):
+    """Test errors like asyncpg.InterfaceError back off and reconnect instead of ending the task"""
+    bus = make_bus()
+    attempts = []
+
+    async def failing_listen():
+        attempts.append(len(attempts))
+        if len(attempts) == 1:
+            raise asyncpg.InterfaceError("connection is closed")
+        if len(attempts) == 2:
+            raise RuntimeError("unexpected")
+        raise asyncio.CancelledError
+
+    async def no_sleep(_delay):
+        return None
+
+    monkeypatch.setattr(bus, "_listen_once", failing_listen)
+    monkeypatch.setattr(asyncio, "sleep", no_sleep)
+
+    with pytest.raises(asyncio.CancelledError):
+        await bus._listen_forever()
+
+    assert len(attempts) == 3
+    assert bus.stats()["reconnects"] == 2
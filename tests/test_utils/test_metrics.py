@@ -0,0 +1,74 @@
+"""Tests for runtime metrics and the /metrics endpoint"""
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.responses import PlainTextResponse
+
+from app.config import settings
+from app.main import app
+from app.middleware.metrics import MetricsMiddleware
+from app.utils.metrics import Histogram, Metrics, RequestStats, current_request
+
+
+def test_histogram_buckets():
+    """Test observations land in the first bucket whose bound they don't exceed"""
+    histogram = Histogram((0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value)
+
+    assert histogram.counts == [2, 1, 1]
+    assert histogram.count == 4
+    assert histogram.sum == pytest.approx(3.65)
+
+
+def test_render_request_series():
+    """Test request counters, errors and cumulative histogram buckets are rendered"""
+    registry = Metrics()
+    registry.observe_request("GET", "/api/records/{record_id}", 200, 0.02, RequestStats(3, 0.004))
+    registry.observe_request("GET", "/api/records/{record_id}", 500, 0.3, RequestStats(1, 0.001))
+
+    text = registry.render(caches=[{"name": "metadata", "hits": 9, "misses": 1,
+                                    "evictions": 0, "size": 4, "hit_rate": 0.9}])
+
+    labels = 'method="GET",route="/api/records/{record_id}"'
+    assert f'canvas_http_requests_total{{{labels},status="200"}} 1' in text
+    assert f"canvas_http_errors_total{{{labels}}} 1" in text
+    assert f'canvas_http_request_duration_seconds_bucket{{{labels},le="0.025"}} 1' in text
+    assert f'canvas_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+    assert f"canvas_db_statements_per_request_sum{{{labels}}} 4" in text
+    assert 'canvas_cache_hit_ratio{cache="metadata"} 0.9' in text
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_reports_routes():
+    """Test requests are labelled by route template and exposed at /metrics"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        await ac.get("/api/health")
+        await ac.get("/no/such/path")
+        response = await ac.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'canvas_http_requests_total{method="GET",route="/api/health",status="200"}' in response.text
+    assert 'route="unmatched",status="404"' in response.text
+    assert 'canvas_db_pool_checked_out{pool="primary"}' in response.text
+
+
+@pytest.mark.asyncio
+async def test_repeated_statement_warning_and_debug_headers(monkeypatch, caplog):
+    """Test one statement run more than the threshold is logged as a possible N+1"""
+    async def endpoint(scope, receive, send):
+        stats = current_request.get()
+        for _ in range(4):
+            stats.statements += 1
+            stats.shapes["SELECT objects.id FROM objects WHERE objects.id = $1"] = stats.statements
+        await PlainTextResponse("ok")(scope, receive, send)
+
+    monkeypatch.setattr(settings, "DEBUG", True)
+    monkeypatch.setattr(settings, "DB_REPEATED_STATEMENT_WARNING", 3)
+    transport = ASGITransport(app=MetricsMiddleware(endpoint))
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.get("/anything")
+
+    assert response.headers["x-db-statements"] == "4"
+    assert "Possible N+1" in caplog.text
+    assert "4 times" in caplog.text
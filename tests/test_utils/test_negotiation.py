@@ -0,0 +1,110 @@
+"""Tests for MessagePack content negotiation"""
+import uuid
+from datetime import UTC, datetime
+
+import msgpack
+import pytest
+from fastapi import APIRouter, FastAPI
+from httpx import ASGITransport, AsyncClient
+from pydantic import BaseModel
+
+from app.utils.negotiation import (
+    JSON,
+    MSGPACK,
+    NegotiatedResponse,
+    NegotiatedRoute,
+    packb,
+    preferred_format,
+)
+
+
+@pytest.mark.parametrize("accept,expected", [
+    ("application/msgpack", MSGPACK),
+    ("application/x-msgpack", MSGPACK),
+    ("application/msgpack, application/json;q=0.5", MSGPACK),
+    ("application/json, application/msgpack;q=0.9", JSON),
+    ("application/msgpack;q=0.5, */*", JSON),
+    ("*/*", JSON),
+    ("", JSON),
+    (None, JSON),
+])
+def test_preferred_format(accept, expected):
+    """Test MessagePack is used only when ranked above JSON"""
+    assert preferred_format(accept) == expected
+
+
+def test_packb_encodes_like_json():
+    """Test datetimes and UUIDs become the strings JSON responses carry"""
+    payload = {"at": datetime(2024, 5, 1, 12, tzinfo=UTC), "by": uuid.UUID(int=1)}
+
+    assert msgpack.unpackb(packb(payload)) == {
+        "at": "2024-05-01T12:00:00Z",
+        "by": "00000000-0000-0000-0000-000000000001",
+    }
+
+
+class Item(BaseModel):
+    name: str
+    count: int
+
+
+def _client() -> AsyncClient:
+    router = APIRouter(route_class=NegotiatedRoute, default_response_class=NegotiatedResponse)
+
+    @router.post("/items", response_model=Item)
+    async def echo(item: Item):
+        return item
+
+    app = FastAPI()
+    app.include_router(router)
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
+@pytest.mark.asyncio
+async def test_msgpack_body_and_response():
+    """Test a MessagePack body is validated like JSON and answered in kind"""
+    async with _client() as client:
+        response = await client.post(
+            "/items",
+            content=packb({"name": "a", "count": 2}),
+            headers={"Content-Type": MSGPACK, "Accept": MSGPACK},
+        )
+        invalid = await client.post(
+            "/items", content=packb({"name": "a"}), headers={"Content-Type": MSGPACK}
+        )
+        garbage = await client.post("/items", content=b"\xc1", headers={"Content-Type": MSGPACK})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == MSGPACK
+    assert response.headers["vary"] == "Accept"
+    assert msgpack.unpackb(response.content) == {"name": "a", "count": 2}
+    assert invalid.status_code == 422
+    assert invalid.json()["detail"][0]["loc"] == ["body", "count"]
+    assert garbage.status_code == 400
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("body", [
+    msgpack.packb({"name": b"raw", "count": 2}, use_bin_type=True),
+    msgpack.packb({"name": "a", "count": float("nan")}),
+    msgpack.packb({"name": "a", "count": float("inf")}),
+    msgpack.packb({"name": "a", "count": msgpack.ExtType(42, b"x")}),
+    msgpack.packb({"name": "a", "count": msgpack.Timestamp(0)}),
+    msgpack.packb({"name": "a", "count": 2, 1: "int key"}),
+])
+async def test_msgpack_body_rejects_non_json_values(body):
+    """Test bin, extension types, non-string keys and NaN/Infinity never reach validation"""
+    async with _client() as client:
+        response = await client.post("/items", content=body, headers={"Content-Type": MSGPACK})
+
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_json_stays_default():
+    """Test requests without MessagePack headers are unaffected"""
+    async with _client() as client:
+        response = await client.post("/items", json={"name": "a", "count": 2})
+
+    assert response.headers["content-type"] == JSON
+    assert response.json() == {"name": "a", "count": 2}
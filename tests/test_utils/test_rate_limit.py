@@ -0,0 +1,86 @@
+"""Unit tests for the shared-memory token bucket rate limiter"""
+import os
+
+import pytest
+from starlette.requests import Request
+
+from app.utils import rate_limit
+from app.utils.rate_limit import WAYS, SharedTokenBuckets, data_rate_limit
+
+def test_bucket_allows_burst_then_limits():
+    """Test a bucket allows `capacity` requests and then asks the client to retry"""
+    buckets = SharedTokenBuckets(None, slots=64)
+
+    results = [buckets.acquire("login:1.2.3.4", rate=1, capacity=3) for _ in range(4)]
+
+    assert results[:3] == [0, 0, 0]
+    assert 0 < results[3] <= 1
+    assert buckets.stats()["limited"] == 1
+
+def test_keys_have_separate_buckets():
+    """Test limits are tracked per key"""
+    buckets = SharedTokenBuckets(None, slots=64)
+
+    assert buckets.acquire("login:1.2.3.4", rate=1, capacity=1) == 0
+    assert buckets.acquire("login:5.6.7.8", rate=1, capacity=1) == 0
+    assert buckets.acquire("login:1.2.3.4", rate=1, capacity=1) > 0
+
+def test_buckets_are_shared_through_the_file(tmp_path):
+    """Test two mappings of the same file (two workers) share one bucket"""
+    path = str(tmp_path / "buckets")
+    worker_a = SharedTokenBuckets(path, slots=64)
+    worker_b = SharedTokenBuckets(path, slots=64)
+
+    assert worker_a.acquire("login:1.2.3.4", rate=1, capacity=2) == 0
+    assert worker_b.acquire("login:1.2.3.4", rate=1, capacity=2) == 0
+    assert worker_a.acquire("login:1.2.3.4", rate=1, capacity=2) > 0
+
+def test_symlinked_table_file_is_refused(tmp_path):
+    """Test a planted symlink cannot redirect writes to another file"""
+    target = tmp_path / "target"
+    target.write_bytes(b"")
+    path = tmp_path / "buckets"
+    path.symlink_to(target)
+
+    with pytest.raises(OSError):
+        SharedTokenBuckets(str(path), slots=64)
+
+def test_shared_table_file_is_refused(tmp_path):
+    """Test a table file other users can write to is not mapped"""
+    path = tmp_path / "buckets"
+    path.write_bytes(b"")
+    os.chmod(path, 0o666)
+
+    with pytest.raises(OSError):
+        SharedTokenBuckets(str(path), slots=64)
+
+def test_full_set_evicts_least_recently_used():
+    """Test memory stays fixed: a full table evicts instead of growing"""
+    buckets = SharedTokenBuckets(None, slots=WAYS)  # A single set
+
+    for i in range(WAYS + 1):
+        buckets.acquire(f"key:{i}", rate=1, capacity=1)
+
+    assert buckets.stats()["evictions"] == 1
+    # key:0 was evicted, so it starts again with a full bucket
+    assert buckets.acquire("key:0", rate=1, capacity=1) == 0
+
+def test_clear_resets_buckets():
+    """Test clear() refills every bucket"""
+    buckets = SharedTokenBuckets(None, slots=64)
+    buckets.acquire("login:1.2.3.4", rate=1, capacity=1)
+
+    buckets.clear()
+
+    assert buckets.acquire("login:1.2.3.4", rate=1, capacity=1) == 0
+
+@pytest.mark.asyncio
+async def test_unverified_api_key_is_limited_per_ip(monkeypatch):
+    """Test made-up API keys cannot mint fresh buckets: they share the client IP's"""
+    enforced = []
+    monkeypatch.setattr(rate_limit, "_enforce", lambda key, per_minute: enforced.append(key))
+    request = Request({"type": "http", "client": ("1.2.3.4", 1234), "headers": []})
+
+    await data_rate_limit(request, user_id=None, api_key="cvk_abcdefgh_secret")
+
+    assert enforced == ["data:ip:1.2.3.4"]
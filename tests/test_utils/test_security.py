@@ -5,6 +5,10 @@ from app.utils.security import (
     verify_password,
     create_access_token,
     decode_access_token,
+    forget_token,
+    token_cache_stats,
+    PasswordHasher,
+    PasswordHasherBusy,
 )
 
 def test_password_hashing():
@@ -40,3 +44,46 @@ def test_jwt_invalid_token():
     """Test JWT decoding with invalid token"""
     decoded = decode_access_token("invalid_token")
     assert decoded is None
+
+@pytest.mark.asyncio
+async def test_password_pool_hash_and_verify():
+    """Test hashing and verification run on the password pool"""
+    hasher = PasswordHasher(max_workers=2, max_pending=4, timeout=10)
+
+    hashed = await hasher.hash("MySecurePassword123")
+
+    assert await hasher.verify("MySecurePassword123", hashed) is True
+    assert await hasher.verify("WrongPassword", hashed) is False
+    assert hasher.stats()["pending"] == 0
+
+@pytest.mark.asyncio
+async def test_password_pool_rejects_when_saturated():
+    """Test work beyond max_pending is rejected instead of queued"""
+    hasher = PasswordHasher(max_workers=1, max_pending=0, timeout=10)
+
+    with pytest.raises(PasswordHasherBusy):
+        await hasher.hash("MySecurePassword123")
+
+    assert hasher.stats()["rejected"] == 1
+
+def test_jwt_decode_is_cached():
+    """Test repeated decodes of the same token hit the verified token cache"""
+    token = create_access_token({"sub": "user_123", "jti": "jti_cached"})
+
+    first = decode_access_token(token)
+    hits = token_cache_stats()["hits"]
+    second = decode_access_token(token)
+
+    assert second == first
+    assert token_cache_stats()["hits"] == hits + 1
+
+def test_jwt_forget_token_drops_cache_entry():
+    """Test revoked tokens are dropped from the verified token cache"""
+    token = create_access_token({"sub": "user_123", "jti": "jti_revoked"})
+    decode_access_token(token)
+    size = token_cache_stats()["size"]
+
+    forget_token("jti_revoked")
+
+    assert token_cache_stats()["size"] == size - 1
+    assert decode_access_token(token)["sub"] == "user_123"
@@ -0,0 +1,145 @@
+"""Tests for the record serialization fast path"""
+import asyncio
+import json
+import uuid
+from datetime import UTC, datetime
+
+import pytest
+
+from app.schemas import RecordListResponse, RecordResponse
+from app.utils.serialization import (
+    RECORD_KEYS,
+    RecordJSONResponse,
+    RecordStreamingResponse,
+    dump_record_page,
+    dump_records,
+    record_page_envelope,
+    stream_records,
+)
+
+
+def _row(index: int, **overrides) -> tuple:
+    values = {
+        "object_id": "obj_contact",
+        "data": {"fld_name": f"Ali {index}", "fld_tags": ["a", "b"], "fld_score": 1.5},
+        "id": f"rec_{index:08d}",
+        "primary_value": f"Ali {index}",
+        "created_at": datetime(2024, 5, 1, 12, 0, index, 123456, tzinfo=UTC),
+        "updated_at": datetime(2024, 5, 2, tzinfo=UTC),
+        "created_by": uuid.UUID(int=index),
+        "updated_by": None,
+        "tenant_id": None,
+        **overrides,
+    }
+    return tuple(values[key] for key in RECORD_KEYS)
+
+
+def test_record_page_matches_pydantic_output():
+    """Test fast-path bytes equal what RecordListResponse would produce"""
+    rows = [_row(i) for i in range(3)]
+
+    expected = RecordListResponse(
+        total=10,
+        page=2,
+        page_size=3,
+        records=[RecordResponse(**dict(zip(RECORD_KEYS, row))) for row in rows],
+    ).model_dump_json()
+
+    assert dump_record_page(rows, total=10, page=2, page_size=3) == expected.encode()
+
+
+def test_big_integers_fall_back_to_stdlib():
+    """Test JSONB integers beyond 64 bits still serialize"""
+    rows = [_row(1, data={"fld_big": 2**70})]
+
+    payload = json.loads(dump_records(rows))
+
+    assert payload[0]["data"]["fld_big"] == 2**70
+    assert payload[0]["created_at"] == "2024-05-01T12:00:01.123456Z"
+
+
+def test_response_passes_bytes_through():
+    """Test pre-encoded content is sent as-is"""
+    response = RecordJSONResponse(b'[{"id":"rec_1"}]')
+
+    assert response.body == b'[{"id":"rec_1"}]'
+    assert response.headers["content-type"] == "application/json"
+
+
+@pytest.mark.asyncio
+async def test_streamed_page_matches_buffered_page():
+    """Test a page streamed in batches is byte-identical to the buffered encoding"""
+    rows = [_row(i) for i in range(7)]
+
+    async def batches():
+        for start in range(0, len(rows), 3):
+            yield rows[start:start + 3]
+        yield []
+
+    chunks = [chunk async for chunk in stream_records(batches(), record_page_envelope(7, 1, 7))]
+
+    assert len(chunks) == 5  # head, three batches, tail
+    assert b"".join(chunks) == dump_record_page(rows, total=7, page=1, page_size=7)
+
+
+@pytest.mark.asyncio
+async def test_streamed_empty_array():
+    """Test streaming no rows still produces valid JSON"""
+    async def batches():
+        return
+        yield
+
+    assert b"".join([chunk async for chunk in stream_records(batches())]) == b"[]"
+
+
+def _tracked_body(closed: list) -> object:
+    async def body():
+        try:
+            while True:
+                yield b"[]"
+        finally:
+            closed.append(True)
+
+    return body()
+
+
+@pytest.mark.asyncio
+async def test_stream_deadline_closes_body_for_stalled_client():
+    """Test a client that stops reading cannot hold the stream past its deadline"""
+    closed = []
+    sent = []
+
+    async def receive():
+        await asyncio.Event().wait()  # Client stays connected
+
+    async def send(message):
+        sent.append(message)
+        if message["type"] == "http.response.body":
+            await asyncio.Event().wait()  # ...but never reads
+
+    response = RecordStreamingResponse(_tracked_body(closed), deadline=0.05)
+    await asyncio.wait_for(response({"type": "http"}, receive, send), timeout=1)
+
+    assert closed == [True]
+    assert len(sent) == 2  # Headers and the first chunk
+
+
+@pytest.mark.asyncio
+async def test_stream_client_disconnect_closes_body():
+    """Test a disconnect releases the body (and its session) immediately"""
+    closed = []
+    streaming = asyncio.Event()
+
+    async def receive():
+        await streaming.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            streaming.set()
+        await asyncio.sleep(0)
+
+    response = RecordStreamingResponse(_tracked_body(closed), deadline=60)
+    await asyncio.wait_for(response({"type": "http"}, receive, send), timeout=1)
+
+    assert closed == [True]